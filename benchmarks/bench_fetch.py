@@ -0,0 +1,67 @@
+"""
+页面获取方式基准测试：HTTP 连接池 + 内嵌数据解析 vs 无头浏览器
+
+启动本地模拟页面服务器，分别用两种方式获取博主主页和视频页。
+在项目根目录运行: python -m benchmarks.bench_fetch --pages 20 --workers 4
+"""
+import argparse
+import concurrent.futures
+import time
+import process_author
+import process_video
+from benchmarks.fixtures import BASE_VIDEO_ID
+from benchmarks.fixture_server import start_fixture_server
+from utils.http_client import close_session
+from utils.webdriver import get_driver_pool, close_driver_pool
+
+
+def fetch_http(author_url, video_url):
+    author = process_author.fetch_author_videos_http(author_url)
+    video = process_video.fetch_video_info_http(video_url)
+    return author is not None and video is not None
+
+
+def fetch_selenium(author_url, video_url):
+    with get_driver_pool().driver() as driver:
+        author = process_author.scrape_author_videos(driver, author_url)
+        video = process_video.scrape_video_info(driver, video_url)
+    return author is not None and video is not None
+
+
+def run(fetch, base_url, pages, workers):
+    """并发获取 pages 组（博主主页 + 视频页），返回 (耗时, 成功数)"""
+    jobs = [
+        (f"{base_url}/user/author{i}", f"{base_url}/video/{BASE_VIDEO_ID + i}")
+        for i in range(pages)
+    ]
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda job: fetch(*job), jobs))
+    return time.perf_counter() - start, sum(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="页面获取方式基准测试")
+    parser.add_argument("--pages", type=int, default=20, help="博主数量（每个博主获取主页和一个视频页）")
+    parser.add_argument("--workers", type=int, default=4, help="并发数")
+    parser.add_argument("--skip-selenium", action="store_true", help="只测试 HTTP 方式")
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server()
+    backends = {"http": fetch_http}
+    if not args.skip_selenium:
+        backends["selenium"] = fetch_selenium
+
+    try:
+        for name, fetch in backends.items():
+            elapsed, ok = run(fetch, base_url, args.pages, args.workers)
+            pages_per_sec = args.pages * 2 / elapsed
+            print(f"{name:<9} | 成功 {ok}/{args.pages} | {elapsed:7.2f} 秒 | {pages_per_sec:7.1f} 页/秒")
+    finally:
+        close_driver_pool()
+        close_session()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+作品列表提取基准测试：逐个 <li> 调用 find_element vs 一次页面内脚本调用
+
+在项目根目录运行: python -m benchmarks.bench_post_list --posts 50 200 500
+"""
+import argparse
+import os
+import tempfile
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+import process_author
+from benchmarks.fixtures import render_author_page
+from utils.webdriver import init_driver
+
+
+def run_once(driver, extractor):
+    """执行一次提取，返回 (耗时, 记录数)"""
+    wait = WebDriverWait(driver, 10)
+    start = time.perf_counter()
+    records = [record for record in extractor(driver, wait) if record]
+    return time.perf_counter() - start, len(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="作品列表提取基准测试")
+    parser.add_argument("--posts", type=int, nargs="+", default=[50, 200, 500], help="每页作品数量")
+    parser.add_argument("--repeat", type=int, default=3, help="每种方式重复次数，取最短耗时")
+    args = parser.parse_args()
+
+    extractors = {
+        "find_element 循环": process_author.extract_video_list,
+        "页面内脚本": process_author.extract_video_list_by_script,
+    }
+
+    driver = init_driver()
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for post_count in args.posts:
+                page_path = os.path.join(tmp_dir, f"author_{post_count}.html")
+                with open(page_path, "w", encoding="utf-8") as f:
+                    f.write(render_author_page("fixture", post_count))
+                driver.get(f"file://{page_path}")
+
+                results = {}
+                for name, extractor in extractors.items():
+                    runs = [run_once(driver, extractor) for _ in range(args.repeat)]
+                    elapsed, count = min(runs)
+                    results[name] = elapsed
+                    print(f"{post_count:>6} 个作品 | {name:<14} | {elapsed * 1000:9.1f} ms | 提取 {count} 条")
+
+                speedup = results["find_element 循环"] / max(results["页面内脚本"], 1e-9)
+                print(f"{post_count:>6} 个作品 | 加速比 {speedup:.1f}x")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+离线测试用的本地 HTTP 服务器，按路由返回模拟的博主主页和视频页
+
+    /user/<sec_uid>?posts=N   博主主页，包含 N 个作品（默认 DEFAULT_POSTS）
+    /video/<video_id>         视频页
+    /media/<name>             视频页引用的视频、封面和字体（固定大小的占位内容）
+    /aweme/v1/web/aweme/post/?sec_user_id=..&max_cursor=..&count=..   作品列表接口（JSON，分页）
+    /aweme/v1/web/aweme/detail/?aweme_id=..                             作品详情接口（JSON）
+
+在项目根目录运行: python -m benchmarks.fixture_server --port 8000
+"""
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from benchmarks.fixtures import (
+    MEDIA_SIZES, POST_API_PATH, DETAIL_API_PATH, API_PAGE_SIZE, render_author_page, render_video_page,
+    render_post_api, render_detail_api,
+)
+
+DEFAULT_POSTS = 30
+
+AUTHOR_PATH = re.compile(r"^/user/([^/]+)/?$")
+VIDEO_PATH = re.compile(r"^/video/(\d+)/?$")
+MEDIA_PATH = re.compile(r"^/media/([\w.]+)$")
+MEDIA_TYPES = {".mp4": "video/mp4", ".jpg": "image/jpeg", ".woff2": "font/woff2"}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """模拟页面的请求处理器"""
+
+    protocol_version = "HTTP/1.1"  # 支持 keep-alive
+    latency = 0.0  # 模拟的网络/服务端延迟（秒）
+    posts = DEFAULT_POSTS  # URL 中未指定 posts 参数时每个博主的作品数量
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+
+        author_match = AUTHOR_PATH.match(url.path)
+        video_match = VIDEO_PATH.match(url.path)
+        if author_match:
+            post_count = int(query.get("posts", [self.posts])[0])
+            body = render_author_page(author_match.group(1), post_count)
+        elif video_match:
+            body = render_video_page(int(video_match.group(1)))
+        elif MEDIA_PATH.match(url.path):
+            self.send_media(url.path)
+            return
+        elif url.path == POST_API_PATH and "sec_user_id" in query:
+            self.send_json(render_post_api(
+                query["sec_user_id"][0],
+                int(query.get("posts", [self.posts])[0]),
+                int(query.get("max_cursor", [0])[0]),
+                int(query.get("count", [API_PAGE_SIZE])[0]),
+            ))
+            return
+        elif url.path == DETAIL_API_PATH and query.get("aweme_id", [""])[0].isdigit():
+            self.send_json(render_detail_api(int(query["aweme_id"][0])))
+            return
+        else:
+            self.send_error(404)
+            return
+
+        self.send_html(body)
+
+    def send_html(self, body):
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_json(self, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_media(self, path):
+        extension = os.path.splitext(path)[1]
+        if extension not in MEDIA_SIZES:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", MEDIA_TYPES[extension])
+        self.send_header("Content-Length", str(MEDIA_SIZES[extension]))
+        self.end_headers()
+        self.wfile.write(bytes(MEDIA_SIZES[extension]))
+
+    def log_message(self, format, *args):
+        pass  # 基准测试时不输出访问日志
+
+
+def make_handler(latency=0.0, posts=DEFAULT_POSTS):
+    """生成带指定延迟和默认作品数量的请求处理器类"""
+    return type("ConfiguredFixtureHandler", (FixtureHandler,), {"latency": latency, "posts": posts})
+
+
+def start_fixture_server(host="127.0.0.1", port=0, latency=0.0, posts=DEFAULT_POSTS):
+    """
+    在后台线程中启动模拟页面服务器
+
+    :param port: 端口，0 表示随机分配
+    :param latency: 每个请求的模拟延迟（秒）
+    :param posts: 每个博主的默认作品数量（博主名单中的URL会被规范化，查询参数不会保留）
+    :return: (server, base_url)，使用完毕后调用 server.shutdown()
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(latency, posts))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模拟抖音页面的本地 HTTP 服务器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的模拟延迟（秒）")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.latency))
+    print(f"模拟页面服务器已启动: http://{args.host}:{args.port}/user/fixture")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
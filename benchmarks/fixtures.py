@@ -0,0 +1,176 @@
+"""
+模拟抖音博主主页和视频页的离线页面
+
+页面同时包含与 process_author / process_video 中 XPath 一致的 DOM 结构，
+以及服务端渲染内嵌的 RENDER_DATA，浏览器和 HTTP 两种获取方式都能解析。
+页面加载后还会像真实页面一样请求作品列表/作品详情的 JSON 接口，用于测试接口响应捕获。
+"""
+import json
+import time
+import zlib
+from html import escape
+from urllib.parse import quote
+
+AUTHOR_NAME = "测试博主"
+MEDIA_SIZES = {  # 模拟的媒体资源大小（字节），用于验证资源拦截的效果
+    ".mp4": 2 * 1024 * 1024,
+    ".jpg": 64 * 1024,
+    ".woff2": 48 * 1024,
+}
+BASE_VIDEO_ID = 7400000000000000000
+POST_API_PATH = "/aweme/v1/web/aweme/post/"
+DETAIL_API_PATH = "/aweme/v1/web/aweme/detail/"
+API_PAGE_SIZE = 10  # 作品列表接口每页的作品数量
+BASE_CREATE_TIME = int(time.mktime((2025, 3, 14, 18, 0, 0, 0, 0, -1)))
+
+
+def format_count(count):
+    """按页面的显示方式格式化数量，例如 12000 -> "1.2万" """
+    if count >= 100_000_000:
+        return f"{count / 100_000_000:.1f}亿"
+    if count >= 10_000:
+        return f"{count / 10_000:.1f}万"
+    return str(count)
+
+
+def make_aweme(video_id):
+    """根据视频 ID 生成确定性的作品数据"""
+    seed = video_id - BASE_VIDEO_ID
+    return {
+        "awemeId": str(video_id),
+        "desc": f"测试视频 {seed}",
+        "createTime": BASE_CREATE_TIME + seed % 10000 * 3600,
+        "authorInfo": {"nickname": AUTHOR_NAME},
+        "stats": {
+            "diggCount": (seed * 7919) % 200_000,
+            "commentCount": (seed * 104729) % 5_000,
+            "shareCount": (seed * 1299709) % 3_000,
+        },
+    }
+
+
+def to_api_aweme(aweme, sec_uid="fixture"):
+    """把页面数据（驼峰命名）格式的作品转换为接口返回的下划线命名格式"""
+    stats = aweme["stats"]
+    return {
+        "aweme_id": aweme["awemeId"],
+        "desc": aweme["desc"],
+        "create_time": aweme["createTime"],
+        "author": {"nickname": AUTHOR_NAME, "sec_uid": sec_uid},
+        "statistics": {
+            "digg_count": stats["diggCount"],
+            "comment_count": stats["commentCount"],
+            "share_count": stats["shareCount"],
+        },
+    }
+
+
+def render_post_api(sec_uid, post_count, cursor=0, count=API_PAGE_SIZE):
+    """作品列表接口：从 cursor 开始的 count 个作品"""
+    base = author_video_base(sec_uid)
+    end = min(post_count, cursor + count)
+    return {
+        "status_code": 0,
+        "aweme_list": [to_api_aweme(make_aweme(base + i), sec_uid) for i in range(cursor, end)],
+        "max_cursor": end,
+        "has_more": int(end < post_count),
+    }
+
+
+def render_detail_api(video_id):
+    """作品详情接口"""
+    return {"status_code": 0, "aweme_detail": to_api_aweme(make_aweme(video_id))}
+
+
+def post_api_script(sec_uid, post_count):
+    """
+    按顺序请求作品列表接口的所有分页
+
+    真实页面在滚动到底部时才请求下一页；这里加载后依次请求全部分页，结果不受窗口大小影响。
+    """
+    return f"""<script>
+(async () => {{
+    let cursor = 0, more = 1;
+    while (more) {{
+        const response = await fetch(`{POST_API_PATH}?sec_user_id={sec_uid}&max_cursor=${{cursor}}&count={API_PAGE_SIZE}&posts={post_count}`);
+        const data = await response.json();
+        cursor = data.max_cursor;
+        more = data.has_more;
+    }}
+}})();
+</script>"""
+
+
+def render_data_script(data):
+    """生成内嵌 RENDER_DATA 的 <script> 标签"""
+    encoded = quote(json.dumps(data, ensure_ascii=False))
+    return f'<script id="RENDER_DATA" type="application/json">{encoded}</script>'
+
+
+def author_video_base(sec_uid):
+    """每个博主的作品 ID 从不同的起点开始，避免不同博主的作品重复"""
+    return BASE_VIDEO_ID + zlib.crc32(sec_uid.encode("utf-8")) % 100000 * 10000
+
+
+def render_author_page(sec_uid, post_count):
+    """生成包含 post_count 个作品的博主主页"""
+    base = author_video_base(sec_uid)
+    awemes = [make_aweme(base + i) for i in range(post_count)]
+    items = "\n".join(
+        f'<li><a href="/video/{aweme["awemeId"]}"><p>{escape(aweme["desc"])}</p></a>'
+        f'<span>{format_count(aweme["stats"]["diggCount"])}</span></li>'
+        for aweme in awemes
+    )
+    data = {"app": {
+        "user": {"user": {"secUid": sec_uid, "nickname": AUTHOR_NAME}},
+        "post": {"data": awemes},
+    }}
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{AUTHOR_NAME}的抖音</title></head><body>
+<div data-e2e="user-info"><span>{AUTHOR_NAME}</span></div>
+<div data-e2e="user-post-list"><ul>
+{items}
+</ul></div>
+{render_data_script(data)}
+{post_api_script(sec_uid, post_count)}
+</body></html>"""
+
+
+def render_video_page(video_id):
+    """生成与 process_video.VIDEO_FIELD_XPATHS 结构一致的视频页"""
+    aweme = make_aweme(video_id)
+    stats = aweme["stats"]
+    publish_time = time.strftime("%Y-%m-%d %H:%M", time.localtime(aweme["createTime"]))
+    data = {"app": {"videoDetail": aweme}}
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{escape(aweme["desc"])}</title>
+<style>@font-face {{ font-family: fixture; src: url(/media/font.woff2); }} body {{ font-family: fixture; }}</style>
+</head><body>
+<video src="/media/{video_id}.mp4" poster="/media/{video_id}.jpg" autoplay muted preload="auto"></video>
+<div id="douyin-right-container">
+  <div></div>
+  <div><div><div>
+    <div>
+      <div></div>
+      <div></div>
+      <div><div>
+        <div>{escape(aweme["desc"])}</div>
+        <div>
+          <div>
+            <div><span>{format_count(stats["diggCount"])}</span></div>
+            <div><span>{format_count(stats["commentCount"])}</span></div>
+            <div><span>{format_count(stats["shareCount"])}</span></div>
+          </div>
+          <div>发布时间：{publish_time}</div>
+        </div>
+      </div></div>
+      <div><div><div>
+        <div></div>
+        <div><a href="/user/fixture"><div><span><span><span><span><span><span>{AUTHOR_NAME}</span></span></span></span></span></span></div></a></div>
+      </div></div></div>
+    </div>
+  </div></div></div>
+</div>
+{render_data_script(data)}
+<script>fetch("{DETAIL_API_PATH}?aweme_id={video_id}");</script>
+</body></html>"""
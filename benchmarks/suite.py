@@ -0,0 +1,203 @@
+"""
+离线基准测试套件
+
+启动本地模拟页面服务器，在不同并发数下分别运行 process_author.get_author_info、
+process_video.get_video_info 和 main.main，报告吞吐（页/秒）、单页延迟和整个进程树
+（含浏览器）的峰值内存。每次运行都在独立的子进程和临时数据目录中进行，互不影响。
+
+在项目根目录运行:
+    python -m benchmarks.suite --authors 20 --workers 1 2 4
+    python -m benchmarks.suite --backend http --targets author video --latency 0.05
+    python -m benchmarks.suite --targets video --no-blocking   # 关闭资源拦截，对比每页传输量
+    python -m benchmarks.suite --targets author video --api-capture   # 从页面请求的 JSON 接口响应中提取
+"""
+import argparse
+import concurrent.futures
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from config import BASE_DIR
+from benchmarks.fixtures import BASE_VIDEO_ID
+from benchmarks.fixture_server import start_fixture_server
+from utils.metrics import metrics
+from utils.process_memory import process_tree_rss_mb
+
+TARGETS = ("author", "video", "main")
+RESULT_PREFIX = "BENCH_RESULT "
+RSS_SAMPLE_INTERVAL = 0.2
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def author_urls(base_url, authors):
+    return [f"{base_url}/user/author{i}" for i in range(authors)]
+
+
+def timed_map(func, urls, workers):
+    """并发调用 func，返回 (每次调用的耗时列表, 成功次数)"""
+    def call(url):
+        start = time.perf_counter()
+        result = func(url)
+        return time.perf_counter() - start, result is not None
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(call, urls))
+    return [latency for latency, _ in results], sum(ok for _, ok in results)
+
+
+def run_child(target, base_url, authors, workers):
+    """子进程中执行一次基准测试，返回结果字典"""
+    start = time.perf_counter()
+    if target == "author":
+        import process_author
+        from utils.webdriver import close_driver_pool
+        try:
+            latencies, ok = timed_map(process_author.get_author_info, author_urls(base_url, authors), workers)
+        finally:
+            close_driver_pool()
+        pages = authors
+    elif target == "video":
+        import process_video
+        from utils.webdriver import close_driver_pool
+        video_urls = [f"{base_url}/video/{BASE_VIDEO_ID + i}" for i in range(authors)]
+        try:
+            latencies, ok = timed_map(process_video.get_video_info, video_urls, workers)
+        finally:
+            close_driver_pool()
+        pages = authors
+    else:
+        import pandas as pd
+        import main
+        from utils.stats_store import StatisticsStore
+        pd.DataFrame({"链接": author_urls(base_url, authors)}).to_excel("authors.xlsx", index=False)
+        main.main(author_list_file="authors.xlsx")
+        store = StatisticsStore()
+        ok = store.count()
+        store.close()
+        pages = authors * 2
+
+        # 整体运行时没有逐页计时，取各类页面加载耗时中最慢的一类
+        histograms = metrics.summary()["histograms"]
+        page_stats = [
+            histograms[name] for name in
+            ('page_get_seconds{page="author"}', 'page_get_seconds{page="video"}', "http_get_seconds")
+            if name in histograms
+        ]
+        p50 = max((stats["p50"] for stats in page_stats), default=None)
+        p95 = max((stats["p95"] for stats in page_stats), default=None)
+
+    if target != "main":
+        p50, p95 = percentile(latencies, 50), percentile(latencies, 95)
+
+    # 浏览器方式下每个页面的平均传输量
+    transfers = [
+        stats for name, stats in metrics.summary()["histograms"].items()
+        if name.startswith("page_transfer_bytes")
+    ]
+    transfer_count = sum(stats["count"] for stats in transfers)
+    return {
+        "target": target,
+        "workers": workers,
+        "pages": pages,
+        "ok": ok,
+        "total": authors,
+        "elapsed": time.perf_counter() - start,
+        "p50": p50,
+        "p95": p95,
+        "transfer_kb": sum(stats["sum"] for stats in transfers) / transfer_count / 1024 if transfer_count else None,
+    }
+
+
+def run_isolated(target, base_url, args, workers):
+    """在独立的子进程和临时数据目录中运行一次，并采样整个进程树的峰值内存"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(
+            os.environ,
+            PYTHONPATH=str(BASE_DIR),
+            SCRAPER_DATA_DIR=data_dir,
+            SCRAPER_WORKERS=str(workers),
+            SCRAPER_FETCH_BACKEND=args.backend,
+            SCRAPER_HOST_MAX_RATE="0",
+            SCRAPER_BLOCK_RESOURCES="0" if args.no_blocking else "1",
+            SCRAPER_API_CAPTURE="1" if args.api_capture else "0",
+        )
+        command = [
+            sys.executable, "-m", "benchmarks.suite", "--child", target, "--base-url", base_url,
+            "--authors", str(args.authors), "--workers", str(workers),
+        ]
+        process = subprocess.Popen(command, cwd=data_dir, env=env, stdout=subprocess.PIPE,
+                                   stderr=subprocess.DEVNULL, text=True)
+        peak_rss = 0.0
+        while process.poll() is None:
+            peak_rss = max(peak_rss, process_tree_rss_mb(process.pid) or 0.0)
+            time.sleep(RSS_SAMPLE_INTERVAL)
+        output = process.stdout.read()
+
+    for line in output.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            result = json.loads(line[len(RESULT_PREFIX):])
+            result["peak_rss_mb"] = peak_rss
+            return result
+    raise RuntimeError(f"{target} 基准测试子进程异常退出（返回码 {process.returncode}）")
+
+
+def format_ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:.0f}"
+
+
+def format_kb(kilobytes):
+    return "-" if kilobytes is None else f"{kilobytes:.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线基准测试套件")
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=list(TARGETS))
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="要测试的并发数")
+    parser.add_argument("--authors", type=int, default=20, help="博主数量")
+    parser.add_argument("--posts", type=int, default=30, help="每个博主的作品数量")
+    parser.add_argument("--backend", choices=("selenium", "http"), default="selenium", help="页面获取方式")
+    parser.add_argument("--latency", type=float, default=0.0, help="模拟页面服务器每个请求的延迟（秒）")
+    parser.add_argument("--no-blocking", action="store_true", help="关闭浏览器资源拦截")
+    parser.add_argument("--api-capture", action="store_true", help="从页面请求的 JSON 接口响应中提取数据")
+    parser.add_argument("--json", help="把结果另存为 JSON 文件")
+    parser.add_argument("--child", choices=TARGETS, help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_child(args.child, args.base_url, args.authors, args.workers[0])
+        print(RESULT_PREFIX + json.dumps(result))
+        return
+
+    server, base_url = start_fixture_server(latency=args.latency, posts=args.posts)
+    results = []
+    try:
+        print(f"{'目标':<8}{'并发':>6}{'成功':>10}{'耗时(秒)':>10}{'页/秒':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'峰值内存(MB)':>14}{'KB/页':>10}")
+        for target in args.targets:
+            for workers in args.workers:
+                result = run_isolated(target, base_url, args, workers)
+                results.append(result)
+                print(
+                    f"{target:<8}{workers:>6}{result['ok']:>6}/{result['total']:<4}"
+                    f"{result['elapsed']:>10.2f}{result['pages'] / result['elapsed']:>10.1f}"
+                    f"{format_ms(result['p50']):>10}{format_ms(result['p95']):>10}{result['peak_rss_mb']:>14.0f}"
+                    f"{format_kb(result['transfer_kb']):>10}"
+                )
+    finally:
+        server.shutdown()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,14 @@ from pathlib import Path
 # 项目根目录
 BASE_DIR = Path(__file__).resolve().parent
 
+# 运行数据（统计数据库、缓存、运行日志、指标等）保存目录，可通过环境变量 SCRAPER_DATA_DIR 修改
+DATA_DIR = os.environ.get("SCRAPER_DATA_DIR", BASE_DIR)
+
 # ChromeDriver 路径
 CHROME_DRIVER_PATH = os.path.join(BASE_DIR, "chromedriver.exe")
 
 # 博主视频数据保存目录
-OUTPUT_DIR = os.path.join(BASE_DIR, "博主视频数据")
+OUTPUT_DIR = os.path.join(DATA_DIR, "博主视频数据")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 # 日志配置
@@ -22,5 +25,151 @@ LOG_COLORS = {
     'ERROR': 'red',
     'CRITICAL': 'red,bg_white',
 }
+LOG_FILE = "process.log"  # 文本日志文件，None 表示不写
+LOG_JSON_FILE = os.path.join(DATA_DIR, "process.jsonl")  # JSON Lines 结构化日志（带运行/博主/视频 ID），None 表示不写
+LOG_MODULE_LEVELS = {  # 按模块设置日志级别，例如把逐字段的日志调到 WARNING
+    "selenium": "WARNING",
+    "urllib3": "WARNING",
+}
 # 反爬虫配置
-USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36"
\ No newline at end of file
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36"
+
+# 并发配置（流水线各级的线程数）
+AUTHOR_WORKERS = 2  # 博主主页处理线程数（自适应调整的初始值）
+VIDEO_WORKERS = 2  # 视频页处理线程数（自适应调整的初始值）
+AUTHOR_WORKERS_RANGE = (1, max(2, os.cpu_count() or 1))  # 博主主页并发数的上下限
+VIDEO_WORKERS_RANGE = (1, max(2, os.cpu_count() or 1))  # 视频页并发数的上下限
+
+# 浏览器执行模式: "drivers" 每个并发任务独占一个浏览器; "tabs" 少数几个浏览器，每个并发任务占用其中一个标签页，内存占用低得多
+EXECUTION_MODE = os.environ.get("SCRAPER_EXECUTION_MODE", "drivers")
+TAB_BROWSERS = 2  # 标签页模式下最多启动的浏览器数量
+TABS_PER_BROWSER = 8  # 标签页模式下每个浏览器最多同时打开的标签页数量
+if EXECUTION_MODE == "tabs":
+    # 并发数不再受 CPU 核数限制，由标签页总数决定，两级流水线各占一半
+    AUTHOR_WORKERS_RANGE = VIDEO_WORKERS_RANGE = (1, max(1, TAB_BROWSERS * TABS_PER_BROWSER // 2))
+
+if os.environ.get("SCRAPER_WORKERS"):
+    # 通过环境变量指定固定的并发数（关闭自适应调整），便于基准测试和排查问题
+    AUTHOR_WORKERS = VIDEO_WORKERS = int(os.environ["SCRAPER_WORKERS"])
+    AUTHOR_WORKERS_RANGE = VIDEO_WORKERS_RANGE = (AUTHOR_WORKERS, AUTHOR_WORKERS)
+MAX_WORKERS = AUTHOR_WORKERS_RANGE[1] + VIDEO_WORKERS_RANGE[1]  # 并行处理的线程总数上限
+PIPELINE_QUEUE_SIZE = 8  # 流水线各级之间队列的容量，队列满时上游阻塞等待
+
+# 自适应并发（AIMD）配置：成功时缓慢增加并发，变慢、超时或内存不足时成倍减少
+# 处理时间不含排队等待（域名限速、借用和启动浏览器）；博主主页的期望处理时间见 AUTHOR_TARGET_LATENCY
+VIDEO_TARGET_LATENCY = 10  # 单个视频页的期望处理时间（秒），超过视为变慢
+CONCURRENCY_DECREASE_FACTOR = 0.7  # 每次减少时并发数乘以该系数
+CONCURRENCY_COOLDOWN = 10  # 两次减少之间的最短间隔（秒），避免连续失败时并发数骤降到底
+MIN_FREE_MEMORY_MB = 1024  # 可用内存低于该值时不再增加并发并开始减少
+HOST_MAX_RATE = float(os.environ.get("SCRAPER_HOST_MAX_RATE", 2.0))  # 对同一域名每秒最多发起的页面请求数，0 表示不限制
+
+# 资源拦截配置：通过 CDP Network.setBlockedURLs 按页面类型拦截不需要的请求（支持 * 通配符）
+RESOURCE_BLOCKING = os.environ.get("SCRAPER_BLOCK_RESOURCES", "1") != "0"
+MEDIA_URL_PATTERNS = ["*.mp4*", "*.m4s*", "*.m3u8*", "*.flv*", "*douyinvod.com*"]  # 视频流和媒体分片
+BLOCKED_URL_PATTERNS = {
+    # 所有页面：字体、图片和统计上报
+    "common": [
+        "*.woff*", "*.ttf*", "*.otf*", "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*",
+        "*mcs.zijieapi.com*", "*mon.zijieapi.com*",
+    ],
+    "author": MEDIA_URL_PATTERNS,
+    # 视频页只读取统计栏，评论列表和相关推荐也不需要
+    "video": MEDIA_URL_PATTERNS + ["*/aweme/v1/web/comment/list/*", "*/aweme/v1/web/aweme/related/*"],
+}
+NETWORK_STATS_ENABLED = True  # 通过浏览器性能日志统计每个页面的传输字节数和被拦截的请求数
+
+# 接口响应捕获：从浏览器性能日志中找到页面自身请求的 JSON 接口并读取响应体，直接得到精确的整数计数和完整的作品列表，
+# 不依赖 DOM 结构；未捕获到时回退到 DOM 提取。可通过环境变量 SCRAPER_API_CAPTURE=1 开启
+API_CAPTURE_ENABLED = os.environ.get("SCRAPER_API_CAPTURE", "0") == "1"
+API_CAPTURE_PATTERNS = {  # 各类页面要捕获的接口路径
+    "author": "/aweme/v1/web/aweme/post/",
+    "video": "/aweme/v1/web/aweme/detail/",
+}
+API_CAPTURE_TIMEOUT = 5  # 打开页面后等待第一个接口响应的最长时间（秒）
+
+# WebDriver 池配置
+DRIVER_POOL_SIZE = MAX_WORKERS  # 池中最多同时存在的浏览器数量，与线程数保持一致
+DRIVER_ACQUIRE_TIMEOUT = 300  # 借出浏览器的最长等待时间（秒）
+
+# 浏览器回收配置：长时间运行的浏览器内存会持续增长，满足任一条件时在归还后关闭并按需重建
+DRIVER_RECYCLE_PAGES = 200  # 每个浏览器最多打开的页面数
+DRIVER_RECYCLE_RSS_MB = 1500  # 浏览器进程树（chromedriver 及所有 Chrome 进程）的常驻内存上限（MB）
+DRIVER_RECYCLE_TIMEOUTS = 3  # 连续超时次数上限
+DRIVER_RSS_SAMPLE_INTERVAL = 5  # 同一浏览器两次内存采样的最短间隔（秒）
+
+# 页面就绪等待配置：按条件等待，内容就绪后立即继续，不使用固定时长的 sleep
+PAGE_WAIT_TIMEOUT = 10  # 等待目标元素出现的最长时间（秒）
+PAGE_POLL_INTERVAL = 0.1  # 检查条件的间隔（秒），Selenium 默认为 0.5
+DOM_SETTLE_QUIET = 0.3  # DOM 连续多久没有变化视为渲染完成（秒）
+NETWORK_IDLE_QUIET = 0.5  # 没有进行中的请求持续多久视为网络空闲（秒）
+PAGE_SETTLE_TIMEOUT = 3  # 等待 DOM 稳定和网络空闲的最长时间（秒），超时后按当前页面继续
+# 浏览器池的页面加载策略: "eager" DOMContentLoaded 后 get() 即返回，其余由上面的就绪条件等待;
+# "normal" 还要等待 load 事件（所有子资源加载完成）
+PAGE_LOAD_STRATEGY = "eager"
+
+# 视频信息提取模式: "script" 一次页面内脚本读取全部字段; "legacy" 逐个字段等待
+VIDEO_EXTRACT_MODE = "script"
+
+# 作品列表提取模式: "script" 一次页面内脚本读取整个列表; "legacy" 逐个 <li> 调用 find_element
+AUTHOR_EXTRACT_MODE = "script"
+
+# 博主作品列表滚动加载配置（仅脚本模式）
+AUTHOR_TOP_K = 10  # 每个博主保留点赞数最高的作品数量
+AUTHOR_MAX_POSTS = 1000  # 最多加载的作品数量
+AUTHOR_TIME_BUDGET = 60  # 单个博主滚动加载的时间预算（秒）
+AUTHOR_SCROLL_WAIT = 3  # 每次滚动后等待新作品出现的最长时间（秒）
+# 单个博主主页的期望处理时间（秒），超过视为变慢：作品多的博主会用满滚动时间预算，不应因此减少并发
+AUTHOR_TARGET_LATENCY = PAGE_WAIT_TIMEOUT + AUTHOR_TIME_BUDGET + AUTHOR_SCROLL_WAIT
+
+# 页面获取方式: "selenium" 使用无头浏览器; "http" 优先用 HTTP 客户端获取并解析页面内嵌数据，失败时回退到浏览器
+FETCH_BACKEND = os.environ.get("SCRAPER_FETCH_BACKEND", "selenium")
+HTTP_POOL_SIZE = 16  # HTTP 连接池大小（keep-alive 连接复用）
+HTTP_MAX_CONCURRENCY = 8  # 同时进行的 HTTP 请求数上限
+HTTP_TIMEOUT = 10  # HTTP 请求超时（秒）
+
+# 页面结果缓存配置
+CACHE_ENABLED = True
+CACHE_FILE = os.path.join(DATA_DIR, "fetch_cache.sqlite3")
+CACHE_TTL = {
+    "author": 6 * 3600,  # 博主作品列表缓存时间（秒）
+    "video": 3600,  # 视频信息缓存时间（秒）
+}
+CACHE_MAX_ENTRIES = 50000  # 缓存条数上限，超出后淘汰最久未使用的条目
+
+# 博主作品列表归档格式: "csv" / "jsonl" / "parquet" / "xlsx"，None 表示不归档
+AUTHOR_ARCHIVE_FORMAT = "csv"
+
+# 页面原始 HTML 归档（用于修改提取逻辑后 main.py --reparse 离线重新解析），可通过环境变量 SCRAPER_PAGE_ARCHIVE=1 开启
+PAGE_ARCHIVE_ENABLED = os.environ.get("SCRAPER_PAGE_ARCHIVE", "0") == "1"
+PAGE_ARCHIVE_DIR = os.path.join(DATA_DIR, "page_archive")
+REPARSE_WORKERS = os.cpu_count() or 1  # 离线重新解析的进程数
+
+# 统计数据存储
+STATISTICS_DB = os.path.join(DATA_DIR, "统计数据.sqlite3")
+
+# 点赞/评论/转发量的历史快照（每次运行追加一份，按列式 Parquet 保存，用于计算增长率）
+SNAPSHOT_ENABLED = True
+SNAPSHOT_DIR = os.path.join(DATA_DIR, "snapshots")
+SNAPSHOT_FLUSH_ROWS = 100_000  # 内存中累积多少条快照写出一个文件
+SNAPSHOT_COMPACT_FILES = 50  # 快照文件超过该数量时合并为一个文件
+SNAPSHOT_TOP_MOVERS = 20  # main.py --movers 输出的视频数量
+
+# 运行日志（断点续跑）配置
+JOURNAL_DIR = os.path.join(DATA_DIR, "journals")
+JOURNAL_FSYNC_EVERY = 50  # 每写入多少条记录同步一次磁盘
+JOURNAL_FSYNC_INTERVAL = 2.0  # 距上次同步超过多少秒时同步一次磁盘
+
+# 运行指标配置
+METRICS_RESERVOIR_SIZE = 10000  # 每个直方图用于计算分位数的最大样本数
+METRICS_SERIES_POINTS = 500  # 每条时间序列（如浏览器内存曲线）最多保留的点数，超出后隔点抽稀
+METRICS_SUMMARY_FILE = os.path.join(DATA_DIR, "metrics_summary.json")  # 运行结束时写入的指标汇总
+METRICS_PROMETHEUS_FILE = None  # 运行结束时写入 Prometheus 文本格式的文件路径，None 表示不写
+METRICS_HTTP_PORT = None  # 运行期间提供 Prometheus /metrics 接口的端口，None 表示不启动
+
+# 多机共享工作队列配置（main.py --enqueue / --worker / --merge）
+WORK_QUEUE_DB = os.environ.get("SCRAPER_WORK_QUEUE", os.path.join(DATA_DIR, "work_queue.sqlite3"))  # 各机器共同访问的队列数据库
+QUEUE_LEASE_SECONDS = 600  # 领取任务的租约时长（秒），过期未续约的任务重新排队
+QUEUE_HEARTBEAT_INTERVAL = 60  # 工作进程续约的间隔（秒），应明显小于租约时长
+QUEUE_CLAIM_BATCH = 4  # 每次领取的博主数量
+QUEUE_MAX_ATTEMPTS = 3  # 每个博主最多尝试次数，超过后标记为失败
+QUEUE_POLL_INTERVAL = 30  # 暂无可领取任务但其他机器仍在处理时，等待多久再尝试（秒）
@@ -1,27 +1,41 @@
 import pandas as pd
+import argparse
 import logging
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from functools import wraps
-from read_author import read_author_urls_from_excel
+from functools import wraps, partial
+from itertools import islice
+from read_author import iter_author_urls
 import process_author
 import process_video
-import concurrent.futures
-
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("process.log"),
-        logging.StreamHandler()
-    ]
+from config import (
+    CACHE_ENABLED, STATISTICS_DB, AUTHOR_WORKERS, VIDEO_WORKERS, AUTHOR_WORKERS_RANGE,
+    VIDEO_WORKERS_RANGE, AUTHOR_TARGET_LATENCY, VIDEO_TARGET_LATENCY, METRICS_SUMMARY_FILE,
+    METRICS_PROMETHEUS_FILE, METRICS_HTTP_PORT, WORK_QUEUE_DB, SNAPSHOT_ENABLED, SNAPSHOT_TOP_MOVERS,
+    REPARSE_WORKERS
 )
+from pipeline import Pipeline
+from utils.concurrency import AdaptiveLimiter
+from utils.metrics import metrics
+from utils.webdriver import close_driver_pool
+from utils.http_client import close_session
+from utils.cache import get_fetch_cache, close_fetch_cache
+from utils.archive import close_archiver
+from utils.stats_store import StatisticsStore, COUNT_COLUMNS
+from utils.snapshots import SnapshotStore, FETCHED_AT_FIELD
+from utils.counts import parse_count, parse_count_series, normalize_count_columns
+from utils.page_archive import PageArchive, get_page_archive, close_page_archive
+from utils.journal import RunJournal, PENDING, AUTHOR_DONE, VIDEO_DONE, FAILED
+from utils.work_queue import WorkQueue, QueueWorker
+from utils.logger import setup_logger, set_run_id, log_context, process_log_queue, setup_process_logger
+
+logger = logging.getLogger(__name__)
 
 # 常量配置
 AUTHOR_LIST_FILE = "目标博主名单.xlsx"
 STATISTICS_FILE = "统计数据.xlsx"
-MAX_WORKERS = 4  # 并行处理的线程数
+ENQUEUE_BATCH_SIZE = 1000  # --enqueue 时每个写事务加入队列的博主数
 
 
 def timer_decorator(func):
@@ -33,7 +47,8 @@ def timer_decorator(func):
         result = func(*args, **kwargs)
         end_time = time.time()
         elapsed_time = end_time - start_time
-        logging.info(f"{func.__name__} 执行完成，花费 {elapsed_time:.2f} 秒")
+        metrics.histogram("function_seconds", function=func.__name__).observe(elapsed_time)
+        logger.info("%s 执行完成，花费 %.2f 秒", func.__name__, elapsed_time)
         return result
 
     return wrapper
@@ -46,139 +61,421 @@ def safe_read_excel(file_path):
             return pd.read_excel(file_path)
         return pd.DataFrame()
     except Exception as e:
-        logging.error(f"读取Excel文件 {file_path} 失败: {e}")
+        logger.error("读取Excel文件 %s 失败: %s", file_path, e)
         return pd.DataFrame()
 
 
-def save_to_excel(df, file_path):
-    """安全保存数据到Excel文件"""
-    try:
-        df.to_excel(file_path, index=False)
-        logging.info(f"数据已保存到 {file_path}")
-        return True
-    except Exception as e:
-        logging.error(f"保存数据到 {file_path} 失败: {e}")
-        return False
-
-
-@timer_decorator
-def process_author_videos(author_url):
+def find_most_liked_video(author_url, driver=None):
     """
-    处理单个博主的所有视频，提取点赞数最高的视频信息并保存到Excel文件
+    获取博主的作品列表并找出点赞数最高的视频
 
     :param author_url: 博主主页URL
-    :return: 获取的视频信息或None
+    :param driver: 已借出的浏览器；为 None 时按需从共享池中借用
+    :return: 点赞数最高的视频链接或None
     """
-    try:
-        # 获取博主信息并保存视频数据
-        excel_filename = process_author.get_author_info(author_url)
+    # 获取博主的作品列表
+    video_data = process_author.get_author_info(author_url, driver=driver)
 
-        if not excel_filename:
-            logging.warning(f"未找到博主 {author_url} 的视频信息")
-            return None
+    if not video_data:
+        logger.warning("未找到博主 %s 的视频信息", author_url)
+        return None
 
-        # 读取视频数据并找出最受欢迎的视频
-        df = safe_read_excel(excel_filename)
-        if df.empty:
-            logging.warning(f"博主 {author_url} 的视频数据为空")
-            return None
+    # 找出最受欢迎的视频
+    df = pd.DataFrame(video_data)
 
-        # 将点赞数列转换为数值类型
-        df["点赞数"] = pd.to_numeric(df["点赞数"], errors="coerce")
+    # 将 "1.2万" 等显示值转换为整数，无法解析的记为缺失
+    df["点赞数"] = parse_count_series(df["点赞数"])
 
-        # 检查是否有有效的点赞数据
-        if df["点赞数"].isna().all():
-            logging.warning(f"博主 {author_url} 的视频没有有效的点赞数据")
-            return None
+    # 检查是否有有效的点赞数据
+    if df["点赞数"].isna().all():
+        logger.warning("博主 %s 的视频没有有效的点赞数据", author_url)
+        return None
 
-        # 选择点赞数最高的视频
-        most_liked_video = df.loc[df["点赞数"].idxmax()]
-        video_link = most_liked_video["链接"]
-        logging.info(f"博主 {author_url} 点赞数最高的视频链接: {video_link}")
+    # 选择点赞数最高的视频
+    most_liked_video = df.loc[df["点赞数"].idxmax()]
+    video_link = most_liked_video["链接"]
+    logger.info("博主 %s 点赞数最高的视频链接: %s", author_url, video_link)
+    return video_link
 
-        # 获取视频信息
-        video_info = process_video.get_video_info(video_link)
 
-        if not video_info:
-            logging.warning(f"未能获取视频 {video_link} 的信息")
-            return None
+def fetch_most_liked_video(author_url, video_link, driver=None):
+    """
+    获取博主点赞数最高的视频的详细信息
 
-        # 添加博主URL以便追踪
-        video_info["博主URL"] = author_url
+    :param author_url: 博主主页URL
+    :param video_link: 视频链接
+    :param driver: 已借出的浏览器；为 None 时按需从共享池中借用
+    :return: 视频信息或None
+    """
+    video_info = process_video.get_video_info(video_link, driver=driver)
 
-        # 打印视频信息摘要
-        logging.info(f"获取到视频信息: 标题={video_info.get('标题', 'N/A')}, 点赞={video_info.get('点赞数', 'N/A')}")
+    if not video_info:
+        logger.warning("未能获取视频 %s 的信息", video_link)
+        return None
 
-        return video_info
+    # 添加视频链接和博主URL以便去重和追踪
+    video_info["链接"] = video_link
+    video_info["博主URL"] = author_url
+
+    # 打印视频信息摘要
+    logger.info("获取到视频信息: 标题=%s, 点赞=%s", video_info.get('标题', 'N/A'), video_info.get('点赞量', 'N/A'))
+
+    return video_info
+
+
+def pending_authors(author_urls, journal):
+    """跳过运行日志中已完成的博主，其余博主记为待处理后交给流水线"""
+    for author_url in author_urls:
+        entry = journal.state(author_url)
+        if entry is not None and entry["status"] == VIDEO_DONE:
+            metrics.counter("authors_total", status="skipped").inc()
+            continue
+        if entry is None or entry["status"] == FAILED:
+            journal.record(author_url, PENDING)
+        yield author_url
+
+
+def author_stage(author_url, journal):
+    """流水线第一级：博主主页 -> (博主URL, 点赞数最高的视频链接)"""
+    # 续跑时，已找到视频链接的博主不再重新抓取主页
+    entry = journal.state(author_url)
+    if entry is not None and entry["status"] == AUTHOR_DONE:
+        return author_url, entry["video_link"]
+
+    with log_context(author=author_url):
+        try:
+            video_link = find_most_liked_video(author_url)
+        except Exception as e:
+            journal.record(author_url, FAILED, stage="author", error=str(e))
+            metrics.counter("authors_total", status="failed", stage="author").inc()
+            raise
+        if not video_link:
+            journal.record(author_url, FAILED, stage="author")
+            metrics.counter("authors_total", status="failed", stage="author").inc()
+            return None
 
-    except Exception as e:
-        logging.error(f"处理博主 {author_url} 时发生错误: {str(e)}")
-        return None
+    journal.record(author_url, AUTHOR_DONE, video_link=video_link)
+    return author_url, video_link
 
 
-def update_statistics_file(video_info_list):
-    """更新统计数据文件"""
-    if not video_info_list:
-        logging.warning("没有有效的视频信息需要保存")
-        return False
+def video_stage(job, journal):
+    """流水线第二级：(博主URL, 视频链接) -> 视频信息"""
+    author_url, video_link = job
+    with log_context(author=author_url, video=video_link):
+        try:
+            video_info = fetch_most_liked_video(author_url, video_link)
+        except Exception as e:
+            journal.record(author_url, FAILED, stage="video", error=str(e))
+            metrics.counter("authors_total", status="failed", stage="video").inc()
+            raise
+        if not video_info:
+            journal.record(author_url, FAILED, stage="video")
+            metrics.counter("authors_total", status="failed", stage="video").inc()
+    return video_info
 
-    # 过滤None值
-    valid_info = [info for info in video_info_list if info is not None]
-    if not valid_info:
-        logging.warning("所有视频信息获取失败")
-        return False
 
-    # 将新数据转换为DataFrame
-    new_data = pd.DataFrame(valid_info)
+class StatisticsSink:
+    """
+    流水线的结果接收者：每条视频信息到达后立即增量写入统计数据库（本次运行新抓取的还会追加一条历史快照），
+    再在运行日志中标记完成
+    """
+
+    def __init__(self, store, journal, snapshots=None):
+        self.store = store
+        self.journal = journal
+        self.snapshots = snapshots
+        self.started_at = time.time()
+        self.success_count = 0
+
+    def write(self, video_info):
+        self.store.upsert(video_info)
+        # 缓存命中的结果是之前抓取的，不作为新的快照
+        if self.snapshots is not None and video_info.get(FETCHED_AT_FIELD, 0) >= self.started_at:
+            self.snapshots.add(video_info)
+        self.journal.record(video_info["博主URL"], VIDEO_DONE, video_info=video_info)
+        self.success_count += 1
+        metrics.counter("authors_total", status="success").inc()
+
+    def close(self):
+        if self.snapshots is not None:
+            self.snapshots.flush()
+
+
+def import_statistics_file(store, file_path):
+    """统计数据库为空时，导入旧版本生成的统计数据 Excel 文件"""
+    if store.count() or not Path(file_path).exists():
+        return
+    with metrics.timer("excel_io_seconds", op="import"):
+        existing_data = safe_read_excel(file_path)
+    if "链接" not in existing_data.columns:
+        return
+    normalize_count_columns(existing_data, COUNT_COLUMNS)
+    existing_data = existing_data.astype(object).where(existing_data.notna(), None)
+    imported = store.upsert_many(existing_data.to_dict("records"))
+    logger.info("已从 %s 导入 %s 条历史统计数据", file_path, imported)
+
+
+def export_statistics_file(file_path=STATISTICS_FILE):
+    """将统计数据库导出为 Excel 文件"""
+    store = StatisticsStore()
+    try:
+        store.export_excel(file_path)
+    finally:
+        store.close()
 
-    # 读取现有数据并合并
-    existing_data = safe_read_excel(STATISTICS_FILE)
-    updated_data = pd.concat([existing_data, new_data], ignore_index=True)
 
-    # 去除可能的重复数据
-    if "链接" in updated_data.columns:
-        updated_data.drop_duplicates(subset=["链接"], keep="last", inplace=True)
+def run_pipeline(authors, journal):
+    """
+    用博主主页、视频页和结果保存三级流水线并行处理博主
 
-    # 保存更新后的数据
-    return save_to_excel(updated_data, STATISTICS_FILE)
+    :param authors: 待处理的博主URL（可以是生成器）
+    :param journal: 记录处理进度的 RunJournal 或 QueueWorker
+    :return: (处理的博主数, 成功数)
+    """
+    store = StatisticsStore()
+    snapshots = SnapshotStore() if SNAPSHOT_ENABLED else None
+    try:
+        import_statistics_file(store, STATISTICS_FILE)
+        sink = StatisticsSink(store, journal, snapshots)
+        author_limiter = AdaptiveLimiter("博主主页", AUTHOR_WORKERS, *AUTHOR_WORKERS_RANGE, AUTHOR_TARGET_LATENCY)
+        video_limiter = AdaptiveLimiter("视频页", VIDEO_WORKERS, *VIDEO_WORKERS_RANGE, VIDEO_TARGET_LATENCY)
+        pipeline = (
+            Pipeline()
+            .add_stage("author", partial(author_stage, journal=journal), AUTHOR_WORKERS_RANGE[1], author_limiter)
+            .add_stage("video", partial(video_stage, journal=journal), VIDEO_WORKERS_RANGE[1], video_limiter)
+        )
+        total = pipeline.run(authors, sink)
+    finally:
+        store.close()
+        if snapshots is not None:
+            snapshots.close()
+
+    if total and not sink.success_count:
+        logger.warning("所有视频信息获取失败")
+    elif sink.success_count:
+        logger.info("统计数据已写入 %s，可用 --export 导出为 Excel", STATISTICS_DB)
+    return total, sink.success_count
 
 
 @timer_decorator
-def main():
-    """主函数，处理所有博主的视频信息"""
+def main(refresh=False, resume=None, author_list_file=AUTHOR_LIST_FILE, work_queue=None):
+    """
+    主函数，处理所有博主的视频信息
+
+    :param refresh: 为 True 时忽略缓存中的结果，重新抓取所有页面
+    :param resume: 要续跑的运行日志路径；为 None 时新建运行日志
+    :param author_list_file: 博主名单 Excel 文件
+    :param work_queue: 共享工作队列数据库路径；指定时作为工作进程从队列中领取博主，忽略博主名单和运行日志
+    """
+    setup_logger()
+    journal = None
+    if METRICS_HTTP_PORT:
+        metrics.serve_prometheus(METRICS_HTTP_PORT)
     try:
+        if CACHE_ENABLED:
+            get_fetch_cache().refresh = refresh
+
         # 确保输出目录存在
         Path(STATISTICS_FILE).parent.mkdir(parents=True, exist_ok=True)
 
-        # 读取博主URL列表
-        author_urls = read_author_urls_from_excel(AUTHOR_LIST_FILE)
-        if not author_urls:
-            logging.warning(f"未从 {AUTHOR_LIST_FILE} 中读取到博主URL")
+        if work_queue:
+            # 多机模式：处理进度写回共享队列
+            journal = QueueWorker(WorkQueue(work_queue))
+            set_run_id(journal.worker_id)
+            logger.info("工作进程 %s 开始从队列 %s 领取博主...", journal.worker_id, work_queue)
+            _, success_count = run_pipeline(journal.authors(), journal)
+            # 失败后重新领取的博主会再次进入流水线，按不同的博主计数
+            logger.info("处理完成: 成功 %s/%s 个博主", success_count, len(journal.claimed))
             return
 
-        logging.info(f"开始处理 {len(author_urls)} 个博主...")
-
-        # 使用线程池并行处理博主
-        with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            video_info_list = list(executor.map(process_author_videos, author_urls))
-
-        # 更新统计数据文件
-        if update_statistics_file(video_info_list):
-            logging.info(f"成功更新统计数据文件 {STATISTICS_FILE}")
-        else:
-            logging.error("更新统计数据文件失败")
+        # 运行日志：记录每个博主的处理进度，进程中断后可以续跑
+        journal = RunJournal(resume) if resume else RunJournal.create()
+        set_run_id(Path(journal.path).stem)
+        logger.info("运行日志: %s", journal.path)
+
+        # 边读取博主名单边处理，不必等大名单全部解析完
+        logger.info("开始处理 %s 中的博主...", author_list_file)
+        skipped = metrics.counter("authors_total", status="skipped")
+        skipped_before = skipped.value
+        total, success_count = run_pipeline(pending_authors(iter_author_urls(author_list_file), journal), journal)
+        finished = skipped.value - skipped_before
+        if finished:
+            logger.info("续跑: 跳过了已完成的 %s 个博主", finished)
+        if not total and not finished:
+            logger.warning("未从 %s 中读取到博主URL", author_list_file)
+            return
 
         # 统计成功和失败的数量
-        success_count = sum(1 for info in video_info_list if info is not None)
-        logging.info(f"处理完成: 成功 {success_count}/{len(author_urls)} 个博主")
+        logger.info("处理完成: 成功 %s/%s 个博主", success_count, total)
 
     except Exception as e:
-        logging.error(f"主函数执行时发生错误: {str(e)}")
+        logger.error("主函数执行时发生错误: %s", str(e))
+    finally:
+        if journal is not None:
+            journal.close()
+        close_driver_pool()
+        close_session()
+        close_fetch_cache()
+        close_archiver()
+        close_page_archive()
+        write_metrics()
+
+
+def enqueue_authors(queue_path, author_list_file=AUTHOR_LIST_FILE):
+    """协调命令：把博主名单加入共享工作队列"""
+    # 边读取名单边分批写入队列：不必先把整个名单读入内存，每批的写事务也很短
+    author_urls = iter_author_urls(author_list_file)
+    work_queue = WorkQueue(queue_path)
+    try:
+        added = read_count = 0
+        for batch in iter(lambda: list(islice(author_urls, ENQUEUE_BATCH_SIZE)), []):
+            added += work_queue.add(batch)
+            read_count += len(batch)
+        logger.info("已将 %s 个新博主加入队列 %s（名单共 %s 个）", added, queue_path, read_count)
+        logger.info("队列状态: %s", work_queue.counts())
+    finally:
+        work_queue.close()
+
+
+def merge_results(queue_path):
+    """协调命令：把队列中各工作进程的结果合并到本机的统计数据库和历史快照"""
+    work_queue = WorkQueue(queue_path)
+    store = StatisticsStore()
+    snapshots = SnapshotStore() if SNAPSHOT_ENABLED else None
+    try:
+        logger.info("队列状态: %s", work_queue.counts())
+        results = list(work_queue.iter_results())
+        merged = store.upsert_many(results)
+        logger.info("已将 %s 条结果合并到 %s，可用 --export 导出为 Excel", merged, STATISTICS_DB)
+        if snapshots is not None:
+            logger.info("新增 %s 条历史快照", snapshots.add_missing(results))
+    finally:
+        store.close()
+        if snapshots is not None:
+            snapshots.close()
+        work_queue.close()
+
+
+def reparse_author(author_url):
+    """
+    离线重新解析的工作进程：归档的博主主页 -> 点赞数最高的视频 -> 归档的视频页 -> 视频信息
+
+    :return: (博主URL, 视频信息或 None, 失败的阶段或 None)
+    """
+    archive = get_page_archive()
+    html = archive.latest("author", author_url)
+    result = process_author.parse_archived_author(html, author_url) if html else None
+    if not result or not result[1]:
+        return author_url, None, "author"
+
+    _, videos = result
+    video_link = max(videos, key=lambda video: parse_count(video["点赞数"]) or -1)["链接"]
+    html = archive.latest("video", video_link)
+    video_info = process_video.parse_archived_video(html, video_link) if html else None
+    if not video_info:
+        return author_url, None, "video"
+    video_info["链接"] = video_link
+    video_info["博主URL"] = author_url
+    return author_url, video_info, None
+
+
+@timer_decorator
+def reparse_archive(workers=REPARSE_WORKERS, batch_size=500):
+    """不启动浏览器，用多个进程重新解析归档的页面，结果写入统计数据库"""
+    archive = PageArchive()
+    try:
+        author_urls = archive.urls("author")
+    finally:
+        archive.close()
+    if not author_urls:
+        logger.warning("页面归档中没有博主主页，请先设置 SCRAPER_PAGE_ARCHIVE=1 抓取一次")
+        return
+
+    logger.info("用 %s 个进程重新解析 %s 个博主的归档页面...", workers, len(author_urls))
+    store = StatisticsStore()
+    batch = []
+    success_count = 0
+    try:
+        # 子进程的日志经队列交回主进程写出
+        with process_log_queue() as log_queue, ProcessPoolExecutor(
+                max_workers=workers, initializer=setup_process_logger, initargs=(log_queue,)) as executor:
+            chunksize = max(1, len(author_urls) // (workers * 4))
+            for author_url, video_info, failed_stage in executor.map(reparse_author, author_urls, chunksize=chunksize):
+                if video_info is None:
+                    logger.warning("博主 %s 的归档页面解析失败（%s）", author_url, failed_stage)
+                    metrics.counter("reparse_total", status="failed", stage=failed_stage).inc()
+                    continue
+                batch.append(video_info)
+                success_count += 1
+                metrics.counter("reparse_total", status="success").inc()
+                if len(batch) >= batch_size:
+                    store.upsert_many(batch)
+                    batch = []
+        store.upsert_many(batch)
+    finally:
+        store.close()
+    logger.info("重新解析完成: 成功 %s/%s 个博主，结果已写入 %s", success_count, len(author_urls), STATISTICS_DB)
+
+
+def report_top_movers(days, n=SNAPSHOT_TOP_MOVERS):
+    """输出最近 days 天点赞增长最多的视频"""
+    movers = SnapshotStore().top_movers(since=time.time() - days * 86400, n=n)
+    if movers.empty:
+        logger.warning("最近 %s 天内没有视频有两次以上的快照", days)
+        return
+    logger.info("最近 %s 天点赞增长最多的 %s 个视频:", days, len(movers))
+    for vid, row in movers.iterrows():
+        logger.info("%s  %s -> %s（+%s，每天 +%.0f）", vid, row["start"], row["end"], row["delta"], row["per_day"])
+
+
+def write_metrics():
+    """写入本次运行的指标汇总"""
+    try:
+        if METRICS_SUMMARY_FILE:
+            metrics.write_json(METRICS_SUMMARY_FILE)
+        if METRICS_PROMETHEUS_FILE:
+            metrics.write_prometheus(METRICS_PROMETHEUS_FILE)
+    except OSError as e:
+        logger.error("写入运行指标失败: %s", e)
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="抓取目标博主点赞数最高的视频信息")
+    parser.add_argument("--authors", default=AUTHOR_LIST_FILE, help=f"博主名单 Excel 文件（默认 {AUTHOR_LIST_FILE}）")
+    parser.add_argument("--refresh", action="store_true", help="忽略缓存，重新抓取所有页面")
+    parser.add_argument("--export", nargs="?", const=STATISTICS_FILE, metavar="FILE",
+                        help=f"不抓取，只把统计数据导出为 Excel（默认 {STATISTICS_FILE}）")
+    parser.add_argument("--reparse", action="store_true",
+                        help="不启动浏览器，用归档的页面（SCRAPER_PAGE_ARCHIVE=1 时保存）重新解析视频信息")
+    parser.add_argument("--movers", type=float, metavar="DAYS",
+                        help="不抓取，只根据历史快照输出最近 DAYS 天点赞增长最多的视频")
+    parser.add_argument("--resume", metavar="JOURNAL", help="根据运行日志续跑，只处理未完成的博主")
+    parser.add_argument("--queue", default=WORK_QUEUE_DB, metavar="DB", help=f"共享工作队列数据库（默认 {WORK_QUEUE_DB}）")
+    queue_mode = parser.add_mutually_exclusive_group()
+    queue_mode.add_argument("--enqueue", action="store_true", help="不抓取，只把博主名单加入共享工作队列")
+    queue_mode.add_argument("--worker", action="store_true", help="作为工作进程从共享工作队列中领取博主")
+    queue_mode.add_argument("--merge", action="store_true", help="不抓取，只把共享工作队列中的结果合并到统计数据库")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    logging.info("=" * 50)
-    logging.info("开始处理博主视频信息...")
-    main()
-    logging.info("处理完成!")
-    logging.info("=" * 50)
\ No newline at end of file
+    setup_logger()
+    args = parse_args()
+    if args.export:
+        export_statistics_file(args.export)
+    elif args.reparse:
+        reparse_archive()
+    elif args.movers:
+        report_top_movers(args.movers)
+    elif args.enqueue:
+        enqueue_authors(args.queue, args.authors)
+    elif args.merge:
+        merge_results(args.queue)
+    else:
+        logger.info("=" * 50)
+        logger.info("开始处理博主视频信息...")
+        main(refresh=args.refresh, resume=args.resume, author_list_file=args.authors,
+             work_queue=args.queue if args.worker else None)
+        logger.info("处理完成!")
+        logger.info("=" * 50)
\ No newline at end of file
@@ -0,0 +1,109 @@
+import logging
+import queue
+import threading
+from config import PIPELINE_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()  # 通知工作线程退出的哨兵
+
+
+class Pipeline:
+    """
+    由有界队列连接的多级流水线
+
+    每一级有独立的线程数，下游处理不过来时上游在 put 上阻塞（背压）；
+    最后一级的输出交给 sink 在单独的线程中逐条处理，边产出边保存。
+    """
+
+    def __init__(self, queue_size=PIPELINE_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.stages = []
+
+    def add_stage(self, name, func, workers, limiter=None):
+        """
+        添加一级处理
+
+        :param func: 处理函数，接收上一级的输出；返回 None 表示该条数据到此为止
+        :param workers: 该级的线程数（有 limiter 时为并发数上限）
+        :param limiter: 可选的 AdaptiveLimiter，按处理耗时和结果自适应调整实际并发数
+        """
+        self.stages.append((name, func, workers, limiter))
+        return self
+
+    def run(self, items, sink):
+        """
+        运行流水线直到所有数据处理完毕
+
+        :param items: 输入数据（可以是生成器）
+        :param sink: 具有 write(item) 和 close() 方法的结果接收者
+        :return: 输入数据的条数
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        stage_threads = []
+        for index, (name, func, workers, limiter) in enumerate(self.stages):
+            threads = [
+                threading.Thread(
+                    target=self._stage_worker,
+                    args=(name, func, limiter, queues[index], queues[index + 1]),
+                    name=f"{name}-{i}",
+                    daemon=True,
+                )
+                for i in range(workers)
+            ]
+            for thread in threads:
+                thread.start()
+            stage_threads.append(threads)
+
+        sink_thread = threading.Thread(target=self._sink_worker, args=(sink, queues[-1]), name="sink", daemon=True)
+        sink_thread.start()
+
+        count = 0
+        try:
+            for item in items:
+                queues[0].put(item)
+                count += 1
+        finally:
+            # 逐级关闭：上一级全部结束后再通知下一级退出；输入数据抛出异常时同样等各级处理完已输入的数据，
+            # 保证调用方关闭存储时没有线程仍在写入，异常随后继续抛出
+            for index, threads in enumerate(stage_threads):
+                for _ in threads:
+                    queues[index].put(_STOP)
+                for thread in threads:
+                    thread.join()
+            queues[-1].put(_STOP)
+            sink_thread.join()
+        return count
+
+    @staticmethod
+    def _stage_worker(name, func, limiter, in_queue, out_queue):
+        while True:
+            item = in_queue.get()
+            if item is _STOP:
+                return
+            try:
+                if limiter is None:
+                    result = func(item)
+                else:
+                    with limiter.slot() as outcome:
+                        result = func(item)
+                        outcome["success"] = result is not None
+            except Exception as e:
+                logger.error("流水线阶段 %s 处理 %s 时发生错误: %s", name, item, e)
+                result = None
+            if result is not None:
+                out_queue.put(result)
+
+    @staticmethod
+    def _sink_worker(sink, in_queue):
+        try:
+            while True:
+                item = in_queue.get()
+                if item is _STOP:
+                    return
+                try:
+                    sink.write(item)
+                except Exception as e:
+                    logger.error("保存结果时发生错误: %s", e)
+        finally:
+            sink.close()
@@ -1,65 +1,90 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import pandas as pd
 import logging
-import os
 import time
+from urllib.parse import urljoin
+from config import (
+    AUTHOR_EXTRACT_MODE, AUTHOR_TOP_K, AUTHOR_MAX_POSTS, AUTHOR_TIME_BUDGET, AUTHOR_SCROLL_WAIT, FETCH_BACKEND,
+    CACHE_ENABLED, AUTHOR_ARCHIVE_FORMAT, API_CAPTURE_TIMEOUT
+)
+from utils.archive import archive_author_videos, close_archiver
+from utils.concurrency import wait_for_host
+from utils.metrics import metrics
+from utils.cache import get_fetch_cache, close_fetch_cache
+from utils.counts import parse_count
+from utils.http_client import fetch_html
+from utils.logger import setup_logger
+from utils.readiness import page_wait
+from utils.page_archive import archive_html, archive_page
+from utils.page_data import extract_render_data, find_author_name, iter_awemes, aweme_to_post_record
+from utils.topk import TopK
+from utils.webdriver import borrow_driver, close_driver_pool, page_traffic
 
-# 配置日志
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-
-# ChromeDriver 路径
-CHROME_DRIVER_PATH = r'D:\Anaconda3\chromedriver-win64\chromedriver.exe'
-
-# 博主视频数据保存目录
-OUTPUT_DIR = "./博主视频数据"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-
-def init_driver():
-    """初始化 WebDriver"""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # 无头模式，不打开浏览器窗口
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("--ignore-certificate-errors")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option("useAutomationExtension", False)
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")  # 减少内存占用
-    chrome_options.add_argument("--disable-extensions")  # 禁用扩展
-    chrome_options.add_argument("--disable-images")  # 不加载图片，提高速度
-    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
-    chrome_options.add_argument("--disable-javascript")  # 根据需要可以禁用JavaScript
-    chrome_options.add_argument("--incognito")  # 无痕模式
-    chrome_options.add_argument("--disable-infobars")
-    chrome_options.add_argument("--disable-notifications")
-    chrome_options.ignore_local_proxy_environment_variables()
-
-    service = Service(CHROME_DRIVER_PATH)
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    return driver
-
-
-def close_window(wait):
-    """关闭登录弹窗"""
-    logging.info("尝试关闭登录弹窗...")
+logger = logging.getLogger(__name__)
+
+# 在页面内一次性读取作品列表中第 arguments[0] 个之后每个 <li> 的标题、点赞数和链接
+POST_LIST_SCRIPT = """
+const list = document.querySelector('div[data-e2e="user-post-list"] ul');
+if (!list) {
+    return [];
+}
+const start = arguments[0] || 0;
+const records = [];
+for (const li of Array.from(list.querySelectorAll('li')).slice(start)) {
+    const link = li.querySelector('a');
+    const title = li.querySelector('a p');
+    const like = li.querySelector('span');
+    if (!link || !title || !like) {
+        records.push(null);
+        continue;
+    }
+    records.push({
+        '标题': (title.innerText || title.textContent || '').trim(),
+        '点赞数': (like.innerText || like.textContent || '').trim(),
+        '链接': link.href,
+    });
+}
+return records;
+"""
+
+POST_COUNT_SCRIPT = """
+const list = document.querySelector('div[data-e2e="user-post-list"] ul');
+return list ? list.querySelectorAll('li').length : 0;
+"""
+
+
+LOGIN_POPUP_TEXT = "登录后免费畅享高清视频"
+AUTHOR_INFO_XPATH = '//div[@data-e2e="user-info"]'
+# 与 POST_LIST_SCRIPT 对应的 XPath，用于从已保存的页面 HTML 中提取作品列表
+POST_LIST_XPATH = '//div[@data-e2e="user-post-list"]//ul'
+
+
+def close_window(wait, ready_xpath=None):
+    """
+    关闭登录弹窗
+
+    :param ready_xpath: 页面主体内容的 XPath；给出时弹窗和主体内容任一出现即停止等待，
+                        没有弹窗的页面不必等满超时时间
+    """
+    logger.debug("尝试关闭登录弹窗...")
+    popup = EC.presence_of_element_located((By.XPATH, f'//div[contains(text(), "{LOGIN_POPUP_TEXT}")]'))
     try:
-        fixed_sibling = wait.until(
-            EC.presence_of_element_located((By.XPATH, '//div[contains(text(), "登录后免费畅享高清视频")]'))
-        )
+        if ready_xpath:
+            element = wait.until(EC.any_of(popup, EC.presence_of_element_located((By.XPATH, ready_xpath))))
+            if LOGIN_POPUP_TEXT not in element.text:
+                logger.debug("页面内容已加载，未出现登录弹窗")
+                return
+            fixed_sibling = element
+        else:
+            fixed_sibling = wait.until(popup)
         close_button = fixed_sibling.find_element(By.XPATH, './following-sibling::div')
         close_button.click()
-        logging.info("登录弹窗已关闭")
+        logger.info("登录弹窗已关闭")
     except TimeoutException:
-        logging.warning("未找到登录弹窗")
+        logger.warning("未找到登录弹窗")
     except NoSuchElementException:
-        logging.warning("关闭按钮未找到")
+        logger.warning("关闭按钮未找到")
 
 
 def extract_video_info(video):
@@ -76,66 +101,303 @@ def extract_video_info(video):
             "链接": video_link
         }
     except NoSuchElementException:
-        logging.warning("视频信息提取失败，跳过该视频")
+        logger.warning("视频信息提取失败，跳过该视频")
+        return None
+
+
+def extract_video_list(driver, wait):
+    """逐个 <li> 调用 find_element 提取作品列表"""
+    post_list = wait.until(EC.presence_of_element_located((By.XPATH, '//div[@data-e2e="user-post-list"]')))
+    video_list = post_list.find_element(By.XPATH, './/ul')
+    videos = video_list.find_elements(By.XPATH, './/li')
+    return [extract_video_info(video) for video in videos]
+
+
+def extract_video_list_by_script(driver, wait, start=0):
+    """通过一次页面内脚本调用批量提取作品列表（从第 start 个 <li> 开始）"""
+    wait.until(EC.presence_of_element_located((By.XPATH, '//div[@data-e2e="user-post-list"]//ul')))
+    records = driver.execute_script(POST_LIST_SCRIPT, start)
+    skipped = sum(1 for record in records if record is None)
+    if skipped:
+        logger.warning("%s 个视频信息提取失败，已跳过", skipped)
+    return records
+
+
+def iter_post_pages(driver, wait, max_posts=AUTHOR_MAX_POSTS, time_budget=AUTHOR_TIME_BUDGET):
+    """
+    滚动加载博主作品列表，逐页产出新出现的作品记录
+
+    达到 max_posts 条、超出 time_budget 秒或滚动后不再有新作品时停止。
+    """
+    deadline = time.time() + time_budget
+    loaded = 0
+    while True:
+        records = extract_video_list_by_script(driver, wait, start=loaded)
+        loaded += len(records)
+        if records:
+            yield records
+
+        if loaded >= max_posts:
+            logger.info("已加载 %s 个作品，达到上限 %s", loaded, max_posts)
+            return
+        if time.time() >= deadline:
+            logger.info("已加载 %s 个作品，超出时间预算 %s 秒", loaded, time_budget)
+            return
+
+        # 滚动到底部触发下一页加载
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        try:
+            page_wait(driver, AUTHOR_SCROLL_WAIT).until(
+                lambda d: d.execute_script(POST_COUNT_SCRIPT) > loaded
+            )
+        except TimeoutException:
+            logger.info("没有更多作品，共加载 %s 个", loaded)
+            return
+
+
+def collect_top_videos(driver, wait, k=AUTHOR_TOP_K):
+    """滚动读取完整作品列表，只保留点赞数最高的 k 条记录"""
+    top_videos = TopK(k)
+    for records in iter_post_pages(driver, wait):
+        for record in records:
+            if record:
+                likes = parse_count(record["点赞数"])
+                top_videos.push(-1 if likes is None else likes, record)
+    return top_videos.items()
+
+
+def parse_author_html(html, author_url):
+    """
+    从页面内嵌的 RENDER_DATA 中解析博主名字和作品列表（不需要浏览器）
+
+    :return: (博主名字, 点赞数最高的若干作品记录)；解析失败时返回 None
+    """
+    data = extract_render_data(html)
+    if data is None:
         return None
+    author_name = find_author_name(data)
+    top_videos = TopK(AUTHOR_TOP_K)
+    for aweme in iter_awemes(data):
+        record = aweme_to_post_record(aweme, author_url)
+        likes = parse_count(record["点赞数"])
+        top_videos.push(-1 if likes is None else likes, record)
+    if not author_name or not len(top_videos):
+        return None
+    return author_name, top_videos.items()
 
 
-def get_author_info(author_url):
-    """获取博主信息并保存视频数据"""
-    driver = init_driver()
-    wait = WebDriverWait(driver, 10)
+def extract_posts_from_html(html, author_url):
+    """
+    用 lxml 从已保存的博主主页 HTML 中提取博主名字和作品列表（与脚本模式的结果一致）
 
+    :return: (博主名字, 作品记录列表)；未安装 lxml 或页面中没有作品列表时返回 None
+    """
     try:
-        driver.get(author_url)
-        close_window(wait)
+        import lxml.html
+    except ImportError:
+        return None
+    tree = lxml.html.fromstring(html)
+    names = tree.xpath(f'{AUTHOR_INFO_XPATH}//span')
+    lists = tree.xpath(POST_LIST_XPATH)
+    if not names or not lists:
+        return None
+    records = []
+    for li in lists[0].iter("li"):
+        links, titles, likes = li.xpath('.//a'), li.xpath('.//a//p'), li.xpath('.//span')
+        if links and titles and likes:
+            records.append({
+                "标题": titles[0].text_content().strip(),
+                "点赞数": likes[0].text_content().strip(),
+                "链接": urljoin(author_url, links[0].get("href", "")),
+            })
+    return names[0].text_content().strip(), records
+
+
+def parse_archived_author(html, author_url, k=AUTHOR_TOP_K):
+    """
+    解析归档的博主主页：优先按 DOM 结构提取（需要 lxml），失败时解析页面内嵌数据
+
+    :return: (博主名字, 点赞数最高的 k 个作品记录)；解析失败时返回 None
+    """
+    result = extract_posts_from_html(html, author_url)
+    if not result or not result[1]:
+        return parse_author_html(html, author_url)
+    author_name, records = result
+    top_videos = TopK(k)
+    for record in records:
+        likes = parse_count(record["点赞数"])
+        top_videos.push(-1 if likes is None else likes, record)
+    return author_name, top_videos.items()
+
 
-        # 提取博主名字
-        author_info = wait.until(EC.presence_of_element_located((By.XPATH, '//div[@data-e2e="user-info"]')))
-        author_name = author_info.find_element(By.XPATH, './/span').text.strip()
-        logging.info(f"博主名字: {author_name}")
+def fetch_author_videos_http(author_url):
+    """通过 HTTP 获取博主主页并解析作品列表，失败时返回 None"""
+    html = fetch_html(author_url)
+    archive_html("author", author_url, html)
+    result = parse_author_html(html, author_url)
+    if result is None:
+        metrics.counter("http_parse_failures_total", page="author").inc()
+        logger.info("未能从 %s 的页面数据中解析出作品列表", author_url)
+    return result
 
-        # 提取视频列表
-        post_list = wait.until(EC.presence_of_element_located((By.XPATH, '//div[@data-e2e="user-post-list"]')))
-        video_list = post_list.find_element(By.XPATH, './/ul')
-        videos = video_list.find_elements(By.XPATH, './/li')
+
+def extract_author_page(driver, wait):
+    """
+    从博主主页的 DOM 中提取博主名字和作品列表
+
+    :return: (博主名字, 作品记录列表)
+    """
+    close_window(wait, ready_xpath=AUTHOR_INFO_XPATH)
+
+    # 提取博主名字
+    author_info = wait.until(EC.presence_of_element_located((By.XPATH, AUTHOR_INFO_XPATH)))
+    author_name = author_info.find_element(By.XPATH, './/span').text.strip()
+    logger.info("博主名字: %s", author_name)
+
+    # 提取视频列表（脚本模式会滚动加载全部作品并只保留点赞数最高的若干条）
+    with metrics.timer("post_list_extract_seconds", mode=AUTHOR_EXTRACT_MODE):
+        if AUTHOR_EXTRACT_MODE == "script":
+            videos = collect_top_videos(driver, wait)
+        else:
+            videos = extract_video_list(driver, wait)
+    return author_name, videos
+
+
+def capture_top_videos(driver, network, author_url, k=AUTHOR_TOP_K, max_posts=AUTHOR_MAX_POSTS,
+                       time_budget=AUTHOR_TIME_BUDGET):
+    """
+    从博主主页自身请求的作品列表接口响应中收集作品（精确的整数点赞数），滚动页面触发后续分页，
+    接口返回没有更多作品、达到 max_posts 条或超出 time_budget 秒时停止
+
+    :param network: page_traffic 返回的 NetworkLog
+    :return: (博主名字, 点赞数最高的 k 个作品记录)；未开启接口捕获或未捕获到响应时返回 None
+    """
+    if network is None or not network.capture:
+        return None
+    deadline = time.time() + time_budget
+    author_name = None
+    top_videos = TopK(k)
+    loaded = 0
+    with metrics.timer("post_list_extract_seconds", mode="api"):
+        responses = network.wait_json(API_CAPTURE_TIMEOUT)
+        while responses:
+            has_more = False
+            for data in responses:
+                author_name = author_name or find_author_name(data)
+                has_more = bool(data.get("has_more"))  # 响应按到达顺序排列，以最后一页为准
+                for aweme in iter_awemes(data):
+                    record = aweme_to_post_record(aweme, author_url)
+                    likes = parse_count(record["点赞数"])
+                    top_videos.push(-1 if likes is None else likes, record)
+                    loaded += 1
+            if not has_more or loaded >= max_posts or time.time() >= deadline:
+                break
+            # 滚动到底部触发下一页请求
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            responses = network.wait_json(AUTHOR_SCROLL_WAIT)
+
+    if not author_name or not len(top_videos):
+        metrics.counter("api_capture_total", page="author", status="miss").inc()
+        logger.info("未捕获到 %s 的作品列表接口响应，改为从页面提取", author_url)
+        return None
+    metrics.counter("api_capture_total", page="author", status="hit").inc()
+    logger.info("博主名字: %s（从接口响应中获取了 %s 个作品）", author_name, loaded)
+    return author_name, top_videos.items()
+
+
+def scrape_author_videos(driver, author_url):
+    """
+    用浏览器打开博主主页并提取作品列表
+
+    :return: (博主名字, 作品记录列表)；失败时返回 None
+    """
+    wait = page_wait(driver)
+
+    try:
+        wait_for_host(author_url)
+        with page_traffic(driver, "author") as network:
+            with metrics.timer("page_get_seconds", page="author"):
+                driver.get(author_url)
+
+            try:
+                # 开启接口捕获时优先从作品列表接口的响应中收集作品，未捕获到再从页面提取
+                captured = capture_top_videos(driver, network, author_url)
+                if captured is not None:
+                    author_name, videos = captured
+                else:
+                    author_name, videos = extract_author_page(driver, wait)
+            finally:
+                # 无论提取成功与否都归档滚动加载后的页面，提取逻辑失效时可以离线重新解析
+                archive_page("author", author_url, driver)
 
         # 提取视频信息
         video_data = []
-        for video in videos:
-            video_info = extract_video_info(video)
+        for video_info in videos:
             if video_info:
                 video_data.append(video_info)
-                logging.info(f"提取到视频: {video_info['标题']}")
-
-        # 保存到 Excel 文件
-        if video_data:
-            excel_filename = os.path.join(OUTPUT_DIR, f"{author_name}_抖音视频信息.xlsx")
-            df = pd.DataFrame(video_data)
-            df.to_excel(excel_filename, index=False, engine="openpyxl")
-            logging.info(f"视频信息已保存到 {excel_filename}")
-            return excel_filename
-        else:
-            logging.warning("未提取到视频信息，未生成 Excel 文件")
-            return None
+                logger.debug("提取到视频: %s", video_info['标题'])
+        return author_name, video_data
 
     except TimeoutException:
-        logging.error("页面加载超时，未找到目标元素")
+        logger.error("页面加载超时，未找到目标元素")
     except NoSuchElementException:
-        logging.error("目标元素未找到")
+        logger.error("目标元素未找到")
     except Exception as e:
-        logging.error(f"发生未知错误: {e}")
-    finally:
-        driver.quit()
+        logger.error("发生未知错误: %s", e)
+    return None
+
+
+def get_author_info(author_url, driver=None):
+    """
+    获取博主的作品列表（脚本模式下只保留点赞数最高的 AUTHOR_TOP_K 个作品）
+
+    FETCH_BACKEND 为 "http" 时先尝试不启动浏览器直接解析页面数据，失败后再回退到浏览器；
+    缓存中有未过期的结果时不访问页面。新抓取的作品列表会按 AUTHOR_ARCHIVE_FORMAT 在后台归档。
+
+    :param author_url: 博主主页URL
+    :param driver: 已借出的浏览器；为 None 时从共享的 WebDriver 池中借用
+    :return: 作品记录列表（标题、点赞数、链接）或None
+    """
+    cached = get_fetch_cache().get("author", author_url) if CACHE_ENABLED else None
+    if cached is not None:
+        metrics.counter("cache_hits_total", kind="author").inc()
+        return cached["视频"]
+
+    result = None
+    if FETCH_BACKEND == "http":
+        result = fetch_author_videos_http(author_url)
+        if result is None:
+            logger.info("HTTP 解析失败，回退到浏览器")
+
+    if result is None:
+        with borrow_driver(driver) as driver:
+            result = scrape_author_videos(driver, author_url)
+        if result is None:
+            return None
+
+    author_name, video_data = result
+    if not video_data:
+        logger.warning("未从博主 %s 的主页提取到视频信息", author_name)
+        return None
+
+    if CACHE_ENABLED:
+        get_fetch_cache().put("author", author_url, {"博主": author_name, "视频": video_data})
+    archive_author_videos(author_name, video_data, AUTHOR_ARCHIVE_FORMAT)
+    return video_data
 
 
 if __name__ == "__main__":
+    setup_logger()
     time_start = time.time()  # 开始计时
     # 替换为你要爬取的抖音博主 URL
     author_url = "https://www.douyin.com/user/MS4wLjABAAAAe7E39khw8gf387YKAoQ6jxOnPLeIJH5ntk9GUhFGWPbBd4WHJo_bkJiuk1PYzz6l?from_tab_name=main"
 
-    logging.info("开始爬取视频信息...")
+    logger.info("开始爬取视频信息...")
     get_author_info(author_url)
 
+    close_driver_pool()
+    close_fetch_cache()
+    close_archiver()
     time_end = time.time()  # 结束计时
     time_c = time_end - time_start  # 运行所花时间
-    logging.info(f"总计花费{time_c}秒")
\ No newline at end of file
+    logger.info("总计花费%s秒", time_c)
\ No newline at end of file
@@ -1,77 +1,65 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import re
 import logging
 import time
-
-# 配置日志
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-
-# ChromeDriver 路径
-CHROME_DRIVER_PATH = r'D:\Anaconda3\chromedriver-win64\chromedriver.exe'
-
-
-def init_driver():
-    """初始化 WebDriver"""
-    options = Options()
-    options.add_argument("--headless")  # 无头模式，不打开浏览器窗口
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument("--ignore-certificate-errors")
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option("useAutomationExtension", False)
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")  # 减少内存占用
-    options.add_argument("--disable-extensions")  # 禁用扩展
-    options.add_argument("--disable-images")  # 不加载图片，提高速度
-    options.add_argument("--blink-settings=imagesEnabled=false")
-    options.add_argument("--disable-javascript")  # 根据需要可以禁用JavaScript
-    options.add_argument("--incognito")  # 无痕模式
-    options.add_argument("--disable-infobars")
-    options.add_argument("--disable-notifications")
-
-    # 设置更真实的用户代理
-    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36"
-    options.add_argument(f'user-agent={user_agent}')
-
-    # 忽略代理设置
-    options.ignore_local_proxy_environment_variables()
-
-    # 创建 Service 对象和 WebDriver
-    service = Service(CHROME_DRIVER_PATH)
-    driver = webdriver.Chrome(service=service, options=options)
-
-    # 执行 CDP 命令来避免被检测
-    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-        "source": """
-        Object.defineProperty(navigator, 'webdriver', {
-            get: () => undefined
-        });
-        """
-    })
-
-    return driver
+from config import VIDEO_EXTRACT_MODE, FETCH_BACKEND, CACHE_ENABLED, API_CAPTURE_TIMEOUT
+from utils.concurrency import wait_for_host
+from utils.metrics import metrics
+from utils.cache import get_fetch_cache, close_fetch_cache
+from utils.http_client import fetch_html
+from utils.logger import setup_logger
+from utils.readiness import page_wait, wait_for_settled
+from utils.page_archive import archive_html, archive_page
+from utils.page_data import extract_render_data, iter_awemes, aweme_to_video_record
+from utils.snapshots import FETCHED_AT_FIELD
+from utils.webdriver import borrow_driver, close_driver_pool, page_traffic
+
+logger = logging.getLogger(__name__)
+
+# 视频页容器及各字段的 XPath
+VIDEO_CONTAINER_XPATH = '//*[@id="douyin-right-container"]'
+VIDEO_FIELD_XPATHS = {
+    '点赞量': '//*[@id="douyin-right-container"]/div[2]/div/div/div[1]/div[3]/div/div[2]/div[1]/div[1]/span',
+    '评论量': '//*[@id="douyin-right-container"]/div[2]/div/div/div[1]/div[3]/div/div[2]/div[1]/div[2]/span',
+    '转发量': '//*[@id="douyin-right-container"]/div[2]/div/div/div[1]/div[3]/div/div[2]/div[1]/div[3]/span',
+    '标题': '//*[@id="douyin-right-container"]/div[2]/div/div/div[1]/div[3]/div/div[1]',
+    '博主': '//*[@id="douyin-right-container"]/div[2]/div/div/div[1]/div[4]/div/div[1]/div[2]/a/div/span/span/span/span/span/span',
+    '发布日期': '//*[@id="douyin-right-container"]/div[2]/div/div/div[1]/div[3]/div/div[2]/div[2]',
+}
+
+# 在页面内一次性按 XPath 读取所有字段，缺失的字段返回 null
+EXTRACT_FIELDS_SCRIPT = """
+const xpaths = arguments[0];
+const result = {};
+for (const [key, xpath] of Object.entries(xpaths)) {
+    const node = document.evaluate(
+        xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+    result[key] = node ? (node.innerText || node.textContent || '').trim() : null;
+}
+return result;
+"""
+
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}")
+VIDEO_ID_PATTERN = re.compile(r"/video/(\d+)")
 
 
 def close_window(wait):
     """关闭登录弹窗"""
-    logging.info("尝试关闭登录弹窗...")
+    logger.debug("尝试关闭登录弹窗...")
     try:
         fixed_sibling = wait.until(
             EC.presence_of_element_located((By.XPATH, '//div[contains(text(), "登录后免费畅享高清视频")]'))
         )
         close_button = fixed_sibling.find_element(By.XPATH, './following-sibling::div')
         close_button.click()
-        logging.info("登录弹窗已关闭")
+        logger.info("登录弹窗已关闭")
     except TimeoutException:
-        logging.warning("未找到登录弹窗")
+        logger.warning("未找到登录弹窗")
     except NoSuchElementException:
-        logging.warning("关闭按钮未找到")
+        logger.warning("关闭按钮未找到")
 
 
 def extract_video_info(wait):
@@ -79,75 +67,81 @@ def extract_video_info(wait):
     video_info = {}
 
     # 获取点赞数
-    logging.info("开始爬取点赞数...")
+    logger.debug("开始爬取点赞数...")
     try:
-        like_element = wait.until(
-            EC.presence_of_element_located(
-                (By.XPATH, '//*[@id="douyin-right-container"]/div[2]/div/div/div[1]/div[3]/div/div[2]/div[1]/div[1]/span')
+        with metrics.timer("video_field_wait_seconds", field="点赞量"):
+            like_element = wait.until(
+                EC.presence_of_element_located(
+                    (By.XPATH, VIDEO_FIELD_XPATHS['点赞量'])
+                )
             )
-        )
         video_info['点赞量'] = like_element.text.strip()
     except (TimeoutException, NoSuchElementException):
         video_info['点赞量'] = "无法获取点赞数"
 
     # 获取评论数
-    logging.info("开始爬取评论数...")
+    logger.debug("开始爬取评论数...")
     try:
-        comment_element = wait.until(
-            EC.presence_of_element_located(
-                (By.XPATH, '//*[@id="douyin-right-container"]/div[2]/div/div/div[1]/div[3]/div/div[2]/div[1]/div[2]/span')
+        with metrics.timer("video_field_wait_seconds", field="评论量"):
+            comment_element = wait.until(
+                EC.presence_of_element_located(
+                    (By.XPATH, VIDEO_FIELD_XPATHS['评论量'])
+                )
             )
-        )
         video_info['评论量'] = comment_element.text.strip()
     except (TimeoutException, NoSuchElementException):
         video_info['评论量'] = "无法获取评论数"
 
     # 获取转发数
-    logging.info("开始爬取转发数...")
+    logger.debug("开始爬取转发数...")
     try:
-        share_element = wait.until(
-            EC.presence_of_element_located(
-                (By.XPATH, '//*[@id="douyin-right-container"]/div[2]/div/div/div[1]/div[3]/div/div[2]/div[1]/div[3]/span')
+        with metrics.timer("video_field_wait_seconds", field="转发量"):
+            share_element = wait.until(
+                EC.presence_of_element_located(
+                    (By.XPATH, VIDEO_FIELD_XPATHS['转发量'])
+                )
             )
-        )
         video_info['转发量'] = share_element.text.strip()
     except (TimeoutException, NoSuchElementException):
         video_info['转发量'] = "无法获取转发数"
 
     # 获取视频标题
-    logging.info("开始爬取视频标题...")
+    logger.debug("开始爬取视频标题...")
     try:
-        title_element = wait.until(
-            EC.presence_of_element_located(
-                (By.XPATH, '//*[@id="douyin-right-container"]/div[2]/div/div/div[1]/div[3]/div/div[1]')
+        with metrics.timer("video_field_wait_seconds", field="标题"):
+            title_element = wait.until(
+                EC.presence_of_element_located(
+                    (By.XPATH, VIDEO_FIELD_XPATHS['标题'])
+                )
             )
-        )
         video_info['标题'] = title_element.text.strip()
     except (TimeoutException, NoSuchElementException):
         video_info['标题'] = "无法获取视频标题"
 
     # 获取作者信息
-    logging.info("开始爬取作者信息...")
+    logger.debug("开始爬取作者信息...")
     try:
-        author_element = wait.until(
-            EC.presence_of_element_located(
-                (By.XPATH, '//*[@id="douyin-right-container"]/div[2]/div/div/div[1]/div[4]/div/div[1]/div[2]/a/div/span/span/span/span/span/span')
+        with metrics.timer("video_field_wait_seconds", field="博主"):
+            author_element = wait.until(
+                EC.presence_of_element_located(
+                    (By.XPATH, VIDEO_FIELD_XPATHS['博主'])
+                )
             )
-        )
         video_info['博主'] = author_element.text.strip()
     except (TimeoutException, NoSuchElementException):
         video_info['博主'] = "无法获取作者信息"
 
     # 获取视频发布日期
-    logging.info("开始爬取发布日期...")
+    logger.debug("开始爬取发布日期...")
     try:
-        date_element = wait.until(
-            EC.presence_of_element_located(
-                (By.XPATH, '//*[@id="douyin-right-container"]/div[2]/div/div/div[1]/div[3]/div/div[2]/div[2]')
+        with metrics.timer("video_field_wait_seconds", field="发布日期"):
+            date_element = wait.until(
+                EC.presence_of_element_located(
+                    (By.XPATH, VIDEO_FIELD_XPATHS['发布日期'])
+                )
             )
-        )
         full_text = date_element.text.strip()
-        time_match = re.search(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}", full_text)
+        time_match = DATE_PATTERN.search(full_text)
         if time_match:
             video_info['发布日期'] = time_match.group(0)
     except (TimeoutException, NoSuchElementException):
@@ -156,45 +150,210 @@ def extract_video_info(wait):
     return video_info
 
 
-def get_video_info(video_url):
-    """获取视频信息"""
-    driver = init_driver()
-    wait = WebDriverWait(driver, 10)
+def extract_video_info_by_script(driver, wait, network=None):
+    """
+    提取视频信息（脚本模式）
+
+    只等待一次视频容器出现、DOM 稳定并且网络空闲（点赞等数量由接口请求填充），
+    随后通过一次页面内脚本调用读取全部字段，缺失的字段为 None，不会逐个字段等待超时。
+
+    :param network: page_traffic 返回的 NetworkLog，为 None 时按注入脚本判断网络空闲
+    """
+    with metrics.timer("video_field_wait_seconds", field="容器"):
+        wait.until(EC.presence_of_element_located((By.XPATH, VIDEO_CONTAINER_XPATH)))
+        wait_for_settled(driver, network_log=network)
+    with metrics.timer("video_extract_seconds", mode="script"):
+        video_info = driver.execute_script(EXTRACT_FIELDS_SCRIPT, VIDEO_FIELD_XPATHS)
+    return finish_video_info(video_info)
+
+
+def finish_video_info(video_info):
+    """从发布日期字段中取出日期时间，并提示未能获取的字段"""
+    if video_info.get('发布日期'):
+        time_match = DATE_PATTERN.search(video_info['发布日期'])
+        video_info['发布日期'] = time_match.group(0) if time_match else None
 
+    missing = [key for key, value in video_info.items() if value is None]
+    if missing:
+        logger.warning("以下字段未能获取: %s", ', '.join(missing))
+    return video_info
+
+
+def extract_video_info_from_html(html):
+    """
+    用 lxml 按 VIDEO_FIELD_XPATHS 从已保存的页面 HTML 中提取视频信息（与脚本模式的结果一致）
+
+    :return: 视频信息字典；未安装 lxml 或页面中没有视频容器时返回 None
+    """
     try:
-        driver.get(video_url)
-        # close_window(wait)
+        import lxml.html
+    except ImportError:
+        return None
+    tree = lxml.html.fromstring(html)
+    if not tree.xpath(VIDEO_CONTAINER_XPATH):
+        return None
+    video_info = {}
+    for key, xpath in VIDEO_FIELD_XPATHS.items():
+        nodes = tree.xpath(xpath)
+        video_info[key] = nodes[0].text_content().strip() if nodes else None
+    return finish_video_info(video_info)
+
 
-        # 提取视频信息
-        video_info = extract_video_info(wait)
+def parse_video_html(html, video_url):
+    """
+    从页面内嵌的 RENDER_DATA 中解析视频信息（不需要浏览器）
+
+    :return: 视频信息字典；解析失败时返回 None
+    """
+    data = extract_render_data(html)
+    if data is None:
+        return None
+    return select_video_record(data, video_url)
+
+
+def select_video_record(data, video_url):
+    """
+    从页面数据或接口响应中取出视频信息
+
+    数据里可能还有相关推荐作品：URL 中有作品 ID 时只取 ID 一致的作品，没有时返回 None，
+    由调用方回退到其他提取方式；URL 中没有 ID 时取第一个作品。
+    """
+    match = VIDEO_ID_PATTERN.search(video_url)
+    awemes = iter_awemes(data)
+    if match is None:
+        aweme = next(awemes, None)
+        return aweme_to_video_record(aweme) if aweme is not None else None
+    for aweme in awemes:
+        if str(aweme.get("awemeId") or aweme.get("aweme_id")) == match.group(1):
+            return aweme_to_video_record(aweme)
+    return None
+
+
+def parse_archived_video(html, video_url):
+    """
+    解析归档的视频页：优先按 XPath 提取（需要 lxml），失败时解析页面内嵌数据
+
+    :return: 视频信息字典；解析失败时返回 None
+    """
+    video_info = extract_video_info_from_html(html)
+    if video_info is None or all(video_info.get(key) is None for key in ('点赞量', '评论量', '转发量')):
+        video_info = parse_video_html(html, video_url)
+    return video_info
+
+
+def capture_video_info(network, video_url):
+    """
+    从视频页自身请求的作品详情接口响应中解析视频信息（精确的整数计数）
+
+    :param network: page_traffic 返回的 NetworkLog
+    :return: 视频信息字典；未开启接口捕获或未捕获到响应时返回 None
+    """
+    if network is None or not network.capture:
+        return None
+    for data in network.wait_json(API_CAPTURE_TIMEOUT):
+        video_info = select_video_record(data, video_url)
+        if video_info is not None:
+            metrics.counter("api_capture_total", page="video", status="hit").inc()
+            return video_info
+    metrics.counter("api_capture_total", page="video", status="miss").inc()
+    logger.info("未捕获到 %s 的作品详情接口响应，改为从页面提取", video_url)
+    return None
+
+
+def fetch_video_info_http(video_url):
+    """通过 HTTP 获取视频页并解析视频信息，失败时返回 None"""
+    html = fetch_html(video_url)
+    archive_html("video", video_url, html)
+    video_info = parse_video_html(html, video_url)
+    if video_info is None:
+        metrics.counter("http_parse_failures_total", page="video").inc()
+        logger.info("未能从 %s 的页面数据中解析出视频信息", video_url)
+    return video_info
+
+
+def get_video_info(video_url, driver=None):
+    """
+    获取视频信息
+
+    FETCH_BACKEND 为 "http" 时先尝试不启动浏览器直接解析页面数据，失败后再回退到浏览器；
+    缓存中有未过期的结果时不访问页面。
+
+    :param video_url: 视频URL
+    :param driver: 已借出的浏览器；为 None 时从共享的 WebDriver 池中借用
+    :return: 视频信息字典或None
+    """
+    cached = get_fetch_cache().get("video", video_url) if CACHE_ENABLED else None
+    if cached is not None:
+        metrics.counter("cache_hits_total", kind="video").inc()
+        return cached
+
+    video_info = None
+    if FETCH_BACKEND == "http":
+        video_info = fetch_video_info_http(video_url)
+        if video_info is None:
+            logger.info("HTTP 解析失败，回退到浏览器")
+
+    if video_info is None:
+        with borrow_driver(driver) as driver:
+            video_info = scrape_video_info(driver, video_url)
+
+    if video_info:
+        # 记录抓取时间，缓存命中时返回的是当时的数据，历史快照据此区分新旧数据
+        video_info[FETCHED_AT_FIELD] = time.time()
+    if CACHE_ENABLED and video_info:
+        get_fetch_cache().put("video", video_url, video_info)
+    return video_info
+
+
+def scrape_video_info(driver, video_url):
+    """用浏览器打开视频页并提取视频信息，失败时返回 None"""
+    wait = page_wait(driver)
+
+    try:
+        wait_for_host(video_url)
+        with page_traffic(driver, "video") as network:
+            with metrics.timer("page_get_seconds", page="video"):
+                driver.get(video_url)
+            # close_window(wait)
+
+            # 提取视频信息；无论成功与否都归档页面，提取逻辑失效时可以离线重新解析
+            try:
+                video_info = capture_video_info(network, video_url)
+                if video_info is None and VIDEO_EXTRACT_MODE == "script":
+                    video_info = extract_video_info_by_script(driver, wait, network)
+                elif video_info is None:
+                    with metrics.timer("video_extract_seconds", mode="legacy"):
+                        video_info = extract_video_info(wait)
+            finally:
+                archive_page("video", video_url, driver)
         return video_info
 
     except Exception as e:
-        logging.error(f"爬取过程中发生错误: {e}")
+        logger.error("爬取过程中发生错误: %s", e)
         return None
-    finally:
-        driver.quit()
 
 
 if __name__ == "__main__":
+    setup_logger()
     time_start = time.time()  # 开始计时
 
     # 替换为你要爬取的抖音视频 URL
     video_url = "https://www.douyin.com/video/7481670454600600842"  # 注意：确保ID是正确的
 
-    logging.info("开始爬取视频信息...")
+    logger.info("开始爬取视频信息...")
     video_info = get_video_info(video_url)
 
 
-
     if video_info:
-        logging.info("\n获取到的视频信息:")
+        logger.info("\n获取到的视频信息:")
         for key, value in video_info.items():
-            logging.info(f"{key}: {value}")
+            logger.info("%s: %s", key, value)
     else:
-        logging.error("未能获取视频信息，请检查URL或网络连接。")
+        logger.error("未能获取视频信息，请检查URL或网络连接。")
 
 
+    close_driver_pool()
+    close_fetch_cache()
     time_end = time.time()  # 结束计时
     time_c = time_end - time_start  # 运行所花时间
-    logging.info(f"总计花费{time_c}秒")
\ No newline at end of file
+    logger.info("总计花费%s秒", time_c)
\ No newline at end of file
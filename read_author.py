@@ -1,34 +1,93 @@
+import csv
+import logging
+import os
 import pandas as pd
+from openpyxl import load_workbook
+from utils.logger import setup_logger
+from utils.urls import author_sec_uid, canonicalize_author_url
 
-def read_author_urls_from_excel(file_path):
+logger = logging.getLogger(__name__)
+
+URL_COLUMN = "链接"
+
+
+def iter_rows(file_path):
     """
-    从 Excel 文件中读取 author_url 列的数据。
+    逐行读取表格文件，第一行为表头
 
-    :param file_path: Excel 文件路径
-    :return: author_url 列表
+    xlsx 以只读模式流式读取，CSV 逐行读取，都不会把整个文件载入内存；其他格式交给 pandas。
     """
-    try:
-        # 读取 Excel 文件
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in (".xlsx", ".xlsm"):
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            yield from workbook.active.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+    elif extension in (".csv", ".txt"):
+        with open(file_path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.reader(f)
+    else:
         df = pd.read_excel(file_path)
+        yield tuple(df.columns)
+        yield from df.itertuples(index=False, name=None)
+
+
+def iter_author_urls(file_path, column=URL_COLUMN):
+    """
+    流式读取博主名单，逐个产出规范化并去重后的博主主页URL
+
+    只差查询参数、末尾斜杠等的同一博主只保留第一次出现的；调用方可以边读边处理，
+    不必等整个名单解析完。
 
-        # 检查是否存在 author_url 列
-        if "链接" in df.columns:
-            # 提取 author_url 列的数据
-            author_urls = df["链接"].dropna().tolist()  # 去除空值并转换为列表
-            return author_urls
-        else:
-            print(f"Excel 文件中未找到 链接 列")
-            return []
+    :param file_path: xlsx / CSV / xls 文件路径
+    :param column: URL 所在列的表头
+    """
+    seen = set()
+    duplicates = 0
+    try:
+        rows = iter_rows(file_path)
+        header = next(rows, None)
+        if header is None or column not in header:
+            logger.error("文件 %s 中未找到 %s 列", file_path, column)
+            return
+        index = list(header).index(column)
+        for row in rows:
+            value = row[index] if index < len(row) else None
+            if value is None or not str(value).strip():
+                continue
+            url = canonicalize_author_url(value)
+            if url is None:
+                logger.warning("跳过无效的博主URL: %s", value)
+                continue
+            key = author_sec_uid(url) or url
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            yield url
     except FileNotFoundError:
-        print(f"文件未找到: {file_path}")
-        return []
+        logger.error("文件未找到: %s", file_path)
     except Exception as e:
-        print(f"读取 Excel 文件时出错: {e}")
-        return []
+        logger.error("读取博主名单 %s 时出错: %s", file_path, e)
+    if duplicates:
+        logger.info("博主名单中有 %s 个重复的博主，已跳过", duplicates)
+
+
+def read_author_urls_from_excel(file_path):
+    """
+    从 Excel 文件中读取 author_url 列的数据。
+
+    :param file_path: Excel 文件路径
+    :return: 规范化并去重后的 author_url 列表
+    """
+    return list(iter_author_urls(file_path))
 
 
 # 示例调用
 if __name__ == "__main__":
+    setup_logger(log_file=None, json_file=None)
+
     # 目标 Excel 文件路径
     excel_file = "目标博主名单.xlsx"
 
@@ -42,4 +101,3 @@ if __name__ == "__main__":
             print(url)
     else:
         print("未读取到 author_url")
-
@@ -1,112 +1,166 @@
-from selenium import webdriver
+"""
+批量解析博主名字对应的主页URL
+
+读取 Excel 中的博主名字列，用浏览器池并发打开抖音的用户搜索结果页，取名字一致（没有一致的则取第一个）
+的搜索结果作为主页URL。名字一致的结果持久化缓存，已解析过的名字不再搜索（--refresh 时重新搜索）；
+取第一个结果只是猜测，不写入缓存，下次运行会重新搜索。输出的 Excel 包含 链接 列，
+可以直接作为 main.py 的博主名单:
+
+    python scraper.py --input 博主名字.xlsx --column 博主
+    python main.py --authors 解析后的博主名单.xlsx
+"""
+import argparse
+import concurrent.futures
+import logging
+import time
+from urllib.parse import quote
+import pandas as pd
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.common.keys import Keys
-import time
+from selenium.common.exceptions import TimeoutException
+from config import AUTHOR_WORKERS_RANGE
+from utils.cache import NameCache
+from utils.concurrency import wait_for_host
+from utils.logger import setup_logger
+from utils.metrics import metrics
+from utils.readiness import page_wait, wait_for_settled
+from utils.urls import normalize_url
+from utils.webdriver import borrow_driver, close_driver_pool, page_traffic
+
+logger = logging.getLogger(__name__)
+
+NAMES_FILE = "博主名字.xlsx"
+NAME_COLUMN = "博主"
+OUTPUT_FILE = "解析后的博主名单.xlsx"
+
+# 直接打开用户搜索结果页，不需要从首页输入关键词再切换到"用户"标签
+SEARCH_URL = "https://www.douyin.com/search/{}?type=user"
+USER_RESULT_XPATH = '//div[contains(@class, "user-info")]/a'
+
+# 在页面内一次性读取所有用户搜索结果的名字和链接
+USER_RESULTS_SCRIPT = """
+const nodes = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const results = [];
+for (let i = 0; i < nodes.snapshotLength; i++) {
+    const link = nodes.snapshotItem(i);
+    results.push({name: (link.innerText || '').trim(), url: link.href});
+}
+return results;
+"""
+
+
+def read_author_names(file_path, column=NAME_COLUMN):
+    """读取名字列，去掉空值、首尾空白和重复的名字，保持原有顺序"""
+    df = pd.read_excel(file_path)
+    if column not in df.columns:
+        logger.error("Excel 文件 %s 中未找到 %s 列", file_path, column)
+        return []
+    names = (str(name).strip() for name in df[column].dropna())
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def pick_result(name, results):
+    """
+    优先选择名字完全一致的搜索结果（搜索结果中名字可能带有认证等附加文字），没有时取第一个结果
+
+    :return: (主页URL, 名字是否一致)，没有搜索结果时返回 (None, False)
+    """
+    for result in results:
+        if result["name"].split("\n")[0].strip() == name:
+            return result["url"], True
+    return (results[0]["url"], False) if results else (None, False)
+
+
+def resolve_author_url(driver, name):
+    """
+    在用户搜索结果中查找博主主页
+
+    :return: (规范化后的主页URL, 名字是否一致)，未找到时返回 (None, False)
+    """
+    url = SEARCH_URL.format(quote(name))
+    try:
+        wait_for_host(url)
+        with page_traffic(driver, "search") as network:
+            with metrics.timer("page_get_seconds", page="search"):
+                driver.get(url)
+            page_wait(driver).until(EC.presence_of_element_located((By.XPATH, USER_RESULT_XPATH)))
+            # 搜索结果分批由接口请求返回，等网络空闲后再读取
+            wait_for_settled(driver, network_log=network)
+            results = driver.execute_script(USER_RESULTS_SCRIPT, USER_RESULT_XPATH)
+    except TimeoutException:
+        logger.warning("未找到博主: %s", name)
+        return None, False
+    except Exception as e:
+        logger.error("搜索博主 %s 时发生错误: %s", name, e)
+        return None, False
+
+    profile_url, exact = pick_result(name, results)
+    if profile_url and not exact:
+        logger.warning("搜索结果中没有名字一致的博主，取第一个结果（不缓存）: %s -> %s", name, profile_url)
+    return (normalize_url(profile_url), exact) if profile_url else (None, False)
+
+
+def resolve_with_pool(name):
+    with borrow_driver() as driver:
+        return resolve_author_url(driver, name)
+
+
+def resolve_authors(names, workers=AUTHOR_WORKERS_RANGE[1], cache=None):
+    """
+    批量解析博主主页URL，跳过缓存中已有的名字；只缓存名字一致的结果
+
+    :return: {名字: 主页URL 或 None}，顺序与 names 一致
+    """
+    cache = cache or NameCache()
+    resolved = cache.get_many(names)
+    pending = [name for name in names if name not in resolved]
+    logger.info("共 %s 个名字，缓存命中 %s 个，需要搜索 %s 个", len(names), len(resolved), len(pending))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(resolve_with_pool, name): name for name in pending}
+        for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            name = futures[future]
+            try:
+                url, exact = future.result()
+            except Exception as e:
+                logger.error("解析博主 %s 失败: %s", name, e)
+                url, exact = None, False
+            resolved[name] = url
+            if url and exact:
+                cache.put(name, url)
+                logger.info("[%s/%s] %s -> %s", done, len(pending), name, url)
+            metrics.counter("names_resolved_total", status="success" if url else "failed").inc()
+
+    return {name: resolved.get(name) for name in names}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量解析博主名字对应的主页URL")
+    parser.add_argument("--input", default=NAMES_FILE, help=f"包含博主名字的 Excel 文件（默认 {NAMES_FILE}）")
+    parser.add_argument("--column", default=NAME_COLUMN, help=f"名字所在的列（默认 {NAME_COLUMN}）")
+    parser.add_argument("--output", default=OUTPUT_FILE, help=f"输出的博主名单（默认 {OUTPUT_FILE}）")
+    parser.add_argument("--workers", type=int, default=AUTHOR_WORKERS_RANGE[1], help="并发搜索的浏览器数量")
+    parser.add_argument("--refresh", action="store_true", help="忽略缓存，重新搜索所有名字")
+    args = parser.parse_args()
+
+    time_start = time.time()
+    names = read_author_names(args.input, args.column)
+    if not names:
+        logger.warning("未从 %s 中读取到博主名字", args.input)
+        return
+
+    cache = NameCache(refresh=args.refresh)
+    try:
+        resolved = resolve_authors(names, args.workers, cache)
+    finally:
+        cache.close()
+        close_driver_pool()
 
+    pd.DataFrame({"博主名字": list(resolved), "链接": list(resolved.values())}).to_excel(args.output, index=False)
+    found = sum(1 for url in resolved.values() if url)
+    logger.info("已解析 %s/%s 个博主，结果写入 %s，耗时 %.1f 秒", found, len(names), args.output, time.time() - time_start)
 
 
-# 指定 ChromeDriver 路径
-chrome_driver_path = r'D:\Anaconda3\chromedriver-win64\chromedriver.exe'
-
-# 创建Chrome选项
-options = Options()
-# 添加反爬虫检测绕过设置
-options.add_argument("--disable-blink-features=AutomationControlled")
-options.add_argument("--ignore-certificate-errors")
-options.add_experimental_option("excludeSwitches", ["enable-automation"])
-options.add_experimental_option("useAutomationExtension", False)
-
-# 设置更真实的用户代理
-user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36"
-options.add_argument(f'user-agent={user_agent}')
-options.ignore_local_proxy_environment_variables()
-
-# 创建 WebDriver 实例
-service = Service(chrome_driver_path)
-driver = webdriver.Chrome(service=service, options=options)
-
-# 打开抖音首页
-driver.get("https://www.douyin.com")
-
-# 初始化 WebDriverWait
-wait = WebDriverWait(driver, 10)
-
-print("关闭按钮...")
-try:
-    # 先定位固定兄弟元素（通过文字内容）
-    fixed_sibling = wait.until(
-        EC.presence_of_element_located((By.XPATH, '//div[contains(text(), "登录后免费畅享高清视频")]'))
-    )
-
-    # 通过 XPath 定位关闭按钮（假设关闭按钮是固定兄弟元素的下一个兄弟）
-    close_button = fixed_sibling.find_element(By.XPATH, './following-sibling::div')
-
-    # 点击关闭按钮
-    close_button.click()
-    print("关闭按钮已点击")
-except TimeoutException:
-    print("未找到固定兄弟元素")
-except NoSuchElementException:
-    print("关闭按钮未找到")
-
-# 目标博主名称
-target_author = "123"  # 替换为你要搜索的博主名称
-
-# 动作链：搜索目标博主并进入其主页
-try:
-    # 1. 点击搜索按钮
-    search_button = wait.until(
-        EC.presence_of_element_located((By.CSS_SELECTOR, 'input[data-e2e="searchbar-input"]'))
-    )
-    ActionChains(driver).move_to_element(search_button).click().perform()
-    print("已点击搜索按钮")
-
-    # 2. 输入目标博主名称
-    search_input = wait.until(
-        EC.presence_of_element_located((By.CSS_SELECTOR, 'input[data-e2e="searchbar-input"]'))
-    )
-    ActionChains(driver).move_to_element(search_input).click().send_keys(target_author,Keys.ENTER).perform()
-    print(f"已输入博主名称: {target_author}")
-
-
-    # 3. 等待搜索结果加载
-    time.sleep(5)  # 根据实际情况调整等待时间
-
-    # 4. 点击“用户”按钮
-    user_tab = wait.until(
-        EC.element_to_be_clickable(
-            (By.XPATH, '//*[@id="search-content-area"]/div/div[1]/div[1]/div[1]/div[1]/div/span[3]'))
-    )
-    ActionChains(driver).move_to_element(user_tab).click().perform()
-    print("已点击用户按钮")
-
-    # 5. 等待用户结果加载
-    time.sleep(5)  # 根据实际情况调整等待时间
-
-    # 5. 从搜索结果中选择目标博主
-    try:
-        # 假设目标博主是第一个搜索结果
-        author_element = wait.until(
-            EC.element_to_be_clickable((By.XPATH, '//div[contains(@class, "user-info")]/a'))
-        )
-        ActionChains(driver).move_to_element(author_element).click().perform()
-        print("已点击目标博主")
-
-        # 6. 等待博主主页加载
-        time.sleep(5)  # 根据实际情况调整等待时间
-
-        # 打印当前URL（博主主页）
-        print(f"成功进入博主主页: {driver.current_url}")
-    except (TimeoutException, NoSuchElementException):
-        print("未找到目标博主")
-except (TimeoutException, NoSuchElementException) as e:
-    print(f"操作失败: {e}")
-finally:
-    # 关闭浏览器
-    driver.quit()
\ No newline at end of file
+if __name__ == "__main__":
+    setup_logger()
+    main()
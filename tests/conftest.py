@@ -0,0 +1,22 @@
+import os
+import sys
+from pathlib import Path
+import pytest
+
+# 项目不是安装包，测试直接导入根目录下的模块
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# 本地模拟页面服务器不需要按域名限速
+os.environ.setdefault("SCRAPER_HOST_MAX_RATE", "0")
+
+
+@pytest.fixture(scope="session")
+def fixture_server():
+    """后台运行的模拟页面服务器，返回其根 URL"""
+    from benchmarks.fixture_server import start_fixture_server
+    from utils.http_client import close_session
+
+    server, base_url = start_fixture_server()
+    yield base_url
+    close_session()
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,186 @@
+"""
+接口响应捕获：把模拟页面服务器返回的 JSON 包装成录制的 CDP 网络事件，交给 NetworkLog 和捕获解析逻辑
+"""
+import base64
+import itertools
+import json
+from contextlib import contextmanager
+import pytest
+import requests
+from selenium.common.exceptions import WebDriverException
+import process_author
+import process_video
+from benchmarks.fixtures import (
+    AUTHOR_NAME, BASE_VIDEO_ID, POST_API_PATH, DETAIL_API_PATH, API_PAGE_SIZE, author_video_base, make_aweme,
+)
+from config import AUTHOR_TOP_K
+from utils.webdriver import NetworkLog
+
+_request_ids = itertools.count(1)
+
+
+def event(method, **params):
+    """性能日志中的一条记录，格式与 ChromeDriver 返回的一致"""
+    return {"message": json.dumps({"message": {"method": method, "params": params}, "webview": "page"})}
+
+
+class RecordedDriver:
+    """按录制的性能日志和响应体回放的浏览器，滚动页面时放出下一批事件"""
+
+    def __init__(self, batches=(), bodies=None):
+        self.batches = list(batches)
+        self.log = self.batches.pop(0) if self.batches else []
+        self.bodies = bodies or {}
+        self.page_source = ""
+
+    def record(self, url, body, resource_type="Fetch"):
+        """录制一次请求：返回该请求的性能日志事件，响应体由 execute_cdp_cmd 返回"""
+        request_id = str(next(_request_ids))
+        if body is not None:
+            self.bodies[request_id] = body
+        return [
+            event("Network.requestWillBeSent", requestId=request_id, type=resource_type, request={"url": url}),
+            event("Network.responseReceived", requestId=request_id, type=resource_type, response={"url": url}),
+            event("Network.loadingFinished", requestId=request_id, encodedDataLength=len(body or "")),
+        ]
+
+    def get_log(self, log_type):
+        assert log_type == "performance"
+        entries, self.log = self.log, []
+        return entries
+
+    def execute_cdp_cmd(self, cmd, params):
+        assert cmd == "Network.getResponseBody"
+        if params["requestId"] not in self.bodies:
+            raise WebDriverException("No resource with given identifier found")
+        return self.bodies[params["requestId"]]
+
+    def execute_script(self, script, *args):
+        # 滚动到底部时页面请求下一页
+        if self.batches:
+            self.log.extend(self.batches.pop(0))
+
+    def get(self, url):
+        self.page_source = requests.get(url, timeout=5).text
+
+
+@pytest.fixture(autouse=True)
+def short_waits(monkeypatch):
+    monkeypatch.setattr(process_video, "API_CAPTURE_TIMEOUT", 0.2)
+    monkeypatch.setattr(process_author, "API_CAPTURE_TIMEOUT", 0.2)
+    monkeypatch.setattr(process_author, "AUTHOR_SCROLL_WAIT", 0.2)
+
+
+def fetch_json_text(base_url, path):
+    return requests.get(f"{base_url}{path}", timeout=5).text
+
+
+def test_network_log_captures_matching_json(fixture_server):
+    video_id = BASE_VIDEO_ID + 7
+    detail_path = f"{DETAIL_API_PATH}?aweme_id={video_id}"
+    text = fetch_json_text(fixture_server, detail_path)
+    driver = RecordedDriver()
+    encoded = {"body": base64.b64encode(text.encode("utf-8")).decode("ascii"), "base64Encoded": True}
+    driver.log = (
+        driver.record(f"{fixture_server}/video/{video_id}", {"body": "<html></html>"}, resource_type="Document")
+        + driver.record(f"{fixture_server}{detail_path}", encoded)
+    )
+
+    network = NetworkLog(driver, DETAIL_API_PATH)
+    assert network.json_responses() == [json.loads(text)]
+    assert network.transferred > 0
+    assert network.idle_seconds() is not None  # 两个请求都已加载完成
+    assert network.json_responses() == []  # 每个响应只读取一次
+
+
+def test_capture_video_info_from_detail_api(fixture_server):
+    video_id = BASE_VIDEO_ID + 8
+    video_url = f"{fixture_server}/video/{video_id}"
+    driver = RecordedDriver()
+    driver.log = driver.record(
+        f"{fixture_server}{DETAIL_API_PATH}?aweme_id={video_id}",
+        {"body": fetch_json_text(fixture_server, f"{DETAIL_API_PATH}?aweme_id={video_id}")},
+    )
+
+    video_info = process_video.capture_video_info(NetworkLog(driver, DETAIL_API_PATH), video_url)
+    stats = make_aweme(video_id)["stats"]
+    assert video_info["博主"] == AUTHOR_NAME
+    assert (video_info["点赞量"], video_info["评论量"], video_info["转发量"]) == (
+        stats["diggCount"], stats["commentCount"], stats["shareCount"],
+    )
+
+
+def test_missing_response_body_is_skipped(fixture_server):
+    video_id = BASE_VIDEO_ID + 9
+    driver = RecordedDriver()
+    driver.log = (
+        driver.record(f"{fixture_server}{DETAIL_API_PATH}?aweme_id={video_id}", None)  # 响应体已被浏览器丢弃
+        + driver.record(f"{fixture_server}{DETAIL_API_PATH}?aweme_id=1", {"body": "not json"})
+    )
+    network = NetworkLog(driver, DETAIL_API_PATH)
+    assert network.json_responses() == []
+    assert process_video.capture_video_info(network, f"{fixture_server}/video/{video_id}") is None
+
+
+def test_pending_request_is_not_idle():
+    driver = RecordedDriver()
+    driver.log = driver.record("https://www.douyin.com/aweme/v1/web/aweme/detail/", {"body": "{}"})[:2]
+    network = NetworkLog(driver, DETAIL_API_PATH)
+    assert network.idle_seconds() is None
+    assert network.json_responses() == []  # 尚未加载完成的响应不会被读取
+
+
+def test_scrape_video_falls_back_to_page_extraction(fixture_server, monkeypatch):
+    video_id = BASE_VIDEO_ID + 10
+    video_url = f"{fixture_server}/video/{video_id}"
+    driver = RecordedDriver()
+
+    @contextmanager
+    def recorded_traffic(driver, page_type):
+        yield NetworkLog(driver, DETAIL_API_PATH)
+
+    fallback_calls = []
+
+    def extract_from_page(driver, wait, network=None):
+        fallback_calls.append(network)
+        return process_video.parse_video_html(driver.page_source, video_url)
+
+    monkeypatch.setattr(process_video, "page_traffic", recorded_traffic)
+    monkeypatch.setattr(process_video, "extract_video_info_by_script", extract_from_page)
+    monkeypatch.setattr(process_video, "VIDEO_EXTRACT_MODE", "script")
+
+    # 没有捕获到接口响应：从页面内嵌的 RENDER_DATA 中提取
+    video_info = process_video.scrape_video_info(driver, video_url)
+    assert len(fallback_calls) == 1
+    assert video_info["点赞量"] == make_aweme(video_id)["stats"]["diggCount"]
+
+    # 捕获到接口响应时不再从页面提取
+    detail_path = f"{DETAIL_API_PATH}?aweme_id={video_id}"
+    driver.log = driver.record(f"{fixture_server}{detail_path}", {"body": fetch_json_text(fixture_server, detail_path)})
+    assert process_video.scrape_video_info(driver, video_url)["点赞量"] == video_info["点赞量"]
+    assert len(fallback_calls) == 1
+
+
+def test_capture_top_videos_scrolls_through_pages(fixture_server):
+    sec_uid, post_count = "capture", 25
+    author_url = f"{fixture_server}/user/{sec_uid}"
+    driver = RecordedDriver()
+    batches = []
+    for cursor in range(0, post_count, API_PAGE_SIZE):
+        path = f"{POST_API_PATH}?sec_user_id={sec_uid}&max_cursor={cursor}&count={API_PAGE_SIZE}&posts={post_count}"
+        batches.append(driver.record(f"{fixture_server}{path}", {"body": fetch_json_text(fixture_server, path)}))
+    driver.log = batches.pop(0)
+    driver.batches = batches
+
+    author_name, top_videos = process_author.capture_top_videos(driver, NetworkLog(driver, POST_API_PATH), author_url)
+    base = author_video_base(sec_uid)
+    likes = sorted((make_aweme(base + i)["stats"]["diggCount"] for i in range(post_count)), reverse=True)
+    assert author_name == AUTHOR_NAME
+    assert [video["点赞数"] for video in top_videos] == likes[:AUTHOR_TOP_K]
+    assert not driver.batches  # 每一页都通过滚动触发
+
+
+def test_capture_top_videos_without_responses_returns_none():
+    driver = RecordedDriver()
+    assert process_author.capture_top_videos(driver, NetworkLog(driver, POST_API_PATH), "https://www.douyin.com/user/x") is None
+    assert process_author.capture_top_videos(driver, None, "https://www.douyin.com/user/x") is None
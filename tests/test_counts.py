@@ -0,0 +1,59 @@
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from utils.counts import parse_count, parse_count_series, normalize_count_columns
+
+MIXED_VALUES = [
+    12, 12.0, 1.5, 2.5, -3, True, np.int64(7), np.float64(8.4), float("nan"), float("inf"), 1e30,
+    "1.2万", "3亿", "3,456", " 12 ", "10w+", "3k", "1.5亿", "0", "", "无法获取点赞数", "1e5", "-5", "inf", "nan",
+    None, pd.NA,
+]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1.2万", 12000),
+    ("3亿", 300_000_000),
+    ("3,456", 3456),
+    ("10w+", 100_000),
+    ("3K", 3000),
+    (1.5, 2),
+    ("", None),
+    (None, None),
+    (float("nan"), None),
+    (float("inf"), None),
+    ("-5", None),
+    ("1e5", None),
+    ("无法获取点赞数", None),
+])
+def test_parse_count(text, expected):
+    assert parse_count(text) == expected
+
+
+def test_series_matches_scalar_on_mixed_inputs():
+    result = parse_count_series(MIXED_VALUES)
+    expected = [parse_count(value) for value in MIXED_VALUES]
+    assert [None if value is pd.NA else value for value in result.tolist()] == expected
+    assert str(result.dtype) == "Int64"
+
+
+def test_series_keeps_index_and_repeated_values():
+    series = pd.Series(["1.2万", None, "1.2万", 5, "x"], index=[10, 10, 11, 12, 13], name="点赞量")
+    result = parse_count_series(series)
+    assert result.index.tolist() == [10, 10, 11, 12, 13]
+    assert result.name == "点赞量"
+    assert result.tolist()[0] == 12000 and result.tolist()[2] == 12000
+    assert result.isna().tolist() == [False, True, False, False, True]
+
+
+def test_series_numeric_dtype():
+    result = parse_count_series(pd.Series([1.0, -1.0, math.nan, 2.6]))
+    assert result.isna().tolist() == [False, True, True, False]
+    assert result[0] == 1 and result[3] == 3
+
+
+def test_normalize_count_columns_skips_missing_columns():
+    df = pd.DataFrame({"点赞量": ["1万", "2"], "其他": ["a", "b"]})
+    normalize_count_columns(df, ["点赞量", "评论量"])
+    assert df["点赞量"].tolist() == [10000, 2]
+    assert df["其他"].tolist() == ["a", "b"]
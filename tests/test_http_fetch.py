@@ -0,0 +1,62 @@
+from benchmarks.fixtures import AUTHOR_NAME, BASE_VIDEO_ID, author_video_base, make_aweme, render_detail_api
+from config import AUTHOR_TOP_K
+from process_author import fetch_author_videos_http
+from process_video import fetch_video_info_http, select_video_record
+from utils.counts import parse_count
+
+
+def test_fetch_author_videos_http(fixture_server):
+    author_name, top_videos = fetch_author_videos_http(f"{fixture_server}/user/author1")
+    assert author_name == AUTHOR_NAME
+    assert len(top_videos) == AUTHOR_TOP_K
+
+    base = author_video_base("author1")
+    likes = sorted((make_aweme(base + i)["stats"]["diggCount"] for i in range(30)), reverse=True)
+    assert [parse_count(video["点赞数"]) for video in top_videos] == likes[:AUTHOR_TOP_K]
+    assert all(video["链接"].startswith(f"{fixture_server}/video/") for video in top_videos)
+
+
+def test_fetch_video_info_http(fixture_server):
+    video_id = BASE_VIDEO_ID + 42
+    stats = make_aweme(video_id)["stats"]
+    video_info = fetch_video_info_http(f"{fixture_server}/video/{video_id}")
+    assert video_info["博主"] == AUTHOR_NAME
+    assert video_info["标题"] == "测试视频 42"
+    assert (video_info["点赞量"], video_info["评论量"], video_info["转发量"]) == (
+        stats["diggCount"], stats["commentCount"], stats["shareCount"],
+    )
+    assert video_info["发布日期"]
+
+
+def test_fetch_http_returns_none_when_page_missing(fixture_server):
+    assert fetch_video_info_http(f"{fixture_server}/missing") is None
+    assert fetch_author_videos_http(f"{fixture_server}/missing") is None
+
+
+def _page_data(*video_ids):
+    # 视频页数据中除当前作品外还有相关推荐作品
+    return {"app": {"videoDetail": make_aweme(video_ids[0]), "related": [make_aweme(v) for v in video_ids[1:]]}}
+
+
+def test_select_video_record_matches_url_id():
+    data = _page_data(BASE_VIDEO_ID + 1, BASE_VIDEO_ID + 2)
+    record = select_video_record(data, f"https://www.douyin.com/video/{BASE_VIDEO_ID + 2}")
+    assert record["标题"] == "测试视频 2"
+    assert record["点赞量"] == make_aweme(BASE_VIDEO_ID + 2)["stats"]["diggCount"]
+
+
+def test_select_video_record_without_matching_aweme():
+    data = _page_data(BASE_VIDEO_ID + 1, BASE_VIDEO_ID + 2)
+    assert select_video_record(data, f"https://www.douyin.com/video/{BASE_VIDEO_ID + 3}") is None
+
+
+def test_select_video_record_without_id_takes_first():
+    data = _page_data(BASE_VIDEO_ID + 1, BASE_VIDEO_ID + 2)
+    assert select_video_record(data, "https://www.douyin.com/discover")["标题"] == "测试视频 1"
+
+
+def test_select_video_record_accepts_api_format():
+    record = select_video_record(render_detail_api(BASE_VIDEO_ID + 5), f"https://www.douyin.com/video/{BASE_VIDEO_ID + 5}")
+    assert record["点赞量"] == make_aweme(BASE_VIDEO_ID + 5)["stats"]["diggCount"]
+    assert record["博主"] == AUTHOR_NAME
+
@@ -0,0 +1,33 @@
+from utils.journal import RunJournal, load_journal, PENDING, AUTHOR_DONE, VIDEO_DONE
+
+
+def test_resume_keeps_last_state_per_author(tmp_path):
+    path = tmp_path / "run.jsonl"
+    journal = RunJournal(str(path))
+    journal.record("a", PENDING)
+    journal.record("a", AUTHOR_DONE, video_link="https://www.douyin.com/video/1")
+    journal.record("b", PENDING)
+    journal.record("b", VIDEO_DONE, video_info={"点赞量": 1})
+    journal.close()
+
+    resumed = RunJournal(str(path))
+    assert resumed.state("a")["status"] == AUTHOR_DONE
+    assert resumed.state("a")["video_link"] == "https://www.douyin.com/video/1"
+    assert resumed.state("b")["status"] == VIDEO_DONE
+    assert resumed.state("c") is None
+    resumed.close()
+
+
+def test_resume_after_partial_line(tmp_path):
+    path = tmp_path / "run.jsonl"
+    journal = RunJournal(str(path))
+    journal.record("a", VIDEO_DONE, video_info={})
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"author": "b", "sta')  # 崩溃时只写了一半的行
+
+    resumed = RunJournal(str(path))
+    assert set(resumed.states) == {"a"}
+    resumed.record("b", PENDING)
+    resumed.close()
+    assert load_journal(str(path))["b"]["status"] == PENDING
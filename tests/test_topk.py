@@ -0,0 +1,22 @@
+from utils.topk import TopK
+
+
+def test_keeps_highest_scores_in_order():
+    top = TopK(3)
+    for score in [5, 1, 9, 3, 7, 2]:
+        top.push(score, f"v{score}")
+    assert len(top) == 3
+    assert top.items() == ["v9", "v7", "v5"]
+
+
+def test_ties_keep_first_arrival_and_do_not_compare_items():
+    top = TopK(2)
+    for item in [{"id": 1}, {"id": 2}, {"id": 3}]:
+        top.push(10, item)
+    assert top.items() == [{"id": 1}, {"id": 2}]
+
+
+def test_fewer_items_than_k():
+    top = TopK(5)
+    top.push(1, "a")
+    assert top.items() == ["a"]
@@ -0,0 +1,32 @@
+import pytest
+from utils.urls import normalize_url, author_sec_uid, canonicalize_author_url, video_id
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://WWW.Douyin.com/user/abc/?from_tab_name=main#x") == "https://www.douyin.com/user/abc"
+    assert normalize_url("https://www.douyin.com") == "https://www.douyin.com/"
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://www.douyin.com/user/MS4wX?from_tab_name=main", "https://www.douyin.com/user/MS4wX"),
+    ("https://www.douyin.com/user/MS4wX/", "https://www.douyin.com/user/MS4wX"),
+    ("www.douyin.com/user/MS4wX?x=1", "https://www.douyin.com/user/MS4wX"),
+    ("/user/MS4wX", "https://www.douyin.com/user/MS4wX"),
+    ("user/MS4wX", "https://www.douyin.com/user/MS4wX"),
+    ("http://127.0.0.1:8080/user/MS4wX", "http://127.0.0.1:8080/user/MS4wX"),
+    ("https://www.douyin.com/video/123/", "https://www.douyin.com/video/123"),
+])
+def test_canonicalize_author_url(url, expected):
+    assert canonicalize_author_url(url) == expected
+
+
+@pytest.mark.parametrize("value", ["张三", "not a url", 123, "123.456", "https://not a url/user/x", "https:///user/x", ""])
+def test_canonicalize_author_url_rejects_values_without_host(value):
+    assert canonicalize_author_url(value) is None
+
+
+def test_author_sec_uid_and_video_id():
+    assert author_sec_uid("https://www.douyin.com/user/MS4wX?x=1") == "MS4wX"
+    assert author_sec_uid("https://www.douyin.com/video/1") is None
+    assert video_id("https://www.douyin.com/video/7301234567890123456?modal_id=1") == 7301234567890123456
+    assert video_id("https://www.douyin.com/user/MS4wX") is None
@@ -0,0 +1,80 @@
+import time
+import pytest
+from utils.journal import PENDING, AUTHOR_DONE, VIDEO_DONE, FAILED
+from utils.work_queue import WorkQueue, QueueWorker, LEASED
+
+
+@pytest.fixture
+def work_queue(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite3"), lease_seconds=60, max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def test_add_ignores_existing_authors(work_queue):
+    assert work_queue.add(["a", "b"]) == 2
+    assert work_queue.add(iter(["b", "c"])) == 1
+    assert work_queue.counts() == {PENDING: 3}
+
+
+def test_claim_leases_each_author_once(work_queue):
+    work_queue.add(["a", "b", "c"])
+    assert [author for author, _ in work_queue.claim("w1", limit=2)] == ["a", "b"]
+    assert [author for author, _ in work_queue.claim("w2", limit=2)] == ["c"]
+    assert work_queue.claim("w3") == []
+    assert work_queue.counts() == {LEASED: 3}
+
+
+def test_expired_lease_is_requeued_then_failed(work_queue):
+    work_queue.add(["a"])
+    work_queue.lease_seconds = -1  # 领取后租约立即过期
+    assert work_queue.claim("w1") == [("a", None)]
+    assert work_queue.requeue_expired() == 1
+    assert work_queue.counts() == {PENDING: 1}
+
+    work_queue.claim("w2")
+    work_queue.requeue_expired()
+    assert work_queue.counts() == {FAILED: 1}  # 尝试次数用尽
+
+
+def test_results_from_expired_lease_are_rejected(work_queue):
+    work_queue.add(["a"])
+    work_queue.lease_seconds = -1
+    work_queue.claim("w1")
+    work_queue.lease_seconds = 60
+    work_queue.claim("w2")  # 过期后被 w2 重新领取
+    assert not work_queue.mark_author_done("a", "w1", "https://www.douyin.com/video/1")
+    assert not work_queue.complete("a", "w1", {"点赞量": 1})
+    assert work_queue.complete("a", "w2", {"点赞量": 2})
+    assert list(work_queue.iter_results()) == [{"点赞量": 2}]
+
+
+def test_fail_keeps_video_link_until_attempts_run_out(work_queue):
+    work_queue.add(["a"])
+    work_queue.claim("w1")
+    assert work_queue.mark_author_done("a", "w1", "https://www.douyin.com/video/1")
+    assert work_queue.fail("a", "w1", "timeout")
+    assert work_queue.counts() == {AUTHOR_DONE: 1}
+
+    assert work_queue.claim("w1") == [("a", "https://www.douyin.com/video/1")]
+    work_queue.fail("a", "w1", "timeout")
+    assert work_queue.counts() == {FAILED: 1}
+    assert not work_queue.has_unfinished()
+
+
+def test_worker_retries_failed_author_and_counts_it_once(work_queue):
+    work_queue.add(["a", "b"])
+    worker = QueueWorker(work_queue, worker_id="w1", poll_interval=0.05)
+    attempts = []
+    start = time.time()
+    for author in worker.authors():
+        attempts.append(author)
+        if author == "a" and attempts.count("a") == 1:
+            worker.record(author, FAILED, error="timeout")
+        else:
+            worker.record(author, VIDEO_DONE, video_info={"链接": author})
+    assert sorted(attempts) == ["a", "a", "b"]
+    assert worker.claimed == {"a", "b"}
+    assert work_queue.counts() == {VIDEO_DONE: 2}
+    worker.close()
+    assert time.time() - start < 5
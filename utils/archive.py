@@ -0,0 +1,71 @@
+import csv
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from config import OUTPUT_DIR
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMATS = ("csv", "jsonl", "parquet", "xlsx")
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def write_records(records, file_path, fmt):
+    """按指定格式把记录列表写入文件"""
+    if fmt == "csv":
+        with open(file_path, "w", newline="", encoding="utf-8-sig") as f:  # 带 BOM，Excel 直接打开不乱码
+            writer = csv.DictWriter(f, fieldnames=list(records[0].keys()))
+            writer.writeheader()
+            writer.writerows(records)
+    elif fmt == "jsonl":
+        with open(file_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    elif fmt == "parquet":
+        pd.DataFrame(records).to_parquet(file_path, index=False)
+    elif fmt == "xlsx":
+        pd.DataFrame(records).to_excel(file_path, index=False, engine="openpyxl")
+    else:
+        raise ValueError(f"不支持的归档格式: {fmt}")
+
+
+def _archive(author_name, records, fmt):
+    file_path = os.path.join(OUTPUT_DIR, f"{author_name}_抖音视频信息.{fmt}")
+    try:
+        with metrics.timer("archive_write_seconds", format=fmt):
+            write_records(records, file_path, fmt)
+        logger.info("视频信息已归档到 %s", file_path)
+    except Exception as e:
+        logger.error("归档博主 %s 的视频信息失败: %s", author_name, e)
+
+
+def archive_author_videos(author_name, records, fmt):
+    """
+    在后台线程中归档博主的作品列表，不阻塞抓取线程
+
+    :param fmt: 归档格式，见 ARCHIVE_FORMATS；为 None 时不归档
+    """
+    global _executor
+    if not fmt or not records:
+        return
+    if fmt not in ARCHIVE_FORMATS:
+        raise ValueError(f"不支持的归档格式: {fmt}")
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive")
+        _executor.submit(_archive, author_name, list(records), fmt)
+
+
+def close_archiver():
+    """等待所有归档任务写完"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
@@ -0,0 +1,169 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from config import CACHE_FILE, CACHE_TTL, CACHE_MAX_ENTRIES
+from utils.urls import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# 每写入多少条检查一次是否需要淘汰
+EVICT_CHECK_INTERVAL = 100
+
+
+class FetchCache:
+    """
+    基于 SQLite 的页面结果缓存
+
+    以 (类型, 规范化后的URL) 为键保存提取出的记录，按类型设置过期时间，
+    条数超过上限时淘汰最久未访问的条目。refresh=True 时只写不读，强制重新抓取。
+    """
+
+    def __init__(self, path=CACHE_FILE, ttl=None, max_entries=CACHE_MAX_ENTRIES, refresh=False):
+        self.path = path
+        self.ttl = dict(CACHE_TTL if ttl is None else ttl)
+        self.max_entries = max_entries
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (kind, key)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at)")
+        self._conn.commit()
+
+    def get(self, kind, url):
+        """读取缓存，未命中、已过期或处于 refresh 模式时返回 None"""
+        if self.refresh:
+            return None
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            ttl = self.ttl.get(kind)
+            if ttl is not None and now - created_at > ttl:
+                self._conn.execute("DELETE FROM cache WHERE kind = ? AND key = ?", (kind, key))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE cache SET accessed_at = ? WHERE kind = ? AND key = ?", (now, kind, key)
+            )
+            self._conn.commit()
+        logger.info("缓存命中: [%s] %s", kind, key)
+        return json.loads(value)
+
+    def put(self, kind, url, value):
+        """写入缓存"""
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (kind, key, value, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            self._puts += 1
+            if self._puts % EVICT_CHECK_INTERVAL == 0:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM cache WHERE rowid IN (SELECT rowid FROM cache ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+            logger.info("缓存超出上限，已淘汰 %s 条最久未使用的记录", excess)
+
+    def close(self):
+        with self._lock:
+            self._evict()
+            self._conn.commit()
+            self._conn.close()
+
+
+class NameCache:
+    """
+    博主名字 -> 主页URL 的持久化缓存
+
+    与页面结果缓存使用同一个数据库文件中的另一张表；名字对应的主页基本不会变化，不过期也不淘汰。
+    refresh=True 时只写不读，重新搜索所有名字并覆盖原有结果。
+    """
+
+    def __init__(self, path=CACHE_FILE, refresh=False):
+        self.path = path
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS author_names (name TEXT PRIMARY KEY, url TEXT NOT NULL, resolved_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, names):
+        """批量查询，返回 {名字: 主页URL}，只包含已缓存的名字；refresh 模式下返回空字典"""
+        if self.refresh:
+            return {}
+        names = list(names)
+        found = {}
+        with self._lock:
+            # 分批查询，避免超过 SQLite 的参数个数上限
+            for i in range(0, len(names), 500):
+                batch = names[i:i + 500]
+                placeholders = ", ".join("?" for _ in batch)
+                found.update(self._conn.execute(
+                    f"SELECT name, url FROM author_names WHERE name IN ({placeholders})", batch
+                ))
+        return found
+
+    def put(self, name, url):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO author_names (name, url, resolved_at) VALUES (?, ?, ?)",
+                (name, url, time.time()),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_fetch_cache():
+    """获取进程内共享的页面结果缓存"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = FetchCache()
+        return _cache
+
+
+def close_fetch_cache():
+    """关闭共享的页面结果缓存"""
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+            _cache = None
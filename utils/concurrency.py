@@ -0,0 +1,156 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from config import CONCURRENCY_DECREASE_FACTOR, CONCURRENCY_COOLDOWN, MIN_FREE_MEMORY_MB, HOST_MAX_RATE
+
+logger = logging.getLogger(__name__)
+
+# 每个线程累计的排队等待时间（秒），AdaptiveLimiter 计算处理耗时时扣除
+_waits = threading.local()
+
+
+def record_wait(seconds):
+    """记录当前线程排队等待的时间（域名限速、借用和启动浏览器），这段时间不计入处理耗时"""
+    _waits.seconds = getattr(_waits, "seconds", 0.0) + seconds
+
+
+def waited_seconds():
+    """当前线程累计的排队等待时间（秒）"""
+    return getattr(_waits, "seconds", 0.0)
+
+
+_memory_warned = False
+
+
+def available_memory_mb():
+    """系统可用内存（MB），无法获取时返回 None（首次记录一条警告）"""
+    global _memory_warned
+    try:
+        import psutil
+        return psutil.virtual_memory().available / 1024 / 1024
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if not _memory_warned:
+        _memory_warned = True
+        logger.warning("未安装 psutil，无法获取可用内存，自适应并发不会在内存不足时减少（pip install psutil）")
+    return None
+
+
+class AdaptiveLimiter:
+    """
+    按 AIMD 自适应调整并发数的限流器
+
+    每次成功且耗时低于目标值时并发上限加 1/limit（约每轮加 1）；
+    超时、失败、耗时超过目标值或可用内存不足时乘以 CONCURRENCY_DECREASE_FACTOR，
+    并发上限始终在 [min_limit, max_limit] 之间。
+    """
+
+    def __init__(self, name, initial, min_limit, max_limit, target_latency,
+                 decrease_factor=CONCURRENCY_DECREASE_FACTOR, cooldown=CONCURRENCY_COOLDOWN,
+                 min_free_memory_mb=MIN_FREE_MEMORY_MB):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.target_latency = target_latency
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.min_free_memory_mb = min_free_memory_mb
+        self.active = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """等待直到当前并发数低于上限"""
+        with self._condition:
+            while self.active >= int(self.limit):
+                self._condition.wait()
+            self.active += 1
+
+    def release(self, latency, success):
+        """归还并发名额，并根据本次耗时和结果调整上限"""
+        with self._condition:
+            self.active -= 1
+            memory = available_memory_mb()
+            low_memory = memory is not None and memory < self.min_free_memory_mb
+            if not success or latency > self.target_latency or low_memory:
+                self._decrease(latency, success, low_memory)
+            else:
+                self._set_limit(self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """
+        占用一个并发名额，调用方通过 outcome["success"] 标记结果
+
+        代码块抛出异常时视为失败。处理耗时不含代码块内通过 record_wait 记录的排队等待时间，
+        并发数增加后排队变长不会被误判为页面变慢。
+        """
+        self.acquire()
+        outcome = {"success": True}
+        start = time.time()
+        waited = waited_seconds()
+        try:
+            yield outcome
+        except Exception:
+            outcome["success"] = False
+            raise
+        finally:
+            latency = time.time() - start - (waited_seconds() - waited)
+            self.release(latency, outcome["success"])
+
+    def _decrease(self, latency, success, low_memory):
+        now = time.time()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        reason = "内存不足" if low_memory else ("失败或超时" if not success else f"耗时 {latency:.1f} 秒")
+        self._set_limit(self.limit * self.decrease_factor, reason)
+
+    def _set_limit(self, limit, reason=None):
+        old = int(self.limit)
+        self.limit = min(max(limit, self.min_limit), self.max_limit)
+        if int(self.limit) != old:
+            suffix = f"（{reason}）" if reason else ""
+            logger.info("%s 并发数调整: %s -> %s%s", self.name, old, int(self.limit), suffix)
+
+
+class HostRateLimiter:
+    """按域名限制请求速率，相邻两次请求至少间隔 1 / max_rate 秒"""
+
+    def __init__(self, max_rate=HOST_MAX_RATE):
+        self.interval = 1.0 / max_rate if max_rate else 0.0
+        self._next_time = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """为该域名预约下一个请求时间，必要时等待"""
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.time()
+            scheduled = max(now, self._next_time.get(host, 0.0))
+            self._next_time[host] = scheduled + self.interval
+        delay = scheduled - now
+        if delay > 0:
+            time.sleep(delay)
+            record_wait(delay)
+
+
+_host_limiter = HostRateLimiter()
+
+
+def wait_for_host(url):
+    """请求页面前调用，保证对同一域名的请求速率不超过 HOST_MAX_RATE"""
+    _host_limiter.wait(url)
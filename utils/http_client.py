@@ -0,0 +1,61 @@
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from utils.concurrency import wait_for_host
+from utils.metrics import metrics
+from config import USER_AGENT, HTTP_POOL_SIZE, HTTP_MAX_CONCURRENCY, HTTP_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+_session = None
+_session_lock = threading.Lock()
+_concurrency = threading.BoundedSemaphore(HTTP_MAX_CONCURRENCY)
+
+
+def get_session():
+    """获取进程内共享的 HTTP 会话（连接池 + keep-alive）"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({
+                "User-Agent": USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "zh-CN,zh;q=0.9",
+            })
+            _session = session
+        return _session
+
+
+def fetch_html(url):
+    """
+    通过 HTTP 获取页面 HTML
+
+    :param url: 页面URL
+    :return: HTML 文本；请求失败时返回 None
+    """
+    wait_for_host(url)
+    with _concurrency:
+        try:
+            with metrics.timer("http_get_seconds"):
+                response = get_session().get(url, timeout=HTTP_TIMEOUT)
+            response.raise_for_status()
+            if not response.encoding or response.encoding.lower() == "iso-8859-1":
+                response.encoding = "utf-8"  # 未声明字符集时 requests 默认按 ISO-8859-1 解码
+            return response.text
+        except requests.RequestException as e:
+            logger.warning("HTTP 获取 %s 失败: %s", url, e)
+            return None
+
+
+def close_session():
+    """关闭共享的 HTTP 会话"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
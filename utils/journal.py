@@ -0,0 +1,95 @@
+import json
+import logging
+import os
+import threading
+import time
+from config import JOURNAL_DIR, JOURNAL_FSYNC_EVERY, JOURNAL_FSYNC_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+# 博主的处理状态
+PENDING = "pending"
+AUTHOR_DONE = "author-done"
+VIDEO_DONE = "video-done"
+FAILED = "failed"
+
+
+def load_journal(path):
+    """
+    读取运行日志，返回每个博主最后一条记录
+
+    进程崩溃时最后一行可能只写了一半，无法解析的行会被跳过。
+    """
+    states = {}
+    if not os.path.exists(path):
+        return states
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logger.warning("跳过运行日志 %s 中无法解析的一行", path)
+                continue
+            states[entry["author"]] = entry
+    return states
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+class RunJournal:
+    """
+    只追加的运行日志（JSON Lines），记录每个博主的处理状态和阶段性结果
+
+    每条记录都会立即写入操作系统缓冲区，按条数或时间间隔批量 fsync，
+    兼顾吞吐和崩溃后的数据完整性。
+    """
+
+    def __init__(self, path, fsync_every=JOURNAL_FSYNC_EVERY, fsync_interval=JOURNAL_FSYNC_INTERVAL):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.states = load_journal(path)
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.time()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        if self._file.tell() and not _ends_with_newline(path):
+            self._file.write("\n")  # 补全崩溃时写了一半的行，避免新记录接在它后面
+
+    @classmethod
+    def create(cls, journal_dir=JOURNAL_DIR):
+        """以当前时间命名，新建一次运行的日志"""
+        path = os.path.join(journal_dir, f"run-{time.strftime('%Y%m%d-%H%M%S')}.jsonl")
+        return cls(path)
+
+    def state(self, author_url):
+        """博主在日志中的最后一条记录，没有时返回 None"""
+        return self.states.get(author_url)
+
+    def record(self, author_url, status, **data):
+        """追加一条状态记录"""
+        entry = {"time": time.time(), "author": author_url, "status": status, **data}
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.states[author_url] = entry
+            self._file.write(line)
+            self._file.flush()
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every or time.time() - self._last_sync >= self.fsync_interval:
+                self._sync()
+
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.time()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
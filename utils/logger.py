@@ -1,11 +1,99 @@
+"""
+日志配置
+
+所有模块通过 logging.getLogger(__name__) 记录日志，并使用 % 占位符传参。setup_logger 在根日志器上
+只挂一个 QueueHandler：工作线程只把日志记录放入队列，消息格式化和写控制台、文本文件、JSON Lines
+文件都在后台线程中完成，不会因为文件锁和字符串格式化拖慢抓取线程。
+
+进程池的子进程没有这个后台线程：用 process_log_queue 创建回传队列，子进程以 setup_process_logger
+为 initializer，日志记录经队列交回主进程写出。
+"""
+import atexit
+import json
 import logging
-from colorlog import ColoredFormatter
-from config import LOG_LEVEL, LOG_FORMAT, LOG_DATE_FORMAT, LOG_COLORS
+import multiprocessing
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from config import LOG_LEVEL, LOG_FORMAT, LOG_DATE_FORMAT, LOG_COLORS, LOG_FILE, LOG_JSON_FILE, LOG_MODULE_LEVELS
+
+PLAIN_FORMAT = LOG_FORMAT.replace("%(log_color)s", "")
+
+# 附加到每条日志上的上下文：运行 ID 对整个进程有效，博主/视频 ID 对当前线程有效
+_run_id = uuid.uuid4().hex[:12]
+_context = threading.local()
+_listener = None
+_setup_lock = threading.Lock()
+
+
+def set_run_id(run_id):
+    """设置本次运行的 ID（例如运行日志的文件名），默认为随机生成的 ID"""
+    global _run_id
+    _run_id = run_id
+
+
+@contextmanager
+def log_context(**fields):
+    """在代码块内为当前线程的日志附加 author / video 等字段"""
+    previous = dict(getattr(_context, "fields", {}))
+    _context.fields = {**previous, **fields}
+    try:
+        yield
+    finally:
+        _context.fields = previous
+
+
+class ContextFilter(logging.Filter):
+    """在产生日志的线程中把上下文字段写入日志记录"""
+
+    def filter(self, record):
+        record.run_id = _run_id
+        for key, value in getattr(_context, "fields", {}).items():
+            setattr(record, key, value)
+        return True
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    只把日志记录放入队列的 Handler
+
+    标准的 QueueHandler 会在调用线程中先格式化消息；这里保留 msg 和 args，
+    由后台线程在写出时再格式化。
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """JSON Lines 格式：每条日志一行，带运行、博主、视频 ID"""
 
+    def format(self, record):
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+            "run_id": getattr(record, "run_id", None),
+            "author": getattr(record, "author", None),
+            "video": getattr(record, "video", None),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
 
-def setup_logger():
-    """配置彩色日志"""
-    formatter = ColoredFormatter(
+
+def console_formatter():
+    """控制台使用彩色日志（需要 colorlog），未安装时使用普通格式"""
+    try:
+        from colorlog import ColoredFormatter
+    except ImportError:
+        return logging.Formatter(PLAIN_FORMAT, datefmt=LOG_DATE_FORMAT)
+    return ColoredFormatter(
         LOG_FORMAT,
         datefmt=LOG_DATE_FORMAT,
         reset=True,
@@ -14,11 +102,97 @@ def setup_logger():
         style='%'
     )
 
-    handler = logging.StreamHandler()
-    handler.setFormatter(formatter)
 
+def setup_logger(level=LOG_LEVEL, log_file=LOG_FILE, json_file=LOG_JSON_FILE, module_levels=LOG_MODULE_LEVELS):
+    """
+    配置日志：控制台彩色日志、文本文件和 JSON Lines 文件，由后台线程统一写出
+
+    重复调用时不会重复配置。
+    """
+    global _listener
     logger = logging.getLogger()
-    logger.setLevel(LOG_LEVEL)
-    logger.addHandler(handler)
+    with _setup_lock:
+        if _listener is not None:
+            return logger
+
+        console = logging.StreamHandler()
+        console.setFormatter(console_formatter())
+        handlers = [console]
+        if log_file:
+            text_handler = logging.FileHandler(log_file, encoding="utf-8")
+            text_handler.setFormatter(logging.Formatter(PLAIN_FORMAT, datefmt=LOG_DATE_FORMAT))
+            handlers.append(text_handler)
+        if json_file:
+            json_handler = logging.FileHandler(json_file, encoding="utf-8")
+            json_handler.setFormatter(JsonFormatter())
+            handlers.append(json_handler)
+
+        queue_handler = LazyQueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(ContextFilter())
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+        logger.addHandler(queue_handler)
+        logger.setLevel(level)
+        for name, module_level in module_levels.items():
+            logging.getLogger(name).setLevel(module_level)
+
+        _listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logger)
+    return logger
+
+
+def stop_logger():
+    """写出队列中剩余的日志并停止后台线程"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+
 
-    return logger
\ No newline at end of file
+class _ForwardHandler(logging.Handler):
+    """把子进程回传的日志记录交给本进程中同名的日志器"""
+
+    def emit(self, record):
+        logging.getLogger(record.name).handle(record)
+
+
+@contextmanager
+def process_log_queue():
+    """
+    创建子进程回传日志的队列，并在代码块内由后台线程把收到的日志记录交给本进程的日志器
+
+    队列作为 setup_process_logger 的参数传给进程池的 initializer；代码块结束前应先关闭进程池。
+    """
+    log_queue = multiprocessing.Queue()
+    listener = QueueListener(log_queue, _ForwardHandler())
+    listener.start()
+    try:
+        yield log_queue
+    finally:
+        listener.stop()
+        log_queue.close()
+
+
+def setup_process_logger(log_queue, level=LOG_LEVEL, module_levels=LOG_MODULE_LEVELS):
+    """
+    进程池子进程的日志配置（用作 initializer）
+
+    fork 出的子进程继承了主进程的 LazyQueueHandler，但写出日志的后台线程只在主进程中运行，
+    放入队列的日志不会被写出；这里换成标准的 QueueHandler（在子进程中格式化消息，便于跨进程传递），
+    日志记录经 log_queue 交给主进程。
+    """
+    global _listener
+    _listener = None
+    logger = logging.getLogger()
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    logger.addHandler(queue_handler)
+    logger.setLevel(level)
+    for name, module_level in module_levels.items():
+        logging.getLogger(name).setLevel(module_level)
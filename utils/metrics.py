@@ -0,0 +1,226 @@
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import METRICS_RESERVOIR_SIZE, METRICS_SERIES_POINTS
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 95, 99)
+
+
+class Histogram:
+    """
+    耗时分布统计
+
+    count/sum/min/max 精确累计；分位数基于固定大小的蓄水池抽样计算，内存占用不随样本数增长。
+    """
+
+    def __init__(self, reservoir_size=METRICS_RESERVOIR_SIZE):
+        self.reservoir_size = reservoir_size
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self._samples = []
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+            if len(self._samples) < self.reservoir_size:
+                self._samples.append(value)
+            else:
+                index = random.randrange(self.count)
+                if index < self.reservoir_size:
+                    self._samples[index] = value
+
+    def summary(self):
+        with self._lock:
+            samples = sorted(self._samples)
+            result = {
+                "count": self.count,
+                "sum": round(self.sum, 6),
+                "min": self.min,
+                "max": self.max,
+                "mean": self.sum / self.count if self.count else None,
+            }
+        for p in PERCENTILES:
+            result[f"p{p}"] = samples[min(len(samples) - 1, int(len(samples) * p / 100))] if samples else None
+        return result
+
+
+class Counter:
+    """单调递增的计数器"""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class Series:
+    """
+    随时间变化的采样值（如浏览器内存曲线），每个点为 [距开始的秒数, 值]
+
+    点数超过 max_points 时隔点抽稀，之后按加倍的间隔保留新样本，内存占用有上限。
+    """
+
+    def __init__(self, started_at, max_points=METRICS_SERIES_POINTS):
+        self.started_at = started_at
+        self.max_points = max_points
+        self.last = None
+        self._points = []
+        self._stride = 1
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def append(self, value):
+        with self._lock:
+            self.last = value
+            self._count += 1
+            if self._count % self._stride:
+                return
+            self._points.append([round(time.time() - self.started_at, 3), value])
+            if len(self._points) >= self.max_points:
+                self._points = self._points[::2]
+                self._stride *= 2
+
+    def points(self):
+        with self._lock:
+            return list(self._points)
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def _format_name(name, labels):
+    if not labels:
+        return name
+    label_text = ",".join(f'{key}="{value}"' for key, value in labels)
+    return f"{name}{{{label_text}}}"
+
+
+class MetricsRegistry:
+    """按名称和标签管理的直方图与计数器"""
+
+    def __init__(self):
+        self._histograms = {}
+        self._counters = {}
+        self._series = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def histogram(self, name, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            if key not in self._histograms:
+                self._histograms[key] = Histogram()
+            return self._histograms[key]
+
+    def counter(self, name, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            if key not in self._counters:
+                self._counters[key] = Counter()
+            return self._counters[key]
+
+    def series(self, name, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            if key not in self._series:
+                self._series[key] = Series(self.started_at)
+            return self._series[key]
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """记录代码块的耗时（秒），代码块抛出异常时同样记录"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(name, **labels).observe(time.perf_counter() - start)
+
+    def summary(self):
+        """所有指标的汇总，便于写成 JSON"""
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+            series = dict(self._series)
+        return {
+            "started_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_at)),
+            "elapsed_seconds": round(time.time() - self.started_at, 3),
+            "histograms": {_format_name(*key): h.summary() for key, h in sorted(histograms.items())},
+            "counters": {_format_name(*key): c.value for key, c in sorted(counters.items())},
+            "series": {_format_name(*key): s.points() for key, s in sorted(series.items())},
+        }
+
+    def prometheus_text(self):
+        """Prometheus 文本格式（直方图以 summary 类型输出分位数，时间序列输出最新值）"""
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+            series = dict(self._series)
+        lines = []
+        for (name, labels), counter in sorted(counters.items()):
+            lines.append(f"{_format_name(name, labels)} {counter.value}")
+        for (name, labels), values in sorted(series.items()):
+            if values.last is not None:
+                lines.append(f"{_format_name(name, labels)} {values.last}")
+        for (name, labels), histogram in sorted(histograms.items()):
+            stats = histogram.summary()
+            for p in PERCENTILES:
+                if stats[f"p{p}"] is not None:
+                    quantile_labels = labels + (("quantile", str(p / 100)),)
+                    lines.append(f"{_format_name(name, quantile_labels)} {stats[f'p{p}']}")
+            lines.append(f"{_format_name(name + '_sum', labels)} {stats['sum']}")
+            lines.append(f"{_format_name(name + '_count', labels)} {stats['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, file_path):
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+        logger.info("运行指标已写入 %s", file_path)
+
+    def write_prometheus(self, file_path):
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+
+    def serve_prometheus(self, port, host="0.0.0.0"):
+        """在后台线程中提供 /metrics 接口"""
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                data = registry.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        logger.info("运行指标接口: http://%s:%s/metrics", host, port)
+        return server
+
+
+# 进程内共享的指标
+metrics = MetricsRegistry()
@@ -0,0 +1,138 @@
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from config import PAGE_ARCHIVE_ENABLED, PAGE_ARCHIVE_DIR
+from utils.metrics import metrics
+from utils.urls import normalize_url
+
+logger = logging.getLogger(__name__)
+
+
+class PageArchive:
+    """
+    页面原始 HTML 的压缩归档
+
+    HTML 按内容的 SHA-256 保存为 objects/<前两位>/<摘要>.html.gz，内容相同的页面只存一份；
+    SQLite 索引记录每次抓取的 (类型, 规范化后的URL, 抓取时间, 摘要)。提取逻辑修改后可以
+    用 main.py --reparse 重新解析归档的页面，不必重新抓取。
+    """
+
+    def __init__(self, directory=PAGE_ARCHIVE_DIR):
+        self.directory = Path(directory)
+        self.objects_dir = self.directory / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.directory / "index.sqlite3", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                kind TEXT NOT NULL,
+                url TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                digest TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_url ON pages (kind, url, fetched_at)")
+        self._conn.commit()
+
+    def _object_path(self, digest):
+        return self.objects_dir / digest[:2] / f"{digest}.html.gz"
+
+    def save(self, kind, url, html):
+        """
+        归档一次抓取到的页面
+
+        :param kind: 页面类型，"author" 或 "video"
+        :return: 页面内容的摘要
+        """
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            # 先写临时文件再改名，多个线程同时保存相同内容也不会得到写了一半的文件
+            temp_path = path.with_name(f".{digest}.{threading.get_ident()}.tmp")
+            with metrics.timer("page_archive_write_seconds"):
+                temp_path.write_bytes(gzip.compress(data, mtime=0))
+                os.replace(temp_path, path)
+            metrics.counter("page_archive_bytes_total").inc(path.stat().st_size)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO pages (kind, url, fetched_at, digest) VALUES (?, ?, ?, ?)",
+                (kind, normalize_url(url), time.time(), digest),
+            )
+            self._conn.commit()
+        return digest
+
+    def load(self, digest):
+        """按摘要读取页面 HTML"""
+        return gzip.decompress(self._object_path(digest).read_bytes()).decode("utf-8")
+
+    def latest(self, kind, url):
+        """URL 最近一次归档的页面 HTML，没有归档时返回 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest FROM pages WHERE kind = ? AND url = ? ORDER BY fetched_at DESC, rowid DESC LIMIT 1",
+                (kind, normalize_url(url)),
+            ).fetchone()
+        return self.load(row[0]) if row else None
+
+    def urls(self, kind):
+        """归档过的某类页面的URL（每个URL一次）"""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT url FROM pages WHERE kind = ? ORDER BY url", (kind,)).fetchall()
+        return [url for url, in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_page_archive():
+    """获取进程内共享的页面归档"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = PageArchive()
+        return _archive
+
+
+def close_page_archive():
+    """关闭共享的页面归档"""
+    global _archive
+    with _archive_lock:
+        if _archive is not None:
+            _archive.close()
+            _archive = None
+
+
+def archive_html(kind, url, html):
+    """开启页面归档（PAGE_ARCHIVE_ENABLED）时保存页面 HTML，归档失败不影响抓取"""
+    if not PAGE_ARCHIVE_ENABLED or not html:
+        return
+    try:
+        get_page_archive().save(kind, url, html)
+    except Exception as e:
+        logger.warning("归档页面 %s 失败: %s", url, e)
+
+
+def archive_page(kind, url, driver):
+    """开启页面归档时保存浏览器当前页面的 HTML"""
+    if not PAGE_ARCHIVE_ENABLED:
+        return
+    try:
+        html = driver.page_source
+    except Exception as e:
+        logger.warning("读取页面 %s 的 HTML 失败: %s", url, e)
+        return
+    archive_html(kind, url, html)
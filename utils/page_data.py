@@ -0,0 +1,91 @@
+import json
+import re
+import time
+from urllib.parse import unquote, urljoin
+
+# 页面服务端渲染时内嵌的数据（URL 编码的 JSON）
+RENDER_DATA_PATTERN = re.compile(
+    r'<script[^>]*id="RENDER_DATA"[^>]*>(.*?)</script>', re.DOTALL
+)
+
+
+def extract_render_data(html):
+    """
+    从页面 HTML 中提取内嵌的 RENDER_DATA
+
+    :param html: 页面 HTML
+    :return: 解析后的数据；不存在或无法解析时返回 None
+    """
+    if not html:
+        return None
+    match = RENDER_DATA_PATTERN.search(html)
+    if not match:
+        return None
+    try:
+        return json.loads(unquote(match.group(1).strip()))
+    except ValueError:
+        return None
+
+
+def _first(data, *keys):
+    """按顺序返回第一个存在的键的值（页面数据为驼峰命名，接口数据为下划线命名）"""
+    for key in keys:
+        if key in data and data[key] is not None:
+            return data[key]
+    return None
+
+
+def _walk(data):
+    """深度优先遍历嵌套的字典和列表"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            yield node
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def iter_awemes(data):
+    """遍历数据中的所有作品对象"""
+    seen = set()
+    for node in _walk(data):
+        aweme_id = _first(node, "awemeId", "aweme_id")
+        stats = _first(node, "stats", "statistics")
+        if aweme_id and isinstance(stats, dict) and aweme_id not in seen:
+            seen.add(aweme_id)
+            yield node
+
+
+def find_author_name(data):
+    """在数据中查找博主昵称"""
+    for node in _walk(data):
+        if _first(node, "secUid", "sec_uid") and _first(node, "nickname"):
+            return node["nickname"]
+    return None
+
+
+def aweme_to_post_record(aweme, page_url):
+    """将作品对象转换为博主作品列表记录"""
+    stats = _first(aweme, "stats", "statistics")
+    return {
+        "标题": _first(aweme, "desc") or "",
+        "点赞数": _first(stats, "diggCount", "digg_count"),
+        "链接": urljoin(page_url, f"/video/{_first(aweme, 'awemeId', 'aweme_id')}"),
+    }
+
+
+def aweme_to_video_record(aweme):
+    """将作品对象转换为视频信息记录"""
+    stats = _first(aweme, "stats", "statistics")
+    author = _first(aweme, "authorInfo", "author") or {}
+    create_time = _first(aweme, "createTime", "create_time")
+    return {
+        "点赞量": _first(stats, "diggCount", "digg_count"),
+        "评论量": _first(stats, "commentCount", "comment_count"),
+        "转发量": _first(stats, "shareCount", "share_count"),
+        "标题": _first(aweme, "desc"),
+        "博主": _first(author, "nickname"),
+        "发布日期": time.strftime("%Y-%m-%d %H:%M", time.localtime(int(create_time))) if create_time else None,
+    }
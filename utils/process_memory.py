@@ -0,0 +1,69 @@
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+_unavailable_warned = False
+
+
+def _children_map():
+    """读取 /proc，返回 {父进程 pid: [子进程 pid, ...]}"""
+    children = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as f:
+                # 进程名可能包含空格和括号，从最后一个 ")" 之后开始解析
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(name))
+    return children
+
+
+def _rss_bytes(pid):
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def process_tree_rss_mb(pid):
+    """
+    进程及其所有子孙进程的常驻内存之和（MB），例如 chromedriver 及其启动的整棵 Chrome 进程树
+
+    优先使用 psutil；未安装时在 Linux 上读取 /proc，其他平台返回 None。
+    """
+    try:
+        import psutil
+        try:
+            process = psutil.Process(pid)
+            processes = [process] + process.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return 0.0
+        total = 0
+        for p in processes:
+            try:
+                total += p.memory_info().rss
+            except psutil.NoSuchProcess:
+                pass
+        return total / 1024 / 1024
+    except ImportError:
+        pass
+
+    if not os.path.isdir("/proc"):
+        global _unavailable_warned
+        if not _unavailable_warned:
+            _unavailable_warned = True
+            logger.warning("未安装 psutil，无法统计浏览器内存，不会按 DRIVER_RECYCLE_RSS_MB 回收浏览器（pip install psutil）")
+        return None
+    children = _children_map()
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total += _rss_bytes(current)
+        stack.extend(children.get(current, []))
+    return total / 1024 / 1024
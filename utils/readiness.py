@@ -0,0 +1,126 @@
+"""
+页面就绪检测
+
+页面加载时注入一段脚本：MutationObserver 记录 DOM 最后一次变化的时间，
+包装 fetch / XMLHttpRequest 统计进行中的请求数和最后一次网络活动的时间。
+各等待条件据此判断 "DOM 已稳定"、"网络已空闲"，内容就绪后立即返回，
+代替固定时长的 sleep。读取性能日志时（page_traffic 返回 NetworkLog），网络空闲改按
+CDP 网络事件判断，页面脚本之外发起的请求（如文档、脚本）也会被统计。
+
+浏览器池默认使用 "eager" 加载策略，get() 在 DOMContentLoaded 后即返回，不等待 load 事件。
+"""
+import logging
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from config import PAGE_WAIT_TIMEOUT, PAGE_POLL_INTERVAL, DOM_SETTLE_QUIET, NETWORK_IDLE_QUIET, PAGE_SETTLE_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# 通过 CDP 在每个新文档加载前注入；页面中尚未注入时，检测条件会先补装
+READINESS_SCRIPT = """
+(() => {
+    if (window.__pageReadiness) {
+        return;
+    }
+    const state = window.__pageReadiness = {lastMutation: performance.now(), lastNetwork: performance.now(), inflight: 0};
+    new MutationObserver(() => { state.lastMutation = performance.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+
+    const start = () => { state.inflight++; state.lastNetwork = performance.now(); };
+    const end = () => { state.inflight = Math.max(0, state.inflight - 1); state.lastNetwork = performance.now(); };
+    if (window.fetch) {
+        const originalFetch = window.fetch;
+        window.fetch = function () {
+            start();
+            return originalFetch.apply(this, arguments).finally(end);
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        start();
+        this.addEventListener('loadend', end, {once: true});
+        return originalSend.apply(this, arguments);
+    };
+})();
+"""
+
+# 返回页面当前的就绪状态（毫秒）
+READINESS_STATE_SCRIPT = READINESS_SCRIPT + """
+const state = window.__pageReadiness;
+const now = performance.now();
+return {
+    readyState: document.readyState,
+    domQuiet: now - state.lastMutation,
+    networkQuiet: now - state.lastNetwork,
+    inflight: state.inflight,
+};
+"""
+
+
+def page_wait(driver, timeout=PAGE_WAIT_TIMEOUT):
+    """按配置的检查间隔创建 WebDriverWait"""
+    return WebDriverWait(driver, timeout, poll_frequency=PAGE_POLL_INTERVAL)
+
+
+def readiness_state(driver):
+    return driver.execute_script(READINESS_STATE_SCRIPT)
+
+
+class dom_settled:
+    """等待条件：文档加载完成且 DOM 已连续 quiet 秒没有变化"""
+
+    def __init__(self, quiet=DOM_SETTLE_QUIET):
+        self.quiet_ms = quiet * 1000
+
+    def __call__(self, driver):
+        state = readiness_state(driver)
+        return state["readyState"] != "loading" and state["domQuiet"] >= self.quiet_ms
+
+
+class network_idle:
+    """
+    等待条件：没有进行中的请求，且已持续 quiet 秒
+
+    给出 network_log（page_traffic 返回的 NetworkLog）时按 CDP 网络事件判断，
+    否则按注入脚本统计的 fetch/XHR 判断
+    """
+
+    def __init__(self, quiet=NETWORK_IDLE_QUIET, network_log=None):
+        self.quiet = quiet
+        self.network_log = network_log
+
+    def __call__(self, driver):
+        if self.network_log is not None:
+            idle = self.network_log.idle_seconds()
+            return idle is not None and idle >= self.quiet
+        state = readiness_state(driver)
+        return state["inflight"] == 0 and state["networkQuiet"] >= self.quiet * 1000
+
+
+class page_settled:
+    """等待条件：DOM 稳定且网络空闲"""
+
+    def __init__(self, dom_quiet=DOM_SETTLE_QUIET, network_quiet=NETWORK_IDLE_QUIET, network_log=None):
+        self.dom = dom_settled(dom_quiet)
+        self.network = network_idle(network_quiet, network_log)
+
+    def __call__(self, driver):
+        return self.dom(driver) and self.network(driver)
+
+
+def wait_for_settled(driver, timeout=PAGE_SETTLE_TIMEOUT, network=True, network_log=None):
+    """
+    等待页面稳定（DOM 不再变化，network=True 时还要求网络空闲）
+
+    页面上持续有动画或轮询请求时可能一直不满足条件，超时后不抛出异常。
+
+    :param network_log: page_traffic 返回的 NetworkLog，为 None 时按注入脚本判断网络空闲
+    :return: 是否在超时前稳定
+    """
+    condition = page_settled(network_log=network_log) if network else dom_settled()
+    try:
+        page_wait(driver, timeout).until(condition)
+        return True
+    except TimeoutException:
+        logger.debug("页面在 %s 秒内未稳定，按当前内容继续", timeout)
+        return False
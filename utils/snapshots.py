@@ -0,0 +1,232 @@
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+import pandas as pd
+from config import SNAPSHOT_DIR, SNAPSHOT_FLUSH_ROWS, SNAPSHOT_COMPACT_FILES
+from utils.counts import parse_count
+from utils.metrics import metrics
+from utils.urls import video_id
+
+logger = logging.getLogger(__name__)
+
+# 快照的列：作品 ID、抓取时间（Unix 秒）和三项数量
+SNAPSHOT_COLUMNS = ["video_id", "ts", "likes", "comments", "shares"]
+# 视频信息中记录抓取时间（Unix 秒）的字段，缓存命中的结果保留原来的抓取时间
+FETCHED_AT_FIELD = "抓取时间"
+# 快照列与统计数据列的对应关系
+METRIC_SOURCES = {"likes": "点赞量", "comments": "评论量", "shares": "转发量"}
+# 按 ID 排序后相邻行的作品 ID、时间和数量都很接近，差分编码后只需很少的位数
+PARQUET_OPTIONS = {
+    "engine": "pyarrow",
+    "compression": "zstd",
+    "use_dictionary": False,
+    "column_encoding": {column: "DELTA_BINARY_PACKED" for column in SNAPSHOT_COLUMNS},
+    "row_group_size": SNAPSHOT_FLUSH_ROWS,
+}
+
+
+def pyarrow_available():
+    """快照以 Parquet 格式保存，需要 pyarrow"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _epoch(value):
+    """把时间参数（Unix 秒、datetime 或日期字符串，按本地时间）转换为 Unix 秒"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return time.mktime(pd.Timestamp(value).timetuple())
+
+
+class SnapshotStore:
+    """
+    点赞/评论/转发量的历史快照
+
+    统计数据库中每个链接只保留最新值，这里则保留每次抓取的结果：快照先在内存中累积，
+    每次运行结束（或累积到 SNAPSHOT_FLUSH_ROWS 条）时按作品 ID 排序写成一个新的 Parquet 文件，
+    只追加不改写。文件数过多时合并为一个文件，查询时按时间范围跳过无关的行组。
+    """
+
+    def __init__(self, directory=SNAPSHOT_DIR):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.available = pyarrow_available()
+        if not self.available:
+            logger.warning("未安装 pyarrow，不保存历史快照（pip install pyarrow）")
+        self._rows = []
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @staticmethod
+    def _row(video_info, ts=None):
+        """把视频信息转换为一行快照，链接不是视频页时返回 None"""
+        vid = video_id(video_info.get("链接", ""))
+        if vid is None:
+            return None
+        ts = ts or video_info.get(FETCHED_AT_FIELD) or time.time()
+        return (vid, int(ts), *(parse_count(video_info.get(source)) for source in METRIC_SOURCES.values()))
+
+    def add(self, video_info, ts=None):
+        """
+        记录一条视频信息的快照，链接不是视频页的记录会被跳过
+
+        :param ts: 快照时间（Unix 秒），默认取视频信息中的抓取时间，没有时取当前时间
+        """
+        if not self.available:
+            return
+        row = self._row(video_info, ts)
+        if row is None:
+            return
+        with self._lock:
+            self._rows.append(row)
+            full = len(self._rows) >= SNAPSHOT_FLUSH_ROWS
+        if full:
+            self.flush()
+
+    def add_missing(self, video_infos):
+        """
+        补充快照中还没有的记录（按作品 ID 和抓取时间去重），用于合并其他机器抓取的结果；
+        没有抓取时间的记录无法确定快照时间，会被跳过
+
+        :return: 新增的快照数
+        """
+        if not self.available:
+            return 0
+        rows = {}
+        for info in video_infos:
+            row = self._row(info) if info and info.get(FETCHED_AT_FIELD) else None
+            if row is not None:
+                rows.setdefault(row[:2], row)
+        if not rows:
+            return 0
+        timestamps = [ts for _, ts in rows]
+        existing = self.read(min(timestamps), max(timestamps), columns=["video_id", "ts"])
+        for key in zip(existing["video_id"].tolist(), existing["ts"].tolist()):
+            rows.pop(key, None)
+        with self._lock:
+            self._rows.extend(rows.values())
+        self.flush()
+        return len(rows)
+
+    def flush(self):
+        """
+        把内存中的快照写成一个新文件；写入成功后才从内存中移除，失败时保留到下次写入
+
+        :return: 是否写入成功（没有待写入的快照时也返回 True）
+        """
+        if not self.available:
+            return True
+        with self._write_lock:
+            with self._lock:
+                rows = list(self._rows)
+            if not rows:
+                return True
+            try:
+                self._write(rows)
+            except Exception as e:
+                logger.error("写入 %s 条快照失败，保留在内存中等待下次写入: %s", len(rows), e)
+                return False
+            with self._lock:
+                del self._rows[:len(rows)]
+        return True
+
+    def _write(self, rows):
+        df = pd.DataFrame(rows, columns=SNAPSHOT_COLUMNS).astype({"video_id": "int64", "ts": "int64"})
+        df[list(METRIC_SOURCES)] = df[list(METRIC_SOURCES)].astype("Int64")
+        self._sequence += 1
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._sequence}.parquet"
+        with metrics.timer("snapshot_write_seconds"):
+            self._write_file(df.sort_values(["video_id", "ts"], kind="stable"), self.directory / name)
+        logger.info("已写入 %s 条快照到 %s", len(df), name)
+
+    @staticmethod
+    def _write_file(df, path):
+        # 先写临时文件再改名，读取方不会看到写了一半的文件（以 . 开头的文件在读取目录时被忽略）
+        temp_path = path.with_name(f".{path.name}.tmp")
+        df.to_parquet(temp_path, index=False, **PARQUET_OPTIONS)
+        os.replace(temp_path, path)
+
+    def files(self):
+        """按写入顺序列出快照文件（文件名以写入时间开头）"""
+        return sorted(self.directory.glob("[!.]*.parquet"))
+
+    def compact(self):
+        """
+        把所有快照文件按写入顺序合并为一个文件，每个原文件内部的顺序不变，
+        行组大致与每次运行对应，按时间范围查询时仍能跳过无关的行组
+
+        :return: 合并的文件数
+        """
+        files = self.files()
+        if len(files) < 2:
+            return 0
+        with metrics.timer("snapshot_compact_seconds"):
+            df = pd.concat([pd.read_parquet(path) for path in files], ignore_index=True)
+            # 合并后的文件名与最后一个原文件相同，保持文件名的时间顺序
+            self._write_file(df, files[-1])
+            for path in files[:-1]:
+                path.unlink()
+        logger.info("已将 %s 个快照文件（%s 条快照）合并为 %s", len(files), len(df), files[-1].name)
+        return len(files)
+
+    def close(self):
+        if self.flush() and self.available and len(self.files()) > SNAPSHOT_COMPACT_FILES:
+            self.compact()
+
+    def read(self, since=None, until=None, columns=None):
+        """
+        读取时间范围 [since, until] 内的快照
+
+        :param since: 开始时间（Unix 秒、datetime 或日期字符串），None 表示不限
+        :param until: 结束时间，None 表示不限
+        :param columns: 要读取的列，None 表示全部列
+        """
+        filters = []
+        if since is not None:
+            filters.append(("ts", ">=", int(_epoch(since))))
+        if until is not None:
+            filters.append(("ts", "<=", int(_epoch(until))))
+        if not self.available or not self.files():
+            return pd.DataFrame({column: pd.Series(dtype="int64") for column in columns or SNAPSHOT_COLUMNS})
+        with metrics.timer("snapshot_read_seconds"):
+            return pd.read_parquet(self.directory, engine="pyarrow", columns=columns, filters=filters or None)
+
+    def growth(self, since=None, until=None, metric="likes"):
+        """
+        每个视频在时间范围内的增长情况，只包含范围内至少有两次有效快照的视频
+
+        :param metric: "likes" / "comments" / "shares"
+        :return: 以 video_id 为索引的 DataFrame，列为 start_ts、end_ts、start、end、
+                 delta（增量）、per_day（每天增量）和 pct（相对起始值的增长比例，起始值为 0 时为空）
+        """
+        if metric not in METRIC_SOURCES:
+            raise ValueError(f"不支持的指标: {metric}")
+        df = self.read(since, until, columns=["video_id", "ts", metric]).dropna(subset=[metric])
+        df = df.sort_values(["video_id", "ts"], kind="stable")
+        first = df.drop_duplicates("video_id", keep="first").set_index("video_id")
+        last = df.drop_duplicates("video_id", keep="last").set_index("video_id")
+        result = pd.DataFrame({
+            "start_ts": first["ts"],
+            "end_ts": last["ts"],
+            "start": first[metric].astype("int64"),
+            "end": last[metric].astype("int64"),
+        })
+        result = result[result["end_ts"] > result["start_ts"]]
+        result["delta"] = result["end"] - result["start"]
+        result["per_day"] = result["delta"] * 86400 / (result["end_ts"] - result["start_ts"])
+        result["pct"] = result["delta"] / result["start"].where(result["start"] > 0)
+        return result
+
+    def top_movers(self, since=None, until=None, n=10, metric="likes", by="delta"):
+        """
+        时间范围内增长最多的 n 个视频
+
+        :param by: 排序依据，"delta"（增量）、"per_day"（每天增量）或 "pct"（增长比例）
+        """
+        return self.growth(since, until, metric).nlargest(n, by)
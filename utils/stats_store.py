@@ -0,0 +1,151 @@
+import logging
+import sqlite3
+import threading
+import time
+import pandas as pd
+from openpyxl import Workbook
+from config import STATISTICS_DB
+from utils.counts import parse_count, parse_count_series
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 统计数据的列，链接为唯一键
+STAT_COLUMNS = ["链接", "标题", "博主", "点赞量", "评论量", "转发量", "发布日期", "博主URL", "更新时间"]
+# 以整数保存的数量列
+COUNT_COLUMNS = ["点赞量", "评论量", "转发量"]
+# 数据库版本：1 表示历史数据中的数量列已转换为整数
+SCHEMA_VERSION = 1
+NORMALIZE_CHUNK_SIZE = 100_000
+
+
+class StatisticsStore:
+    """
+    基于 SQLite 的统计数据存储
+
+    每条视频信息按链接增量写入（已存在则更新），不需要读取和重写全部历史数据；
+    Excel 文件只在需要时流式导出。
+    """
+
+    def __init__(self, path=STATISTICS_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = ", ".join(f'"{column}"' for column in STAT_COLUMNS[1:])
+        self._conn.execute(f'CREATE TABLE IF NOT EXISTS statistics ("链接" TEXT NOT NULL, {columns})')
+        self._conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_statistics_link ON statistics ("链接")')
+        self._conn.commit()
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self.normalize_counts()
+
+    def upsert(self, video_info):
+        """写入一条视频信息，链接已存在时覆盖旧值"""
+        self.upsert_many([video_info])
+
+    def upsert_many(self, video_infos):
+        """批量写入视频信息，没有链接的记录会被跳过"""
+        now = time.strftime("%Y-%m-%d %H:%M:%S")
+        rows = [
+            tuple(self._value(info, column, now) for column in STAT_COLUMNS)
+            for info in video_infos
+            if info and info.get("链接")
+        ]
+        if not rows:
+            return 0
+
+        columns = ", ".join(f'"{column}"' for column in STAT_COLUMNS)
+        placeholders = ", ".join("?" for _ in STAT_COLUMNS)
+        updates = ", ".join(f'"{column}" = excluded."{column}"' for column in STAT_COLUMNS[1:])
+        with self._lock, metrics.timer("statistics_upsert_seconds"):
+            self._conn.executemany(
+                f'INSERT INTO statistics ({columns}) VALUES ({placeholders}) '
+                f'ON CONFLICT ("链接") DO UPDATE SET {updates}',
+                rows,
+            )
+            self._conn.commit()
+        return len(rows)
+
+    @staticmethod
+    def _value(info, column, now):
+        if column == "更新时间":
+            return now
+        if column in COUNT_COLUMNS:
+            return parse_count(info.get(column))
+        return info.get(column)
+
+    def normalize_counts(self, chunk_size=NORMALIZE_CHUNK_SIZE):
+        """
+        将旧数据中以显示字符串保存的数量（如 "1.2万"）转换为整数
+
+        只读取数量列仍为文本的行，按块向量化解析后批量更新；完成后记录数据库版本，之后不再检查。
+
+        :return: 转换的行数
+        """
+        columns = ", ".join(f'"{column}"' for column in COUNT_COLUMNS)
+        text_filter = " OR ".join(f'typeof("{column}") = \'text\'' for column in COUNT_COLUMNS)
+        updates = ", ".join(f'"{column}" = ?' for column in COUNT_COLUMNS)
+        total = 0
+        with self._lock, metrics.timer("statistics_normalize_seconds"):
+            last_rowid = 0
+            while True:
+                rows = self._conn.execute(
+                    f"SELECT rowid, {columns} FROM statistics WHERE rowid > ? AND ({text_filter}) "
+                    f"ORDER BY rowid LIMIT ?",
+                    (last_rowid, chunk_size),
+                ).fetchall()
+                if not rows:
+                    break
+                last_rowid = rows[-1][0]
+                rowids, *values = zip(*rows)
+                parsed = [parse_count_series(list(column)).astype(object) for column in values]
+                self._conn.executemany(
+                    f"UPDATE statistics SET {updates} WHERE rowid = ?",
+                    [
+                        tuple(None if value is pd.NA else int(value) for value in counts) + (rowid,)
+                        for rowid, *counts in zip(rowids, *parsed)
+                    ],
+                )
+                total += len(rows)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._conn.commit()
+        if total:
+            logger.info("已将 %s 行统计数据的数量列转换为整数", total)
+        return total
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM statistics").fetchone()[0]
+
+    def iter_rows(self):
+        """按写入顺序逐行返回统计数据"""
+        columns = ", ".join(f'"{column}"' for column in STAT_COLUMNS)
+        # 单独的连接，导出时不占用写入锁
+        conn = sqlite3.connect(self.path)
+        try:
+            yield from conn.execute(f"SELECT {columns} FROM statistics ORDER BY rowid")
+        finally:
+            conn.close()
+
+    def export_excel(self, file_path):
+        """
+        以只写模式流式导出到 Excel，内存占用与数据量无关
+
+        :return: 导出的行数
+        """
+        start = time.perf_counter()
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(STAT_COLUMNS)
+        count = 0
+        for row in self.iter_rows():
+            sheet.append(row)
+            count += 1
+        workbook.save(file_path)
+        metrics.histogram("excel_io_seconds", op="export").observe(time.perf_counter() - start)
+        logger.info("已导出 %s 条统计数据到 %s", count, file_path)
+        return count
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,26 @@
+import heapq
+import itertools
+
+
+class TopK:
+    """用大小为 k 的最小堆流式保留分值最高的 k 条记录"""
+
+    def __init__(self, k):
+        self.k = k
+        self._heap = []
+        self._counter = itertools.count()  # 分值相同时按到达顺序比较，避免比较记录本身
+
+    def push(self, score, item):
+        """加入一条记录，堆满时只有分值高于当前最小值的记录才会替换进来"""
+        entry = (score, -next(self._counter), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def items(self):
+        """按分值从高到低返回记录"""
+        return [item for _, _, item in sorted(self._heap, reverse=True)]
@@ -0,0 +1,65 @@
+import re
+from urllib.parse import urlsplit, urlunsplit
+
+
+def normalize_url(url):
+    """
+    规范化页面URL，作为缓存等场景的键
+
+    去掉查询参数、锚点和末尾的斜杠，协议和域名转为小写，
+    例如 ".../user/xxx/?from_tab_name=main" -> ".../user/xxx"。
+    """
+    parts = urlsplit(str(url).strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, "", ""))
+
+
+AUTHOR_PATH_PATTERN = re.compile(r"/user/([^/?#]+)")
+
+
+def author_sec_uid(url):
+    """从博主主页URL中取出 sec_uid，不是博主主页时返回 None"""
+    match = AUTHOR_PATH_PATTERN.search(str(url))
+    return match.group(1) if match else None
+
+
+# 只写了路径（如 "/user/MS4w..."）的博主主页使用的域名
+AUTHOR_HOST = "www.douyin.com"
+# 有效的域名：带点的主机名（最后一段包含字母）、IPv4 地址或 localhost，可以带端口
+HOST_PATTERN = re.compile(
+    r"^(localhost|\d{1,3}(\.\d{1,3}){3}|([a-z0-9-]+\.)+[a-z][a-z0-9-]*)(:\d+)?$", re.IGNORECASE
+)
+AUTHOR_ONLY_PATH_PATTERN = re.compile(r"^/?user/[^/?#\s]+")
+
+
+def canonicalize_author_url(url):
+    """
+    把博主主页URL规范化为只包含 sec_uid 的形式，用于去重
+
+    例如 "https://www.douyin.com/user/MS4w...?from_tab_name=main" -> "https://www.douyin.com/user/MS4w..."；
+    没有协议的URL（如 "www.douyin.com/user/MS4w..."）按 https 处理，只有路径的（如 "/user/MS4w..."）
+    补上 AUTHOR_HOST；不是博主主页的URL按 normalize_url 处理。
+
+    :return: 规范化后的URL；域名无效（如博主名字、"not a url"、数字）时返回 None
+    """
+    url = str(url).strip()
+    if AUTHOR_ONLY_PATH_PATTERN.match(url):
+        url = f"https://{AUTHOR_HOST}/{url.lstrip('/')}"
+    elif "//" not in url:
+        url = f"https://{url}"
+    parts = urlsplit(url)
+    if not HOST_PATTERN.match(parts.netloc):
+        return None
+    sec_uid = author_sec_uid(parts.path)
+    if sec_uid is None:
+        return normalize_url(url)
+    return urlunsplit((parts.scheme.lower() or "https", parts.netloc.lower(), f"/user/{sec_uid}", "", ""))
+
+
+VIDEO_PATH_PATTERN = re.compile(r"/video/(\d+)")
+
+
+def video_id(url):
+    """从视频页URL中取出作品 ID（整数），不是视频页时返回 None"""
+    match = VIDEO_PATH_PATTERN.search(str(url))
+    return int(match.group(1)) if match else None
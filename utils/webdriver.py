@@ -1,23 +1,76 @@
+import base64
+import json
+import logging
+import queue
+import threading
+import time
+import types
+from contextlib import contextmanager
+
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium import webdriver
-from config import CHROME_DRIVER_PATH, USER_AGENT
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from utils.concurrency import record_wait
+from utils.metrics import metrics
+from utils.process_memory import process_tree_rss_mb
+from utils.readiness import READINESS_SCRIPT, page_wait
+from config import (
+    CHROME_DRIVER_PATH, USER_AGENT, DRIVER_POOL_SIZE, DRIVER_ACQUIRE_TIMEOUT, RESOURCE_BLOCKING,
+    BLOCKED_URL_PATTERNS, NETWORK_STATS_ENABLED, EXECUTION_MODE, TAB_BROWSERS, TABS_PER_BROWSER,
+    DRIVER_RECYCLE_PAGES, DRIVER_RECYCLE_RSS_MB, DRIVER_RECYCLE_TIMEOUTS, DRIVER_RSS_SAMPLE_INTERVAL,
+    API_CAPTURE_ENABLED, API_CAPTURE_PATTERNS, PAGE_LOAD_STRATEGY,
+)
+
+logger = logging.getLogger(__name__)
 
 
-def init_driver():
-    """初始化 WebDriver"""
+def init_driver(page_load_strategy=PAGE_LOAD_STRATEGY):
+    """
+    初始化 WebDriver
+
+    :param page_load_strategy: "normal" 时 get() 等待页面加载完成；"eager" 时 DOMContentLoaded 后返回；
+                               "none" 时立即返回。后两者由调用方按条件等待
+    """
     chrome_options = Options()
+    chrome_options.page_load_strategy = page_load_strategy
     chrome_options.add_argument("--headless")  # 无头模式，不打开浏览器窗口
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
     chrome_options.add_argument("--ignore-certificate-errors")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option("useAutomationExtension", False)
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")  # 减少内存占用
+    chrome_options.add_argument("--disable-extensions")  # 禁用扩展
+    chrome_options.add_argument("--disable-images")  # 不加载图片，提高速度
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_argument("--incognito")  # 无痕模式
+    chrome_options.add_argument("--disable-infobars")
+    chrome_options.add_argument("--disable-notifications")
+    # 标签页模式下多个标签页同时加载，避免后台标签页的定时器和渲染被降频
+    chrome_options.add_argument("--disable-background-timer-throttling")
+    chrome_options.add_argument("--disable-renderer-backgrounding")
+    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
     chrome_options.add_argument(f'user-agent={USER_AGENT}')
     chrome_options.ignore_local_proxy_environment_variables()
+    if NETWORK_STATS_ENABLED or API_CAPTURE_ENABLED:
+        # 只记录网络事件，用于统计每个页面的传输字节数和捕获接口响应
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
 
     service = Service(CHROME_DRIVER_PATH)
     driver = webdriver.Chrome(service=service, options=chrome_options)
+    prepare_tab(driver)
+    return driver
+
 
+def prepare_tab(driver):
+    """
+    为当前标签页注入反检测脚本和页面就绪检测脚本，并开启网络事件
+
+    CDP 命令只作用于当前标签页，标签页模式下每个新标签页都需要重新执行。
+    """
     # 执行CDP命令来避免被检测
     driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
         "source": """
@@ -26,5 +79,667 @@ def init_driver():
         });
         """
     })
+    # 注入页面就绪检测脚本（DOM 变化和网络请求跟踪）
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": READINESS_SCRIPT})
+    driver.execute_cdp_cmd("Network.enable", {})
+
+
+def block_resources(driver, page_type):
+    """按页面类型设置要拦截的请求，未配置的页面类型只拦截通用规则"""
+    patterns = BLOCKED_URL_PATTERNS.get("common", []) + BLOCKED_URL_PATTERNS.get(page_type, [])
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns if RESOURCE_BLOCKING else []})
+
+
+def parse_network_events(entries):
+    """从性能日志条目中取出网络事件，返回 [(所属标签页, method, params)]"""
+    events = []
+    for entry in entries:
+        message = json.loads(entry["message"])
+        event = message["message"]
+        if event["method"].startswith("Network."):
+            # webview 为产生事件的标签页的 DevTools target ID，见 target_id()
+            events.append((message.get("webview"), event["method"], event["params"]))
+    return events
+
+
+def network_events(driver):
+    """取出性能日志中积累的网络事件 (method, params)；标签页只取出属于自己的事件"""
+    if getattr(driver, "shares_browser", False):
+        return driver._browser.network_events(driver._handle)
+    return [(method, params) for _, method, params in parse_network_events(driver.get_log("performance"))]
+
+
+# 判断网络空闲时跟踪的资源类型；图片、媒体等已被拦截或不影响页面数据
+IDLE_RESOURCE_TYPES = ("Document", "Script", "XHR", "Fetch")
+
+
+class NetworkLog:
+    """
+    一次页面访问期间的网络事件
+
+    每次 drain() 取出性能日志中新的网络事件，累计传输字节数和被拦截的请求数，并跟踪进行中的请求，
+    用于判断网络是否空闲；给出 capture 时还会记下URL包含该路径的请求，加载完成后可以通过 CDP 读取其响应体。
+    """
+
+    def __init__(self, driver, capture=None):
+        self.driver = driver
+        self.capture = capture
+        self.transferred = 0
+        self.blocked = 0
+        self._inflight = set()  # 进行中的请求（IDLE_RESOURCE_TYPES）的 requestId
+        self._last_activity = time.monotonic()
+        self._pending = {}  # 已收到响应头、尚未加载完成的接口请求: requestId -> URL
+        self._finished = []  # 已加载完成、尚未读取响应体的接口请求 (requestId, URL)
+
+    def drain(self):
+        for method, params in network_events(self.driver):
+            if method == "Network.requestWillBeSent":
+                if params.get("type") in IDLE_RESOURCE_TYPES:
+                    self._inflight.add(params["requestId"])
+                    self._last_activity = time.monotonic()
+            elif method == "Network.responseReceived":
+                url = params["response"]["url"]
+                if self.capture and self.capture in url:
+                    self._pending[params["requestId"]] = url
+            elif method == "Network.loadingFinished":
+                self.transferred += params.get("encodedDataLength", 0)
+                self._request_ended(params["requestId"])
+                url = self._pending.pop(params["requestId"], None)
+                if url is not None:
+                    self._finished.append((params["requestId"], url))
+            elif method == "Network.loadingFailed":
+                self._request_ended(params["requestId"])
+                self._pending.pop(params["requestId"], None)
+                if params.get("blockedReason"):
+                    self.blocked += 1
+
+    def _request_ended(self, request_id):
+        if request_id in self._inflight:
+            self._inflight.discard(request_id)
+            self._last_activity = time.monotonic()
+
+    def idle_seconds(self):
+        """没有进行中的请求时返回已空闲的秒数，否则返回 None"""
+        self.drain()
+        return None if self._inflight else time.monotonic() - self._last_activity
+
+    def json_responses(self):
+        """读取新加载完成的接口响应体，返回解析后的 JSON 列表，无法读取或不是 JSON 的响应会被跳过"""
+        self.drain()
+        finished, self._finished = self._finished, []
+        responses = []
+        for request_id, url in finished:
+            try:
+                body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                text = base64.b64decode(body["body"]).decode("utf-8") if body.get("base64Encoded") else body["body"]
+                responses.append(json.loads(text))
+            except (WebDriverException, ValueError) as e:
+                logger.warning("读取接口 %s 的响应失败: %s", url, e)
+        metrics.counter("api_responses_captured_total").inc(len(responses))
+        return responses
+
+    def wait_json(self, timeout):
+        """等待至少一个新的接口响应，超时返回空列表"""
+        try:
+            return page_wait(self.driver, timeout).until(lambda driver: self.json_responses())
+        except TimeoutException:
+            return []
+
+
+@contextmanager
+def page_traffic(driver, page_type):
+    """
+    访问一个页面前设置资源拦截，结束后记录该页面的传输字节数和被拦截的请求数，
+    并向看门狗报告页面数和超时情况
+
+    上下文的值是该页面的 NetworkLog（开启 API_CAPTURE_ENABLED 时捕获 API_CAPTURE_PATTERNS 中的接口），
+    不读取网络日志时为 None。
+
+    被拦截的请求不会产生流量，无法得知其大小；节省的字节数通过对比开启和关闭拦截
+    （环境变量 SCRAPER_BLOCK_RESOURCES=0）时 page_transfer_bytes 的差值得到。
+    """
+    network = None
+    try:
+        block_resources(driver, page_type)
+        if NETWORK_STATS_ENABLED or API_CAPTURE_ENABLED:
+            network_events(driver)  # 丢弃之前页面遗留的事件
+            network = NetworkLog(driver, API_CAPTURE_PATTERNS.get(page_type) if API_CAPTURE_ENABLED else None)
+    except WebDriverException as e:
+        logger.warning("设置资源拦截失败: %s", e)
+    try:
+        yield network
+    except TimeoutException:
+        watchdog.record_page(browser_driver(driver), timed_out=True)
+        raise
+    watchdog.record_page(browser_driver(driver))
+    if network is None or not NETWORK_STATS_ENABLED:
+        return
+    try:
+        network.drain()
+    except WebDriverException as e:
+        logger.warning("读取网络日志失败: %s", e)
+        return
+    blocking = "on" if RESOURCE_BLOCKING else "off"
+    metrics.histogram("page_transfer_bytes", page=page_type, blocking=blocking).observe(network.transferred)
+    metrics.counter("blocked_requests_total", page=page_type).inc(network.blocked)
+    logger.debug("%s 页面传输 %.0f KB，拦截 %s 个请求", page_type, network.transferred / 1024, network.blocked)
+
+
+def is_driver_alive(driver):
+    """健康检查：浏览器会话是否仍可响应"""
+    try:
+        driver.execute_script("return 1")
+        return True
+    except WebDriverException:
+        return False
+
+
+def reset_driver(driver):
+    """清理浏览器状态（多余标签页、Cookie、本地存储），以便下一次借用"""
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    driver.delete_all_cookies()
+    try:
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    except WebDriverException:
+        pass  # about:blank 等页面不允许访问 storage
+    driver.get("about:blank")
+
+
+def quit_driver(driver):
+    """关闭浏览器，忽略已失效会话的异常"""
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.warning("关闭浏览器时出错: %s", e)
+
+
+def browser_driver(driver):
+    """标签页对应其所在浏览器的 WebDriver，普通浏览器返回自身"""
+    return driver._browser.driver if getattr(driver, "shares_browser", False) else driver
+
+
+def driver_pid(driver):
+    """chromedriver 进程的 pid，Chrome 进程树都是它的子孙进程"""
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+class DriverWatchdog:
+    """
+    浏览器内存看门狗
+
+    记录每个浏览器打开的页面数和连续超时次数，并在归还时采样其进程树的常驻内存（写入
+    driver_rss_mb 时间序列）；打开页面过多、内存超限或连续超时的浏览器由池在空闲时回收，
+    不会中断正在进行的任务。
+    """
+
+    def __init__(self, max_pages=DRIVER_RECYCLE_PAGES, max_rss_mb=DRIVER_RECYCLE_RSS_MB,
+                 max_timeouts=DRIVER_RECYCLE_TIMEOUTS, sample_interval=DRIVER_RSS_SAMPLE_INTERVAL):
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.max_timeouts = max_timeouts
+        self.sample_interval = sample_interval
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._next_id = 1
+
+    def _entry(self, driver):
+        entry = self._stats.get(driver)
+        if entry is None:
+            entry = self._stats[driver] = {"id": self._next_id, "pages": 0, "timeouts": 0, "rss_mb": None, "sampled_at": 0}
+            self._next_id += 1
+        return entry
+
+    def record_page(self, driver, timed_out=False):
+        """记录浏览器打开了一个页面，timed_out 表示该页面等待超时"""
+        with self._lock:
+            entry = self._entry(driver)
+            entry["pages"] += 1
+            entry["timeouts"] = entry["timeouts"] + 1 if timed_out else 0
+
+    def sample(self, driver):
+        """采样浏览器进程树的常驻内存（MB），距上次采样不足 sample_interval 秒时返回上次的值"""
+        with self._lock:
+            entry = self._entry(driver)
+            if time.time() - entry["sampled_at"] < self.sample_interval:
+                return entry["rss_mb"]
+            entry["sampled_at"] = time.time()
+        pid = driver_pid(driver)
+        rss_mb = process_tree_rss_mb(pid) if pid else None
+        if rss_mb is not None:
+            entry["rss_mb"] = rss_mb
+            metrics.series("driver_rss_mb", driver=entry["id"]).append(round(rss_mb, 1))
+            metrics.histogram("driver_rss_mb").observe(rss_mb)
+        return rss_mb
+
+    def recycle_reason(self, driver):
+        """浏览器需要回收时返回原因（pages / memory / timeouts），否则返回 None"""
+        rss_mb = self.sample(driver)
+        with self._lock:
+            entry = self._entry(driver)
+            if self.max_pages and entry["pages"] >= self.max_pages:
+                return "pages"
+            if self.max_timeouts and entry["timeouts"] >= self.max_timeouts:
+                return "timeouts"
+        if self.max_rss_mb and rss_mb is not None and rss_mb >= self.max_rss_mb:
+            return "memory"
+        return None
+
+    def recycled(self, driver, reason):
+        """记录一次回收事件"""
+        with self._lock:
+            entry = self._entry(driver)
+        metrics.counter("driver_recycles_total", reason=reason).inc()
+        rss_text = "未知" if entry["rss_mb"] is None else f"{entry['rss_mb']:.0f} MB"
+        logger.info("回收浏览器 #%s（原因: %s，已打开 %s 个页面，内存 %s）", entry['id'], reason, entry['pages'], rss_text)
+
+    def forget(self, driver):
+        """浏览器关闭后清除其记录"""
+        with self._lock:
+            entry = self._stats.pop(driver, None)
+        if entry is not None:
+            metrics.histogram("driver_pages").observe(entry["pages"])
+
+
+# 进程内共享的看门狗，页面访问和各个池都向它报告
+watchdog = DriverWatchdog()
+
+
+class DriverPool:
+    """
+    线程安全的 WebDriver 池
+
+    浏览器按需创建，总数不超过 max_size；归还时清理状态，借出时做健康检查，
+    失效的浏览器会被关闭并重新创建。
+    """
+
+    def __init__(self, max_size=DRIVER_POOL_SIZE, factory=init_driver, acquire_timeout=DRIVER_ACQUIRE_TIMEOUT):
+        self.max_size = max_size
+        self.factory = factory
+        self.acquire_timeout = acquire_timeout
+        self._idle = queue.LifoQueue()  # 优先复用最近归还的浏览器
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._all = set()
+        self._closed = False
+
+    def acquire(self):
+        """借出一个可用的浏览器"""
+        if self._closed:
+            raise RuntimeError("WebDriver 池已关闭")
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError(f"等待空闲浏览器超时（{self.acquire_timeout} 秒）")
+
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._create()
+                if is_driver_alive(driver):
+                    return driver
+                logger.warning("浏览器健康检查失败，重新创建")
+                self._discard(driver)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, driver, broken=False):
+        """归还浏览器；broken=True 或清理失败时直接销毁"""
+        try:
+            if not broken and not self._closed:
+                reason = watchdog.recycle_reason(driver)
+                if reason:
+                    watchdog.recycled(driver, reason)
+                    self._discard(driver)
+                    return
+                try:
+                    reset_driver(driver)
+                    self._idle.put(driver)
+                    return
+                except WebDriverException as e:
+                    logger.warning("清理浏览器状态失败，丢弃该浏览器: %s", e)
+            self._discard(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def driver(self):
+        """以上下文管理器的方式借用浏览器"""
+        driver = self.acquire()
+        broken = False
+        try:
+            yield driver
+        except WebDriverException:
+            broken = not is_driver_alive(driver)
+            raise
+        finally:
+            self.release(driver, broken=broken)
+
+    def close(self):
+        """关闭池中所有浏览器"""
+        self._closed = True
+        with self._lock:
+            drivers = list(self._all)
+            self._all.clear()
+        for driver in drivers:
+            quit_driver(driver)
+            watchdog.forget(driver)
+        logger.info("WebDriver 池已关闭，共释放 %s 个浏览器", len(drivers))
+
+    def _create(self):
+        with metrics.timer("driver_launch_seconds"):
+            driver = self.factory()
+        with self._lock:
+            self._all.add(driver)
+        logger.info("新建浏览器，当前池中共 %s 个", len(self._all))
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._all.discard(driver)
+        quit_driver(driver)
+        watchdog.forget(driver)
+
+
+def init_tab_browser():
+    """初始化标签页模式使用的浏览器：get() 不阻塞，多个标签页可以同时加载"""
+    return init_driver(page_load_strategy="none")
+
+
+def target_id(handle):
+    """窗口句柄对应的 DevTools target ID（旧版 ChromeDriver 的句柄带有 CDwindow- 前缀）"""
+    return handle[len("CDwindow-"):] if handle.startswith("CDwindow-") else handle
+
+
+class TabBrowser:
+    """标签页模式下的一个浏览器及其标签页"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.lock = threading.RLock()  # WebDriver 会话同一时间只能操作一个标签页
+        self.current = driver.current_window_handle
+        self.free_handles = [self.current]
+        self.tab_count = 1
+        self.handles = {target_id(self.current)}
+        self.events = {}  # 按标签页暂存的网络事件: 窗口句柄 -> [(method, params)]
+        self.busy = 0
+        self.broken = False
+        self.draining = False  # 等待回收：不再分配新任务，正在使用的标签页全部归还后关闭
+
+    def activate(self, handle):
+        """切换到指定标签页（调用方需持有 lock）"""
+        if self.current != handle:
+            self.driver.switch_to.window(handle)
+            self.current = handle
+
+    def open_tab(self):
+        with self.lock:
+            self.driver.switch_to.new_window("tab")
+            self.current = self.driver.current_window_handle
+            prepare_tab(self.driver)
+            self.handles.add(target_id(self.current))
+            self.tab_count += 1
+            return self.current
+
+    def network_events(self, handle):
+        """
+        性能日志是整个浏览器共享的：取出全部新事件后按所属标签页暂存，返回指定标签页的事件
+        """
+        with self.lock:
+            for webview, method, params in parse_network_events(self.driver.get_log("performance")):
+                if webview in self.handles:
+                    self.events.setdefault(webview, []).append((method, params))
+            return self.events.pop(target_id(handle), [])
+
+
+class TabHandle:
+    """
+    浏览器中一个标签页的代理，可以代替 WebDriver 传给各抓取函数
+
+    所有 WebDriver 方法和属性都以代理自身为 self 执行，每条命令在 execute 中获取浏览器的锁
+    并先切换到该标签页；查找到的元素也以代理为 parent，元素上的操作同样会切换标签页。
+    注意 driver.switch_to 仍直接作用于整个浏览器，抓取函数中不应使用。
+    """
+
+    shares_browser = True  # 与其他标签页共享同一个浏览器
+
+    def __init__(self, browser, handle):
+        self._browser = browser
+        self._handle = handle
+
+    def execute(self, driver_command, params=None):
+        browser = self._browser
+        with browser.lock:
+            browser.activate(self._handle)
+            return type(browser.driver).execute(self, driver_command, params)
+
+    def create_web_element(self, element_id):
+        return self._browser.driver._web_element_cls(self, element_id)
+
+    def __getattr__(self, name):
+        driver = self._browser.driver
+        attr = getattr(type(driver), name, None)
+        if isinstance(attr, property):
+            return attr.fget(self)
+        if isinstance(attr, types.FunctionType):
+            return types.MethodType(attr, self)
+        return getattr(driver, name)
+
+
+class TabPool:
+    """
+    标签页调度器：在最多 max_browsers 个浏览器中为每个并发任务分配一个标签页
+
+    优先分配给正在使用的标签页最少的浏览器，已有浏览器都满时才启动新浏览器；
+    浏览器总数（包括等待回收的）不超过 max_browsers，达到上限时等待标签页归还。
+    接口与 DriverPool 相同，借出的 TabHandle 可以直接传给 get_author_info / get_video_info。
+    """
+
+    def __init__(self, max_browsers=TAB_BROWSERS, tabs_per_browser=TABS_PER_BROWSER, factory=init_tab_browser,
+                 acquire_timeout=DRIVER_ACQUIRE_TIMEOUT):
+        self.max_browsers = max_browsers
+        self.tabs_per_browser = tabs_per_browser
+        self.factory = factory
+        self.acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(max_browsers * tabs_per_browser)
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)  # 有标签页归还、浏览器启动完成或关闭时通知
+        self._browsers = []
+        self._launching = 0  # 已占位、正在启动的浏览器数
+        self._launch_waiters = 0  # 等待正在启动的浏览器的任务数
+        self._closed = False
+
+    def acquire(self):
+        """借出一个标签页"""
+        if self._closed:
+            raise RuntimeError("标签页池已关闭")
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError(f"等待空闲标签页超时（{self.acquire_timeout} 秒）")
+
+        try:
+            while True:
+                tab = self._assign()
+                if is_driver_alive(tab):
+                    return tab
+                logger.warning("标签页健康检查失败，关闭所在的浏览器")
+                self._discard(tab._browser)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _assign(self):
+        """
+        选出标签页所在的浏览器；需要新浏览器时先在锁内占位，再在锁外启动，
+        启动浏览器的几秒内其他浏览器的借出和归还不受影响
+        """
+        deadline = time.time() + self.acquire_timeout
+        with self._changed:
+            while True:
+                if self._closed:
+                    raise RuntimeError("标签页池已关闭")
+                candidates = [
+                    browser for browser in self._browsers
+                    if not browser.draining and browser.busy < self.tabs_per_browser
+                ]
+                if candidates:
+                    browser = min(candidates, key=lambda b: b.busy)
+                    browser.busy += 1
+                    handle = browser.free_handles.pop() if browser.free_handles else None
+                    break
+                # 浏览器总数（包括等待回收和正在启动的）不超过 max_browsers；
+                # 正在启动的浏览器还有空余标签页时等它启动完成，不再另启动一个
+                launching_capacity = self._launching * (self.tabs_per_browser - 1) - self._launch_waiters
+                if launching_capacity <= 0 and len(self._browsers) + self._launching < self.max_browsers:
+                    self._launching += 1
+                    browser = handle = None
+                    break
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise TimeoutError(f"等待空闲标签页超时（{self.acquire_timeout} 秒）")
+                waiting_for_launch = launching_capacity > 0
+                self._launch_waiters += waiting_for_launch
+                try:
+                    self._changed.wait(remaining)
+                finally:
+                    self._launch_waiters -= waiting_for_launch
+
+        if browser is None:
+            browser = self._launch()
+        if handle is None:
+            try:
+                handle = browser.open_tab()
+            except Exception:
+                with self._changed:
+                    browser.busy -= 1
+                    self._changed.notify_all()
+                raise
+        return TabHandle(browser, handle)
+
+    def _launch(self):
+        """启动占位的浏览器（不持有锁），返回时其中一个标签页已分配给调用方"""
+        try:
+            with metrics.timer("driver_launch_seconds"):
+                browser = TabBrowser(self.factory())
+        except Exception:
+            with self._changed:
+                self._launching -= 1
+                self._changed.notify_all()
+            raise
+        with self._changed:
+            self._launching -= 1
+            browser.busy += 1
+            self._browsers.append(browser)
+            count = len(self._browsers)
+            self._changed.notify_all()
+        logger.info("新建浏览器，当前共 %s 个", count)
+        return browser
+
+    def release(self, tab, broken=False):
+        """
+        归还标签页；broken=True 或清理失败时关闭整个浏览器
+
+        看门狗要求回收时浏览器先进入等待回收状态，其他标签页上的任务完成后再关闭。
+        """
+        browser = tab._browser
+        try:
+            if broken or self._closed or browser.broken:
+                self._discard(browser)
+                return
+            try:
+                tab.get("about:blank")
+            except WebDriverException as e:
+                logger.warning("清理标签页失败，关闭所在的浏览器: %s", e)
+                self._discard(browser)
+                return
+
+            reason = None if browser.draining else watchdog.recycle_reason(browser.driver)
+            with self._changed:
+                browser.busy -= 1
+                browser.free_handles.append(tab._handle)
+                browser.draining = browser.draining or reason is not None
+                idle = browser.draining and browser.busy == 0
+                self._changed.notify_all()
+            if reason:
+                watchdog.recycled(browser.driver, reason)
+            if idle:
+                self._discard(browser)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def driver(self):
+        """以上下文管理器的方式借用标签页"""
+        tab = self.acquire()
+        broken = False
+        try:
+            yield tab
+        except WebDriverException:
+            broken = not is_driver_alive(tab)
+            raise
+        finally:
+            self.release(tab, broken=broken)
+
+    def close(self):
+        """关闭所有浏览器"""
+        self._closed = True
+        with self._changed:
+            browsers = list(self._browsers)
+            self._browsers.clear()
+            self._changed.notify_all()
+        for browser in browsers:
+            quit_driver(browser.driver)
+            watchdog.forget(browser.driver)
+        logger.info("标签页池已关闭，共释放 %s 个浏览器", len(browsers))
+
+    def _discard(self, browser):
+        """关闭浏览器；仍在使用其中标签页的任务会因命令失败而各自归还"""
+        with self._changed:
+            if browser.broken:
+                return
+            browser.broken = True
+            if browser in self._browsers:
+                self._browsers.remove(browser)
+            self._changed.notify_all()
+        quit_driver(browser.driver)
+        watchdog.forget(browser.driver)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """获取进程内共享的 WebDriver 池（标签页模式下为 TabPool）"""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._closed:
+            _pool = TabPool() if EXECUTION_MODE == "tabs" else DriverPool()
+        return _pool
+
+
+def close_driver_pool():
+    """关闭共享的 WebDriver 池"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
 
-    return driver
\ No newline at end of file
+@contextmanager
+def borrow_driver(driver=None):
+    """调用方已持有浏览器时直接使用，否则从共享池中借用（等待和启动浏览器的时间记为排队等待）"""
+    if driver is not None:
+        yield driver
+        return
+    start = time.time()
+    with get_driver_pool().driver() as pooled:
+        record_wait(time.time() - start)
+        yield pooled
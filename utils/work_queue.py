@@ -0,0 +1,256 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from config import (
+    WORK_QUEUE_DB, QUEUE_LEASE_SECONDS, QUEUE_HEARTBEAT_INTERVAL, QUEUE_CLAIM_BATCH,
+    QUEUE_MAX_ATTEMPTS, QUEUE_POLL_INTERVAL,
+)
+from utils.journal import PENDING, AUTHOR_DONE, VIDEO_DONE, FAILED
+
+logger = logging.getLogger(__name__)
+
+# 任务状态：PENDING / AUTHOR_DONE / VIDEO_DONE / FAILED 与运行日志一致，另加领取中
+LEASED = "leased"
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    基于 SQLite 的多机共享工作队列
+
+    多个进程或机器通过同一个数据库文件（本机或共享目录）领取博主：领取时加租约，
+    工作进程定期续约（心跳），进程崩溃导致租约过期的任务会被重新排队，
+    超过最大尝试次数后标记为失败。所有修改都在 BEGIN IMMEDIATE 事务中完成，
+    依靠 SQLite 的文件锁保证同一任务只会被一个工作进程领取。
+
+    为兼容网络文件系统，不使用 WAL 模式。
+    """
+
+    def __init__(self, path=WORK_QUEUE_DB, lease_seconds=QUEUE_LEASE_SECONDS, max_attempts=QUEUE_MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # isolation_level=None：由代码显式控制事务
+        self._conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "author TEXT PRIMARY KEY, status TEXT NOT NULL, worker TEXT, lease_expires REAL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, video_link TEXT, result TEXT, error TEXT, updated_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, lease_expires)")
+
+    def _transaction(self, func, *args):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(*args)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    def add(self, author_urls):
+        """
+        把博主加入队列，已存在的博主保持原状态
+
+        :return: 新加入的数量
+        """
+        def insert():
+            now = time.time()
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tasks (author, status, updated_at) VALUES (?, ?, ?)",
+                ((url, PENDING, now) for url in author_urls),
+            )
+            return self._conn.total_changes - before
+
+        return self._transaction(insert)
+
+    def requeue_expired(self):
+        """租约过期的任务重新排队，尝试次数用尽的标记为失败"""
+        return self._transaction(self._requeue_expired, time.time())
+
+    def _requeue_expired(self, now):
+        cursor = self._conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "worker = NULL, lease_expires = NULL, error = 'lease expired', updated_at = ? "
+            "WHERE status = ? AND lease_expires < ?",
+            (self.max_attempts, FAILED, PENDING, now, LEASED, now),
+        )
+        if cursor.rowcount:
+            logger.warning("%s 个博主的租约已过期，重新排队", cursor.rowcount)
+        return cursor.rowcount
+
+    def claim(self, worker_id, limit=QUEUE_CLAIM_BATCH):
+        """
+        领取最多 limit 个待处理的博主
+
+        :return: [(博主URL, 已找到的视频链接或 None)]
+        """
+        def claim_tasks():
+            now = time.time()
+            self._requeue_expired(now)
+            rows = self._conn.execute(
+                "SELECT author, video_link FROM tasks WHERE status IN (?, ?) ORDER BY rowid LIMIT ?",
+                (PENDING, AUTHOR_DONE, limit),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE tasks SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE author = ?",
+                ((LEASED, worker_id, now + self.lease_seconds, now, author) for author, _ in rows),
+            )
+            return rows
+
+        return self._transaction(claim_tasks)
+
+    def heartbeat(self, worker_id):
+        """为该工作进程持有的全部任务续约"""
+        def extend():
+            now = time.time()
+            return self._conn.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE worker = ? AND status = ?",
+                (now + self.lease_seconds, worker_id, LEASED),
+            ).rowcount
+
+        return self._transaction(extend)
+
+    def _finish(self, author_url, worker_id, status, **fields):
+        """更新仍由该工作进程持有的任务；租约已被回收时返回 False"""
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        sql = (
+            f"UPDATE tasks SET status = ?, worker = NULL, lease_expires = NULL, updated_at = ?"
+            f"{', ' + assignments if assignments else ''} WHERE author = ? AND worker = ? AND status = ?"
+        )
+        params = (status, time.time(), *fields.values(), author_url, worker_id, LEASED)
+        updated = self._transaction(lambda: self._conn.execute(sql, params).rowcount)
+        if not updated:
+            logger.warning("博主 %s 的租约已失效，结果未写入队列", author_url)
+        return bool(updated)
+
+    def mark_author_done(self, author_url, worker_id, video_link):
+        """记录已找到的视频链接，任务仍由该工作进程持有；租约已被回收时返回 False"""
+        updated = self._transaction(lambda: self._conn.execute(
+            "UPDATE tasks SET video_link = ?, updated_at = ? WHERE author = ? AND worker = ? AND status = ?",
+            (video_link, time.time(), author_url, worker_id, LEASED),
+        ).rowcount)
+        if not updated:
+            logger.warning("博主 %s 的租约已失效，视频链接未写入队列", author_url)
+        return bool(updated)
+
+    def complete(self, author_url, worker_id, video_info):
+        return self._finish(author_url, worker_id, VIDEO_DONE, result=json.dumps(video_info, ensure_ascii=False))
+
+    def fail(self, author_url, worker_id, error=None):
+        """处理失败：还有尝试次数时重新排队（已找到的视频链接保留），否则标记为失败"""
+        with self._lock:
+            row = self._conn.execute("SELECT attempts, video_link FROM tasks WHERE author = ?", (author_url,)).fetchone()
+        attempts, video_link = row if row else (self.max_attempts, None)
+        if attempts >= self.max_attempts:
+            status = FAILED
+        else:
+            status = AUTHOR_DONE if video_link else PENDING
+        return self._finish(author_url, worker_id, status, error=error)
+
+    def counts(self):
+        """各状态的任务数"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"))
+
+    def has_unfinished(self):
+        counts = self.counts()
+        return any(counts.get(status) for status in (PENDING, AUTHOR_DONE, LEASED))
+
+    def iter_results(self):
+        """逐条返回已完成博主的视频信息"""
+        # 单独的连接，不占用工作进程使用的连接
+        conn = sqlite3.connect(self.path, timeout=60)
+        try:
+            for (result,) in conn.execute("SELECT result FROM tasks WHERE status = ? ORDER BY rowid", (VIDEO_DONE,)):
+                yield json.loads(result)
+        finally:
+            conn.close()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class QueueWorker:
+    """
+    从共享队列中领取博主的工作进程
+
+    提供与 RunJournal 相同的 state()/record() 接口，流水线各级可以不加修改地把
+    处理进度写回队列；后台线程定期为持有的任务续约。
+    """
+
+    def __init__(self, work_queue, worker_id=None, heartbeat_interval=QUEUE_HEARTBEAT_INTERVAL,
+                 poll_interval=QUEUE_POLL_INTERVAL):
+        self.queue = work_queue
+        self.worker_id = worker_id or default_worker_id()
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self._video_links = {}
+        self.claimed = set()  # 本进程领取过的博主（失败后重新领取的只算一次）
+        self._task_finished = threading.Event()  # 本进程有任务完成或失败时设置，唤醒等待中的 authors()
+        self._stopped = threading.Event()
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name="queue-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+
+    def _heartbeat_loop(self):
+        while not self._stopped.wait(self.heartbeat_interval):
+            try:
+                self.queue.heartbeat(self.worker_id)
+            except sqlite3.Error as e:
+                logger.warning("工作队列续约失败: %s", e)
+
+    def authors(self):
+        """
+        不断领取博主直到队列中没有未完成的任务
+
+        仍有任务在处理中时等待：本进程的任务完成或失败（失败的可能重新排队）时立即重新检查；
+        只有其他机器持有租约时最多等待 poll_interval 秒，以便接手它们崩溃后过期的任务。
+        """
+        while True:
+            self._task_finished.clear()
+            tasks = self.queue.claim(self.worker_id)
+            if tasks:
+                for author_url, video_link in tasks:
+                    if video_link:
+                        self._video_links[author_url] = video_link
+                    self.claimed.add(author_url)
+                    yield author_url
+            elif self.queue.has_unfinished():
+                self._task_finished.wait(self.poll_interval)
+            else:
+                return
+
+    def state(self, author_url):
+        video_link = self._video_links.get(author_url)
+        return {"status": AUTHOR_DONE, "video_link": video_link} if video_link else None
+
+    def record(self, author_url, status, **data):
+        if status == AUTHOR_DONE:
+            self._video_links[author_url] = data["video_link"]
+            self.queue.mark_author_done(author_url, self.worker_id, data["video_link"])
+        elif status == VIDEO_DONE:
+            self._video_links.pop(author_url, None)
+            self.queue.complete(author_url, self.worker_id, data["video_info"])
+            self._task_finished.set()
+        elif status == FAILED:
+            self._video_links.pop(author_url, None)
+            self.queue.fail(author_url, self.worker_id, data.get("error"))
+            self._task_finished.set()
+
+    def close(self):
+        self._stopped.set()
+        self._heartbeat_thread.join()
+        self.queue.close()